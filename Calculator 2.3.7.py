@@ -1,11 +1,25 @@
 # Calculator.py — fully patched, integrated, ready-to-run
 import tkinter as tk
-from tkinter import Toplevel, messagebox, ttk, colorchooser
+from tkinter import Toplevel, messagebox, ttk, colorchooser, filedialog
+from array import array
+import csv
+import functools
+import math
+import multiprocessing
+import operator
+import re
 import subprocess
 import sys
+import time
 import webbrowser
 import platform
 
+# resource (POSIX only) gives the evaluation worker a hard CPU-time limit
+try:
+    import resource
+except ImportError:
+    resource = None
+
 # requests is optional — we handle if missing
 try:
     import requests
@@ -30,9 +44,1237 @@ FALLBACK_RATES = {
     "BRL": 5.2, "ZAR": 19.0
 }
 
+# --- Expression engine (used by _evaluate instead of eval) ---
+# compiled expressions kept, most recently used first (see compile_expression)
+EXPR_CACHE_SIZE = 256
+# runs of at least this many + - (or * / //) operators compile into one loop; shorter
+# ones into a closure per operator, which is quicker for a few terms
+CHAIN_LOOP_MIN = 8
+# largest integer result (in bits) worth computing; bigger ** and * are refused up front
+MAX_RESULT_BITS = 1 << 22
+# integers above this many bits are shown in scientific notation with a digit count
+EXACT_INT_BITS = 3300
+# per-expression limits in the worker process: CPU seconds (POSIX), and wall-clock
+# seconds before the window gives up on it and starts a fresh worker
+EVAL_CPU_LIMIT = 2
+EVAL_TIMEOUT = 3.0
+# ms between checks for the worker's answer
+EVAL_POLL_MS = 5
+
+# --- Graph plotting ---
+# functions and constants y = f(x) may use (numpy ufuncs when numpy is installed)
+GRAPH_FUNCTIONS = ("sin", "cos", "tan", "sqrt", "abs", "exp", "log")
+GRAPH_CONSTANTS = {"pi": math.pi, "e": math.e}
+# deepest nesting of parentheses (calls included) y = f(x) may use; each level costs
+# a few stack frames when parsing, compiling and evaluating
+GRAPH_MAX_NESTING = 100
+_MATH_FUNCTIONS = {"sin": math.sin, "cos": math.cos, "tan": math.tan, "sqrt": math.sqrt,
+                   "abs": abs, "exp": math.exp, "log": math.log}
+# samples per pixel of canvas width when a function is plotted
+CURVE_SAMPLES_PER_PX = 4
+# a curve is broken where neighbouring samples are more than this many pixels apart
+# and bisecting the gap this many times doesn't close it (poles, steps)
+CURVE_JUMP_PX = 32
+CURVE_BISECT_STEPS = 12
+# overlaid functions take these colors in turn
+CURVE_COLORS = ("#0000cc", "#008800", "#cc6600", "#8800aa", "#007788", "#aa0044")
+# plotted points are squares this many pixels wide, in this (r, g, b) color
+POINT_SIZE_PX = 4
+POINT_COLOR = (255, 0, 0)
+# grid background, minor lines (every unit at the default zoom) and darker major ones
+GRID_BG = (255, 255, 255)
+GRID_MINOR = (0xee, 0xee, 0xee)
+GRID_MAJOR = (0xdd, 0xdd, 0xdd)
+# minor grid lines are at least this many pixels apart at any zoom
+GRID_MIN_PX = 4
+# the spatial index's cells are a power of two in size, about 1/INDEX_GRID of the
+# spread of most of the points, and at most INDEX_COORD_MAX cells away from 0; up to
+# INDEX_TAIL_MAX points added since the last build are kept unindexed
+INDEX_GRID = 256
+INDEX_COORD_MAX = 2 ** 52
+INDEX_TAIL_MAX = 4096
+# with more points than this in view they are drawn as density buckets (heat map) at
+# least DENSITY_BUCKET_PX wide, shaded from DENSITY_LOW (few) to DENSITY_HIGH (most)
+DENSITY_MIN_POINTS = 100_000
+DENSITY_BUCKET_PX = 4
+DENSITY_LOW = (255, 200, 200)
+DENSITY_HIGH = (120, 0, 0)
+# mouse-wheel zoom per notch; the view stays between these widths (world units)
+ZOOM_STEP = 1.25
+VIEW_MIN_SPAN = 1e-6
+VIEW_MAX_SPAN = 1e12
+# a press that moves less than this many pixels is a click (plot), more is a drag (pan)
+DRAG_THRESHOLD_PX = 3
+
+# numpy is optional (only graph plotting uses it) and imported on first use
+_np = None
+
+
+def _load_numpy():
+    """Return the numpy module, importing it on first call (None if not installed)."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except Exception:
+            _np = False
+    return _np or None
+
+# a number literal (12, 12., .5, 12.5), an operator or parenthesis (** and // are tried
+# before * and /), or a name (x and the graph functions; the keypad grammar has none);
+# ASCII so \d doesn't also accept other scripts' digits ("١٢" is not 12)
+_TOKEN_RE = re.compile(r"(\d+\.?\d*|\.\d+)|(\*\*|//|[-+*/()])|([a-z]+)", re.ASCII)
+
+class ExpressionError(ValueError):
+    """Raised for display text that isn't a valid expression."""
+
+
+class ResultTooLarge(OverflowError):
+    """Raised instead of building an integer of more than MAX_RESULT_BITS bits."""
+
+
+def _too_large(op, a, b):
+    """True if int a (op) int b would have more than MAX_RESULT_BITS bits."""
+    if type(a) is not int or type(b) is not int:
+        return False  # floats overflow (quickly) by themselves
+    if op == "*":
+        return a.bit_length() + b.bit_length() > MAX_RESULT_BITS
+    # a**b has about b * log2|a| bits; refuse before spending minutes computing it
+    if b <= 0 or abs(a) <= 1:
+        return False
+    return b > MAX_RESULT_BITS or b * math.log2(abs(a)) > MAX_RESULT_BITS
+
+
+def _checked_mul(a, b):
+    if _too_large("*", a, b):
+        raise ResultTooLarge("result too large")
+    return a * b
+
+
+def _checked_pow(a, b):
+    if _too_large("**", a, b):
+        raise ResultTooLarge("result too large")
+    return a ** b
+
+
+_BINARY_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "**": operator.pow,
+}
+# the only operators that can build a huge int from small ones
+_CHECKED_OPS = {"*": _checked_mul, "**": _checked_pow}
+# left-associative operators of one precedence level; a run of them (1+2-3+...) is
+# compiled into one loop (see _compile_chain)
+_CHAIN_LEVELS = (("+", "-"), ("*", "/", "//"))
+
+
+def _tokenize(text):
+    """Split expression text into ("num", value) and ("op", symbol) tokens."""
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None:
+            raise ExpressionError(f"unexpected {text[pos]!r} at {pos}")
+        number, op, name = m.groups()
+        if number is not None:
+            # same types as Python literals: int unless there is a decimal point
+            tokens.append(("num", float(number) if "." in number else int(number)))
+        elif op is not None:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("name", name))
+        pos = m.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive-descent parser with Python's precedence for the keypad operators.
+
+        expr   := term (("+" | "-") term)*
+        term   := factor (("*" | "/" | "//") factor)*
+        factor := ("+" | "-")* power
+        power  := NUMBER ["**" factor]
+
+    so -2**2 is -4, 2**-1 is 0.5 and 2**3**2 is 2**9, as with eval. The tree is
+    nested tuples: ("num", value), ("neg", node), (op, left, right). Runs of signs
+    and of ** are read in a loop rather than by recursion, so a long one can't hit
+    the recursion limit; a run of signs becomes one "neg" or none.
+
+    Given a table of functions (graph mode), NUMBER may also be x, a constant, a
+    call like sin(...) or a parenthesized expression, and factors written next to
+    each other multiply (2x, 3sin(x)). Those add ("var",) and ("call", name, node).
+    """
+
+    def __init__(self, tokens, functions=None):
+        self.tokens = tokens
+        self.pos = 0
+        self.functions = functions
+        self.depth = 0
+
+    def parse(self):
+        node = self._expr()
+        if self.pos != len(self.tokens):
+            raise ExpressionError("unexpected token after the end of the expression")
+        return node
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _expr(self):
+        node = self._term()
+        while self._peek() in (("op", "+"), ("op", "-")):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            node = (op, node, self._term())
+        return node
+
+    def _term(self):
+        node = self._factor()
+        while True:
+            token = self._peek()
+            if token in (("op", "*"), ("op", "/"), ("op", "//")):
+                self.pos += 1
+                node = (token[1], node, self._factor())
+            elif self.functions is not None and (token[0] == "name" or token == ("op", "(")):
+                node = ("*", node, self._factor())
+            else:
+                return node
+
+    def _signs(self):
+        # skip a run of + and - signs; True if they negate
+        negate = False
+        while self._peek() in (("op", "+"), ("op", "-")):
+            negate ^= self.tokens[self.pos][1] == "-"
+            self.pos += 1
+        return negate
+
+    def _factor(self):
+        negate = self._signs()
+        node = self._power()
+        return ("neg", node) if negate else node
+
+    def _power(self):
+        # a ** -b ** c is a ** -(b ** c): collect the operands and the signs after each
+        # **, then build the tree from the right
+        operands = [self._operand()]
+        signs = []
+        while self._peek() == ("op", "**"):
+            self.pos += 1
+            signs.append(self._signs())
+            operands.append(self._operand())
+        node = operands.pop()
+        while signs:
+            if signs.pop():
+                node = ("neg", node)
+            node = ("**", operands.pop(), node)
+        return node
+
+    def _operand(self):
+        kind, value = self._peek()
+        if kind == "num":
+            self.pos += 1
+            return ("num", value)
+        if self.functions is None:
+            raise ExpressionError("expected a number")
+        return self._atom()
+
+
+    def _atom(self):
+        kind, value = self._peek()
+        self.pos += 1
+        if (kind, value) == ("op", "("):
+            self.depth += 1
+            if self.depth > GRAPH_MAX_NESTING:
+                raise ExpressionError("too deeply nested")
+            node = self._expr()
+            if self._peek() != ("op", ")"):
+                raise ExpressionError("missing )")
+            self.pos += 1
+            self.depth -= 1
+            return node
+        if kind != "name":
+            raise ExpressionError("expected a number")
+        if value == "x":
+            return ("var",)
+        if value in GRAPH_CONSTANTS:
+            return ("num", GRAPH_CONSTANTS[value])
+        if value not in self.functions:
+            raise ExpressionError(f"unknown name {value!r}")
+        if self._peek() != ("op", "("):
+            raise ExpressionError(f"{value} needs ( )")
+        return ("call", value, self._atom())
+
+
+def _compile_node(node, functions=None):
+    """Turn a parse tree into a closure computing its value from x.
+
+    functions maps the names a ("call", ...) node may use to their implementation
+    (math for single values, numpy ufuncs for whole arrays of x).
+    """
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        return lambda x: value
+    if kind == "var":
+        return lambda x: x
+    if kind == "call":
+        func = functions[node[1]]
+        inner = _compile_node(node[2], functions)
+        return lambda x: func(inner(x))
+    if kind == "neg":
+        inner = _compile_node(node[1], functions)
+        return lambda x: -inner(x)
+    if kind == "**":
+        rhs, run = node[2], 1
+        while run < CHAIN_LOOP_MIN:
+            rhs = rhs[1] if rhs[0] == "neg" else rhs
+            if rhs[0] != "**":
+                break
+            rhs, run = rhs[2], run + 1
+        if run >= CHAIN_LOOP_MIN:
+            return _compile_power_chain(node, functions)
+    for level in _CHAIN_LEVELS:
+        if kind in level:
+            lhs, run = node[1], 1
+            while lhs[0] in level and run < CHAIN_LOOP_MIN:
+                lhs, run = lhs[1], run + 1
+            if run >= CHAIN_LOOP_MIN:
+                return _compile_chain(node, level, functions)
+    fn = _BINARY_OPS[kind]
+    lhs, rhs = node[1], node[2]
+    if kind in _CHECKED_OPS:
+        # sizes are checked when compiling if both sides are plain numbers, and not at
+        # all next to a float literal (the result is a float); otherwise on every call
+        if lhs[0] == "num" and rhs[0] == "num":
+            if _too_large(kind, lhs[1], rhs[1]):
+                raise ResultTooLarge("result too large")
+        elif not (lhs[0] == "num" and type(lhs[1]) is float or rhs[0] == "num" and type(rhs[1]) is float):
+            fn = _CHECKED_OPS[kind]
+    # plain numbers are bound directly (one call less per evaluation)
+    if rhs[0] == "num":
+        b = rhs[1]
+        if lhs[0] == "num":
+            a = lhs[1]
+            return lambda x: fn(a, b)
+        left = _compile_node(lhs, functions)
+        return lambda x: fn(left(x), b)
+    right = _compile_node(rhs, functions)
+    if lhs[0] == "num":
+        a = lhs[1]
+        return lambda x: fn(a, right(x))
+    left = _compile_node(lhs, functions)
+    return lambda x: fn(left(x), right(x))
+
+
+def _compile_chain(node, level, functions):
+    """Compile a run of same-level operators (a+b-c+d) as a loop over (op, operand) pairs.
+
+    The parser nests such a run down its left side, one tuple per operator; a closure
+    per operator would recurse that deep when compiling and again on every call, so a
+    long enough expression would hit the recursion limit.
+    """
+    pairs = []
+    while node[0] in level:
+        pairs.append((node[0], node[2]))
+        node = node[1]
+    pairs.reverse()
+    first = node
+    steps = []
+    for i, (op, rhs) in enumerate(pairs):
+        fn = _BINARY_OPS[op]
+        if op in _CHECKED_OPS:
+            # same rules as a single operator; only the first has a plain number on the left
+            lhs_num = i == 0 and first[0] == "num"
+            if lhs_num and rhs[0] == "num":
+                if _too_large(op, first[1], rhs[1]):
+                    raise ResultTooLarge("result too large")
+            elif not (lhs_num and type(first[1]) is float or rhs[0] == "num" and type(rhs[1]) is float):
+                fn = _CHECKED_OPS[op]
+        if rhs[0] == "num":
+            steps.append((fn, rhs[1], None))
+        else:
+            steps.append((fn, None, _compile_node(rhs, functions)))
+    steps = tuple(steps)
+    start = _compile_node(first, functions)
+
+    def chain(x):
+        value = start(x)
+        for fn, b, right in steps:
+            value = fn(value, b if right is None else right(x))
+        return value
+    return chain
+
+
+def _compile_power_chain(node, functions):
+    """Compile a run of ** (a ** -b ** c ...) as a loop, from the right like the operator.
+
+    The parser nests such a run down its right side, with a "neg" between two ** for
+    a minus sign; see _compile_chain for why it isn't one closure per operator.
+    """
+    bases = []
+    while node[0] == "**":
+        base, node = node[1], node[2]
+        negate = node[0] == "neg" and node[1][0] == "**"
+        if negate:
+            node = node[1]
+        bases.append((base, negate))
+    top = _compile_node(node, functions)
+    steps = []
+    for base, negate in reversed(bases):
+        # checked like a single **, except that only the rightmost exponent can be a literal
+        if base[0] == "num" and type(base[1]) is float:
+            fn = operator.pow
+        else:
+            fn = _checked_pow
+        if base[0] == "num":
+            steps.append((fn, base[1], None, negate))
+        else:
+            steps.append((fn, None, _compile_node(base, functions), negate))
+    steps = tuple(steps)
+
+    def chain(x):
+        value = top(x)
+        for fn, a, left, negate in steps:
+            if negate:
+                value = -value
+            value = fn(a if left is None else left(x), value)
+        return value
+    return chain
+
+
+@functools.lru_cache(maxsize=EXPR_CACHE_SIZE)
+def _compile_normalized(text):
+    # keypad input has no x: bind it once so callers get a zero-argument function
+    return functools.partial(_compile_node(_Parser(_tokenize(text)).parse()), None)
+
+
+def compile_expression(expr):
+    """Compile calculator input to a zero-argument function returning its value.
+
+    Accepts exactly what the keypad and keyboard can type (digits, ".", + - * /,
+    which also gives ** and //) with eval's precedence and int/float results.
+    Compiled functions are cached by the expression with whitespace removed, so
+    evaluating the same text again skips tokenizing and parsing. Raises
+    ExpressionError for anything else, and ResultTooLarge (here or when called)
+    for integer results of more than MAX_RESULT_BITS bits.
+    """
+    return _compile_normalized("".join(expr.split()))
+
+
+def evaluate_expression(expr):
+    """Value of calculator input; raises ExpressionError or the arithmetic error."""
+    return compile_expression(expr)()
+
+
+def format_big_int(n):
+    """Scientific notation plus digit count of a big int, without converting it to decimal.
+
+    log10 comes from the top 64 bits and the bit length, so this is O(1) however big n
+    is (str() is quadratic, and refuses ints over 4300 digits on newer Pythons). Only
+    when n is within float error of a power of ten is the digit count settled exactly,
+    by comparing n with that power.
+    """
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    shift = max(0, n.bit_length() - 64)
+    log10 = math.log10(n >> shift) + shift * math.log10(2)
+    k = round(log10)
+    if abs(log10 - k) < 1e-9:
+        digits = k + 1 if n >= 10 ** k else k
+    else:
+        digits = int(log10) + 1
+    # the count comes from the unrounded value; only the shown mantissa is rounded
+    exp = digits - 1
+    mantissa = 10 ** (log10 - exp)
+    if mantissa >= 9.999995:
+        mantissa, exp = 1.0, exp + 1
+    return f"{sign}{mantissa:.5f}e+{exp} ({digits:,} digits)"
+
+
+def format_result(value):
+    """Display text for a result: exact unless it is an integer too long to show."""
+    if type(value) is int and value.bit_length() > EXACT_INT_BITS:
+        return format_big_int(value)
+    return str(value)
+
+
+def evaluate_to_text(expr):
+    """("ok", text) for a result or ("error", message); never raises for bad input."""
+    try:
+        return "ok", format_result(evaluate_expression(expr))
+    except ResultTooLarge:
+        return "error", "Too large"
+    except ZeroDivisionError:
+        return "error", "Error"
+    except (ExpressionError, ArithmeticError, ValueError, MemoryError):
+        return "error", "Error"
+    except RecursionError:
+        # backstop: the parser and compiler loop over long runs, but not over everything
+        return "error", "Error"
+
+
+def _eval_worker_main(conn, cpu_limit):
+    """Worker process loop: evaluate (job, expr) requests from conn until it closes.
+
+    Before each job the CPU-time soft limit is moved to cpu_limit seconds past what the
+    process has used so far, so a runaway expression is killed by the OS (SIGXCPU).
+    """
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+        job, expr = msg
+        if resource is not None:
+            try:
+                used = resource.getrusage(resource.RUSAGE_SELF)
+                soft = int(used.ru_utime + used.ru_stime) + cpu_limit + 1
+                _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+                if hard != resource.RLIM_INFINITY:
+                    soft = min(soft, hard)
+                resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+            except (ValueError, OSError):
+                pass
+        status, text = evaluate_to_text(expr)
+        try:
+            conn.send((job, status, text))
+        except (OSError, ValueError):
+            break
+
+
+class EvalWorker:
+    """A warm background process that evaluates expressions for the window.
+
+    One job runs at a time: submit() sends it, poll() picks up the answer without
+    blocking. A job that takes longer than timeout seconds (or dies on the CPU
+    limit) is answered with "Too slow" and the worker is replaced; cancel() does
+    the same on request. If no worker process can be started, submit() returns
+    None and the caller evaluates in-process.
+    """
+
+    def __init__(self, cpu_limit=EVAL_CPU_LIMIT, timeout=EVAL_TIMEOUT):
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self.restarts = 0
+        self._proc = None
+        self._conn = None
+        self._job = 0
+        self._pending = None
+        self._sent_at = 0.0
+        self._start()
+
+    def _start(self):
+        try:
+            # fork is instant and needs no re-import, but only Linux Tk survives it well
+            method = "fork" if sys.platform.startswith("linux") else "spawn"
+            ctx = multiprocessing.get_context(method)
+            conn, child = ctx.Pipe()
+            proc = ctx.Process(target=_eval_worker_main, args=(child, self.cpu_limit),
+                               name="calculator-eval", daemon=True)
+            proc.start()
+            child.close()
+        except Exception:
+            self._proc = self._conn = None
+            return
+        self._proc, self._conn = proc, conn
+
+    @property
+    def alive(self):
+        return self._proc is not None
+
+    @property
+    def busy(self):
+        return self._pending is not None
+
+    def submit(self, expr):
+        """Start evaluating expr; returns its job number (None if there is no worker)."""
+        if self._pending is not None:
+            self.cancel()
+        if self._proc is None:
+            return None
+        self._job += 1
+        try:
+            self._conn.send((self._job, expr))
+        except (OSError, ValueError):
+            self._restart()
+            return None
+        self._pending = self._job
+        self._sent_at = time.monotonic()
+        return self._job
+
+    def poll(self, wait=0.0):
+        """(job, status, text) once the pending job is answered, else None."""
+        job = self._pending
+        if job is None:
+            return None
+        try:
+            ready = self._conn.poll(wait)
+            reply = self._conn.recv() if ready else None
+        except (EOFError, OSError):
+            # killed by the CPU limit (or crashed)
+            self._restart()
+            return job, "error", "Too slow"
+        if reply is not None and reply[0] == job:
+            self._pending = None
+            return reply
+        if time.monotonic() - self._sent_at > self.timeout:
+            self._restart()
+            return job, "error", "Too slow"
+        return None
+
+    def result(self, expr, timeout=None):
+        """Evaluate expr and wait for the answer (tests, benchmarks)."""
+        if self.submit(expr) is None:
+            return evaluate_to_text(expr)
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout) + 1.0
+        while True:
+            reply = self.poll(0.05)
+            if reply is not None:
+                return reply[1], reply[2]
+            if time.monotonic() > deadline:
+                self.cancel()
+                return "error", "Too slow"
+
+    def cancel(self):
+        """Drop the pending job; a busy worker is killed and replaced."""
+        if self._pending is not None:
+            self._restart()
+
+    def _restart(self):
+        self._pending = None
+        self._stop(kill=True)
+        self.restarts += 1
+        self._start()
+
+    def _stop(self, kill=False):
+        proc, conn = self._proc, self._conn
+        self._proc = self._conn = None
+        if proc is None:
+            return
+        try:
+            if kill:
+                proc.kill()
+            else:
+                conn.send(None)
+            proc.join(1.0)
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def close(self):
+        self._pending = None
+        self._stop(kill=False)
+
+
+# --- Graph plotting ---
+@functools.lru_cache(maxsize=EXPR_CACHE_SIZE)
+def _compile_function(text, vectorized):
+    np = _load_numpy() if vectorized else None
+    functions = {name: getattr(np, name) for name in GRAPH_FUNCTIONS} if np else _MATH_FUNCTIONS
+    return _compile_node(_Parser(_tokenize(text), functions).parse(), functions)
+
+
+def compile_function(expr, vectorized=True):
+    """Compile "y = f(x)" (the "y =" is optional) to a function of x.
+
+    On top of the keypad grammar f may use x, parentheses, GRAPH_FUNCTIONS,
+    pi and e, and implicit multiplication (2x, 3sin(x)). With vectorized (and
+    numpy installed) the functions are numpy ufuncs, so one call evaluates a
+    whole array of x; otherwise the result takes one float x at a time.
+    """
+    text = "".join(expr.lower().split())
+    if text.startswith("y="):
+        text = text[2:]
+    return _compile_function(text, bool(vectorized and _load_numpy()))
+
+
+class Viewport:
+    """The part of the plane a graph canvas shows: x/y ranges over width x height pixels."""
+
+    def __init__(self, x_min, x_max, y_min, y_max, width, height):
+        self.x_min, self.x_max = x_min, x_max
+        self.y_min, self.y_max = y_min, y_max
+        self.width, self.height = width, height
+
+    @property
+    def key(self):
+        """Changes whenever what the canvas shows changes (cache key for curves)."""
+        return (self.x_min, self.x_max, self.y_min, self.y_max, self.width, self.height)
+
+    @property
+    def scale_x(self):
+        return self.width / (self.x_max - self.x_min)
+
+    @property
+    def scale_y(self):
+        return self.height / (self.y_max - self.y_min)
+
+    def to_canvas(self, x, y):
+        return (x - self.x_min) * self.scale_x, (self.y_max - y) * self.scale_y
+
+    def to_world(self, px, py):
+        return self.x_min + px / self.scale_x, self.y_max - py / self.scale_y
+
+    def pan(self, dpx, dpy):
+        """Move the view so its content follows the mouse by (dpx, dpy) pixels."""
+        dx, dy = dpx / self.scale_x, dpy / self.scale_y
+        self.x_min, self.x_max = self.x_min - dx, self.x_max - dx
+        self.y_min, self.y_max = self.y_min + dy, self.y_max + dy
+
+    def zoom(self, factor, px, py):
+        """Zoom in by factor (out if < 1), keeping the point under pixel (px, py) in place."""
+        span = self.x_max - self.x_min
+        factor = min(max(factor, span / VIEW_MAX_SPAN), span / VIEW_MIN_SPAN)
+        wx, wy = self.to_world(px, py)
+        self.x_min, self.x_max = wx - (wx - self.x_min) / factor, wx + (self.x_max - wx) / factor
+        self.y_min, self.y_max = wy - (wy - self.y_min) / factor, wy + (self.y_max - wy) / factor
+
+
+def curve_segments(func, view, vectorized=True):
+    """Polylines for y = func(x) across view, as flat [px0, py0, px1, py1, ...] lists.
+
+    func is sampled CURVE_SAMPLES_PER_PX times per pixel, in one numpy call when
+    vectorized. The line is broken where func is undefined (nan/inf) and at
+    jumps: two samples more than CURVE_JUMP_PX apart are bisected a few times,
+    and if the gap doesn't shrink it is a pole (tan) or a step (x//1), not a
+    steep stretch. y is clipped to a canvas height above and below the view so
+    Tk gets sane coordinates.
+    """
+    count = max(2, int(view.width * CURVE_SAMPLES_PER_PX))
+    sx, sy, h = view.scale_x, view.scale_y, view.height
+    np = _load_numpy() if vectorized else None
+    if np is None:
+        def canvas_y(x):
+            try:
+                py = (view.y_max - float(func(x))) * sy
+            except (ArithmeticError, ValueError, TypeError):
+                return math.nan
+            return min(max(py, -h), 2 * h) if not math.isnan(py) else py
+
+        step = (view.x_max - view.x_min) / (count - 1)
+        xs = [view.x_min + i * step for i in range(count)]
+        pys = [canvas_y(x) for x in xs]
+        segments, current = [], []
+        for i, py in enumerate(pys):
+            if math.isnan(py) or abs(py) == math.inf:
+                py = None
+            if current and (py is None or _is_jump(canvas_y, xs[i - 1], xs[i], current[-1], py)):
+                if len(current) >= 4:
+                    segments.append(current)
+                current = []
+            if py is not None:
+                current += [i * step * sx, py]
+        if len(current) >= 4:
+            segments.append(current)
+        return segments
+
+    def canvas_y(x):
+        with np.errstate(all="ignore"):
+            py = (view.y_max - np.broadcast_to(np.asarray(func(x), dtype=float), x.shape)) * sy
+        return np.clip(py, -h, 2 * h)
+
+    xs = np.linspace(view.x_min, view.x_max, count)
+    try:
+        with np.errstate(all="ignore"):
+            py = (view.y_max - np.broadcast_to(np.asarray(func(xs), dtype=float), xs.shape)) * sy
+    except (ArithmeticError, ValueError, TypeError):
+        return []  # e.g. a constant like 1//0
+    ok = np.isfinite(py)
+    py = np.clip(py, -h, 2 * h)
+    # break between samples i and i+1 where either is undefined or the line jumps
+    both = ok[1:] & ok[:-1]
+    cut = ~both
+    with np.errstate(invalid="ignore"):
+        steep = np.flatnonzero(both & (np.abs(np.diff(py)) > CURVE_JUMP_PX))
+    if steep.size:
+        lo, hi = xs[steep], xs[steep + 1]
+        plo, phi = py[steep], py[steep + 1]
+        with np.errstate(invalid="ignore"):
+            for _ in range(CURVE_BISECT_STEPS):
+                # keep the half with the bigger gap (nan counts as the bigger one)
+                mid = (lo + hi) / 2
+                pm = canvas_y(mid)
+                left = np.abs(pm - plo) >= np.abs(phi - pm)
+                hi, phi = np.where(left, mid, hi), np.where(left, pm, phi)
+                lo, plo = np.where(left, lo, mid), np.where(left, plo, pm)
+            cut[steep[~(np.abs(phi - plo) <= CURVE_JUMP_PX)]] = True
+    bounds = np.flatnonzero(cut) + 1
+    starts = np.concatenate(([0], bounds)).tolist()
+    ends = np.concatenate((bounds, [count])).tolist()
+    points = np.column_stack(((xs - view.x_min) * sx, py))
+    return [points[a:b].ravel().tolist() for a, b in zip(starts, ends)
+            if b - a >= 2 and ok[a]]
+
+
+def _is_jump(canvas_y, x0, x1, p0, p1):
+    """Scalar version of the bisection in curve_segments: is p0 -> p1 a discontinuity?"""
+    if abs(p1 - p0) <= CURVE_JUMP_PX:
+        return False
+    for _ in range(CURVE_BISECT_STEPS):
+        mid = (x0 + x1) / 2
+        pm = canvas_y(mid)
+        if math.isnan(pm):
+            return True
+        if abs(pm - p0) >= abs(p1 - pm):
+            x1, p1 = mid, pm
+        else:
+            x0, p0 = mid, pm
+    return abs(p1 - p0) > CURVE_JUMP_PX
+
+
+class FunctionCurve:
+    """A y = f(x) plotted on the graph.
+
+    Compiled once; its polylines are recomputed only when the viewport changes
+    (computed counts how often that happened). drawn_key is the view its canvas
+    items were last drawn for.
+    """
+
+    def __init__(self, expr, color):
+        self.expr = expr
+        self.color = color
+        self.vectorized = _load_numpy() is not None
+        # raises ExpressionError / ResultTooLarge for bad input
+        self.func = compile_function(expr, self.vectorized)
+        self.computed = 0
+        self.drawn_key = None
+        self._key = None
+        self._segments = []
+
+    def segments(self, view):
+        key = view.key
+        if key != self._key:
+            self._segments = curve_segments(self.func, view, self.vectorized)
+            self._key = key
+            self.computed += 1
+        return self._segments
+
+
+class PointStore:
+    """The graph's points, as two growing arrays of doubles (x and y).
+
+    Appending is O(1) amortized and a million points take 16 MB; clear() drops
+    the arrays instead of emptying them one point at a time.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self.xs)
+
+    def clear(self):
+        self.xs = array("d")
+        self.ys = array("d")
+
+    def add(self, x, y):
+        self.xs.append(x)
+        self.ys.append(y)
+
+    def add_many(self, xs, ys):
+        np = _load_numpy()
+        if np is not None:
+            # straight memory copies (array("d") is a C double, like float64)
+            self.xs.frombytes(np.ascontiguousarray(xs, dtype=np.float64).tobytes())
+            self.ys.frombytes(np.ascontiguousarray(ys, dtype=np.float64).tobytes())
+        else:
+            self.xs.extend(map(float, xs))
+            self.ys.extend(map(float, ys))
+
+
+def read_points_csv(path):
+    """x and y columns of a CSV file of points (a header line is skipped)."""
+    np = _load_numpy()
+    if np is not None:
+        try:
+            data = np.loadtxt(path, delimiter=",", usecols=(0, 1), ndmin=2)
+        except ValueError:
+            data = np.loadtxt(path, delimiter=",", usecols=(0, 1), ndmin=2, skiprows=1)
+        return data[:, 0], data[:, 1]
+    xs, ys = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        for n, row in enumerate(csv.reader(f)):
+            try:
+                x, y = float(row[0]), float(row[1])
+            except (ValueError, IndexError):
+                if n == 0:
+                    continue  # header
+                raise ValueError(f"line {n + 1}: expected x,y")
+            xs.append(x)
+            ys.append(y)
+    return xs, ys
+
+
+def grid_step(scale):
+    """(minor step in world units, minor lines per major line) for scale pixels per unit.
+
+    Steps run 1, 5, 10, 50, ... (times any power of ten), the smallest at least
+    GRID_MIN_PX apart; majors are every 5th line after a 1 and every 2nd after a 5,
+    so at the default 4 px per unit that is a line every unit, darker every 5.
+    """
+    minor, every = 10.0 ** math.floor(math.log10(GRID_MIN_PX / scale)), 5
+    if minor * scale < GRID_MIN_PX:
+        minor, every = minor * 5, 2
+        if minor * scale < GRID_MIN_PX:
+            minor, every = minor * 2, 5
+    return minor, every
+
+
+def render_grid(view):
+    """RGB pixels of the grid lines for view (spacing from grid_step)."""
+    w, h = view.width, view.height
+    step_x, every_x = grid_step(view.scale_x)
+    step_y, every_y = grid_step(view.scale_y)
+    pixels = bytearray(bytes(GRID_BG) * (w * h))
+    # minor lines first so the major ones stay unbroken where they cross
+    for major in (False, True):
+        color = GRID_MAJOR if major else GRID_MINOR
+        for i in range(math.ceil(view.x_min / step_x), math.floor(view.x_max / step_x) + 1):
+            px = int((i * step_x - view.x_min) * view.scale_x)
+            if (i % every_x == 0) == major and 0 <= px < w:
+                for c in range(3):
+                    pixels[px * 3 + c::w * 3] = bytes((color[c],)) * h
+        for i in range(math.ceil(view.y_min / step_y), math.floor(view.y_max / step_y) + 1):
+            py = int((view.y_max - i * step_y) * view.scale_y)
+            if (i % every_y == 0) == major and 0 <= py < h:
+                pixels[py * w * 3:(py + 1) * w * 3] = bytes(color) * w
+    return bytes(pixels)
+
+
+def _cell_coords(np, values, size):
+    """Cell column (or row) of values in cells of the given size, anchored at 0.
+
+    Clamped to +-INDEX_COORD_MAX, so values far beyond any view share the edge cells.
+    """
+    return np.floor(np.clip(np.divide(values, size), -INDEX_COORD_MAX, INDEX_COORD_MAX)).astype(np.int64)
+
+
+def _index_cell_size(np, values):
+    """Power-of-two cell size putting about INDEX_GRID cells across the middle 98% of values.
+
+    Percentiles (of a sample) rather than the extent, so a few outliers don't make the
+    cells of all the other points huge.
+    """
+    sample = values[::max(1, len(values) // 100_000)]
+    lo, hi = np.percentile(sample, [1, 99])
+    size = (float(hi - lo) or float(values.max() - values.min())) / INDEX_GRID
+    if not 1e-300 < size < 1e300:
+        return 1.0
+    return 2.0 ** math.floor(math.log2(size))
+
+
+def _cell_order(np, cy, cx):
+    """Order sorting cells by row, then column."""
+    w = int(cx.max()) - int(cx.min()) + 1
+    if w * (int(cy.max()) - int(cy.min()) + 1) < 2 ** 62:
+        # one int64 key sorts quicker than two
+        return np.argsort((cy - cy.min()) * w + (cx - cx.min()), kind="stable")
+    return np.lexsort((cx, cy))
+
+
+def _first_of_runs(np, cy, cx):
+    # indices where a new (row, column) pair starts in (row, column) sorted arrays
+    new = np.empty(len(cx), dtype=bool)
+    new[:1] = True
+    new[1:] = (cx[1:] != cx[:-1]) | (cy[1:] != cy[:-1])
+    return np.flatnonzero(new)
+
+
+class PointIndex:
+    """Spatial index over a PointStore, so drawing a view doesn't scan every point.
+
+    Points are bucketed into cells of a fixed size in world units (a power of two,
+    about 1/INDEX_GRID of the spread of the middle 98% of the points; a few far-off
+    points don't stretch the cells of the rest). Only occupied cells are kept, sorted
+    row by row, with the points sorted the same way: the points of a view are a
+    slice per occupied cell, whose rows are found by binary search. Coarser levels
+    merge 2x2 cells, up to a single cell, so density buckets at any zoom cost
+    O(pixels) plus the occupied cells in view.
+
+    Points added after a build stay in an unindexed tail, drawn one by one; the
+    index is rebuilt once the tail passes INDEX_TAIL_MAX. Needs numpy (without
+    it draw_points draws every point).
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.clear()
+
+    def clear(self):
+        self.n = 0
+        self.xs = self.ys = None
+        # per level: (row, column, point count) arrays of the occupied cells, by row then column
+        self.levels = []
+        # the points of level-0 cell i are xs[starts[i]:starts[i + 1]]
+        self.starts = None
+
+    def refresh(self):
+        """Rebuild if too many points were added since the last build."""
+        if len(self.store) - self.n > INDEX_TAIL_MAX:
+            self.rebuild()
+
+    def rebuild(self):
+        np = _load_numpy()
+        if np is None:
+            return
+        xs = np.array(self.store.xs)
+        ys = np.array(self.store.ys)
+        n = len(xs)
+        finite = np.isfinite(xs) & np.isfinite(ys)
+        if not finite.all():
+            xs, ys = xs[finite], ys[finite]
+        self.clear()
+        self.n = n
+        if not len(xs):
+            return
+        self.cell_w = _index_cell_size(np, xs)
+        self.cell_h = _index_cell_size(np, ys)
+        cx = _cell_coords(np, xs, self.cell_w)
+        cy = _cell_coords(np, ys, self.cell_h)
+        order = _cell_order(np, cy, cx)
+        cx, cy = cx[order], cy[order]
+        self.xs, self.ys = xs[order], ys[order]
+        first = _first_of_runs(np, cy, cx)
+        self.starts = np.append(first, len(cx))
+        cy, cx, counts = cy[first], cx[first], np.diff(self.starts)
+        self.levels = [(cy, cx, counts)]
+        # coordinates are clamped, so halving them ends with every cell in -1..0
+        while len(counts) > 1 and not (cx.min() >= -1 and cx.max() <= 0 and cy.min() >= -1 and cy.max() <= 0):
+            cy, cx = cy >> 1, cx >> 1
+            order = _cell_order(np, cy, cx)
+            cy, cx, counts = cy[order], cx[order], counts[order]
+            first = _first_of_runs(np, cy, cx)
+            cy, cx, counts = cy[first], cx[first], np.add.reduceat(counts, first)
+            self.levels.append((cy, cx, counts))
+
+    def _select(self, level, view, pad=0):
+        """The occupied cells of a level that view touches: a slice, an index array or None.
+
+        pad pixels are added left of and above the view (a point's square reaches right
+        and down from it, so those just outside can still show).
+        """
+        if not self.levels:
+            return None
+        np = _load_numpy()
+        w, h = self.cell_w * 2 ** level, self.cell_h * 2 ** level
+        cx0, cx1 = _cell_coords(np, [view.x_min - pad / view.scale_x, view.x_max], w)
+        cy0, cy1 = _cell_coords(np, [view.y_min, view.y_max + pad / view.scale_y], h)
+        cy, cx, _ = self.levels[level]
+        a, b = np.searchsorted(cy, [cy0, cy1 + 1])
+        if a == b:
+            return None
+        band = cx[a:b]
+        inside = (band >= cx0) & (band <= cx1)
+        if inside.all():
+            return slice(a, b)
+        idx = np.flatnonzero(inside)
+        return idx + a if len(idx) else None
+
+    def count(self, view):
+        """Indexed points in the cells view touches (what drawing it would cost)."""
+        cells = self._select(0, view, POINT_SIZE_PX - 1)
+        if cells is None:
+            return 0
+        return int(self.levels[0][2][cells].sum())
+
+    def query(self, view):
+        """x and y arrays of the indexed points in the cells view touches."""
+        np = _load_numpy()
+        cells = self._select(0, view, POINT_SIZE_PX - 1)
+        if cells is None:
+            return np.empty(0), np.empty(0)
+        if isinstance(cells, slice):
+            # whole rows of cells are one contiguous slice
+            a, b = self.starts[cells.start], self.starts[cells.stop]
+            return self.xs[a:b], self.ys[a:b]
+        starts = self.starts[cells]
+        lens = self.starts[cells + 1] - starts
+        # indices of all the cells' slices at once
+        idx = np.repeat(starts - np.cumsum(lens) + lens, lens) + np.arange(lens.sum())
+        return self.xs[idx], self.ys[idx]
+
+    def tail(self):
+        """x and y arrays of the points added since the last build."""
+        np = _load_numpy()
+        return np.array(self.store.xs[self.n:]), np.array(self.store.ys[self.n:])
+
+    def density(self, view):
+        """Indexed point counts per canvas pixel, from buckets at least DENSITY_BUCKET_PX wide."""
+        np = _load_numpy()
+        w, h = view.width, view.height
+        out = np.zeros((h, w), dtype=np.int32)
+        if not self.levels:
+            return out
+        level = 0
+        while (level < len(self.levels) - 1 and
+               min(self.cell_w * view.scale_x, self.cell_h * view.scale_y) * 2 ** level < DENSITY_BUCKET_PX):
+            level += 1
+        cells = self._select(level, view)
+        if cells is None:
+            return out
+        cy, cx, counts = (a[cells] for a in self.levels[level])
+        # counts of the span of cells in view (at most a few per DENSITY_BUCKET_PX pixels)
+        gx, gy = cx.min(), cy.min()
+        grid = np.zeros((cy.max() - gy + 1, cx.max() - gx + 1), dtype=np.int32)
+        grid[cy - gy, cx - gx] = counts
+        bx = np.floor((view.x_min + (np.arange(w) + 0.5) / view.scale_x) / (self.cell_w * 2 ** level)) - gx
+        by = np.floor((view.y_max - (np.arange(h) + 0.5) / view.scale_y) / (self.cell_h * 2 ** level)) - gy
+        okx = (bx >= 0) & (bx < grid.shape[1])
+        oky = (by >= 0) & (by < grid.shape[0])
+        if okx.any() and oky.any():
+            out[np.ix_(oky, okx)] = grid[np.ix_(by[oky].astype(np.intp), bx[okx].astype(np.intp))]
+        return out
+
+
+def draw_points(raster, index, view):
+    """Paint the points in view into raster (on its background); returns "points" or "density".
+
+    Only the points the index finds in view are drawn. With more than
+    DENSITY_MIN_POINTS of them the indexed points are shown as density buckets
+    instead, so a frame costs O(pixels) however many points there are.
+    """
+    if _load_numpy() is None:
+        # no index: every point, one by one
+        for x, y in zip(index.store.xs, index.store.ys):
+            raster.plot(*view.to_canvas(x, y))
+        return "points"
+    index.refresh()
+    if index.count(view) > DENSITY_MIN_POINTS:
+        raster.paint_density(index.density(view))
+        mode = "density"
+    else:
+        raster.plot_many(*view.to_canvas(*index.query(view)))
+        mode = "points"
+    raster.plot_many(*view.to_canvas(*index.tail()))
+    return mode
+
+
+# DENSITY_LOW..DENSITY_HIGH in 256 steps, as 3-byte pixels (built on first use)
+_density_lut = None
+
+
+class PointRaster:
+    """An RGB pixel buffer holding the graph's points, shown as a single PhotoImage.
+
+    Points are POINT_SIZE_PX squares written straight into the buffer on top
+    of a cached background (the grid), so the canvas has one image item however
+    many points there are. Only the rectangle changed since the last
+    take_dirty() has to be copied into the PhotoImage: plotting one point costs
+    the same with ten points on the graph or a million.
+    """
+
+    def __init__(self, width, height, background):
+        self.width, self.height = width, height
+        self.background = background
+        self.pixels = bytearray(background)
+        self.dirty = (0, 0, width, height)
+
+    def reset(self, background=None):
+        """Back to the background (a new one if given): erases every point at once."""
+        if background is not None:
+            self.background = background
+        self.pixels[:] = self.background
+        self._mark(0, 0, self.width, self.height)
+
+    def _mark(self, x0, y0, x1, y1):
+        if self.dirty is not None:
+            dx0, dy0, dx1, dy1 = self.dirty
+            x0, y0, x1, y1 = min(x0, dx0), min(y0, dy0), max(x1, dx1), max(y1, dy1)
+        self.dirty = (x0, y0, x1, y1)
+
+    def plot(self, px, py, color=POINT_COLOR):
+        """Draw one point with its top-left corner at canvas pixel (px, py)."""
+        px, py = math.floor(px), math.floor(py)
+        x0, x1 = max(px, 0), min(px + POINT_SIZE_PX, self.width)
+        y0, y1 = max(py, 0), min(py + POINT_SIZE_PX, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        run = bytes(color) * (x1 - x0)
+        stride = self.width * 3
+        for y in range(y0, y1):
+            start = y * stride + x0 * 3
+            self.pixels[start:start + len(run)] = run
+        self._mark(x0, y0, x1, y1)
+
+    def plot_many(self, pxs, pys, color=POINT_COLOR):
+        """Draw many points at once (numpy arrays of canvas pixels, like plot)."""
+        np = _load_numpy()
+        if np is None:
+            for px, py in zip(pxs, pys):
+                self.plot(px, py, color)
+            return
+        w, h, pad = self.width, self.height, POINT_SIZE_PX - 1
+        # one pass marks the pixel each visible point starts at; the squares are then
+        # grown over the whole mask at once, so the cost is O(points + pixels)
+        with np.errstate(invalid="ignore"):
+            keep = (pxs >= -pad) & (pxs < w) & (pys >= -pad) & (pys < h)
+        if not keep.any():
+            return
+        starts = np.zeros((h + pad, w + pad), dtype=bool)
+        starts[np.floor(pys[keep]).astype(np.intp) + pad, np.floor(pxs[keep]).astype(np.intp) + pad] = True
+        rows = np.zeros((h + pad, w), dtype=bool)
+        for dx in range(POINT_SIZE_PX):
+            rows |= starts[:, pad - dx:pad - dx + w]
+        cover = np.zeros((h, w), dtype=bool)
+        for dy in range(POINT_SIZE_PX):
+            cover |= rows[pad - dy:pad - dy + h]
+        np.frombuffer(self.pixels, dtype=np.uint8).reshape(h, w, 3)[cover] = color
+        ys = np.flatnonzero(cover.any(axis=1))
+        xs = np.flatnonzero(cover.any(axis=0))
+        self._mark(int(xs[0]), int(ys[0]), int(xs[-1]) + 1, int(ys[-1]) + 1)
+
+    def paint_density(self, counts):
+        """Shade pixels by a (height, width) array of counts, on a log scale."""
+        np = _load_numpy()
+        hit = counts > 0
+        if not hit.any():
+            return
+        global _density_lut
+        if _density_lut is None:
+            _density_lut = np.linspace(DENSITY_LOW, DENSITY_HIGH, 256).astype(np.uint8).view("V3").ravel()
+        level = (np.log1p(counts, dtype=np.float32) * np.float32(255 / math.log1p(int(counts.max())))).astype(np.uint8)
+        # whole pixels as 3-byte items: one gather and one masked copy, no per-channel work
+        pixels = np.frombuffer(self.pixels, dtype="V3").reshape(self.height, self.width)
+        np.copyto(pixels, np.take(_density_lut, level), where=hit)
+        self._mark(0, 0, self.width, self.height)
+
+    def take_dirty(self):
+        """(x, y, PPM data) of the region changed since the last call, or None."""
+        if self.dirty is None:
+            return None
+        x0, y0, x1, y1 = self.dirty
+        self.dirty = None
+        return x0, y0, self.ppm(x0, y0, x1, y1)
+
+    def ppm(self, x0=0, y0=0, x1=None, y1=None):
+        """Binary PPM image of a rectangle of the buffer (the whole buffer by default)."""
+        x1 = self.width if x1 is None else x1
+        y1 = self.height if y1 is None else y1
+        stride = self.width * 3
+        if x0 == 0 and x1 == self.width:
+            data = self.pixels[y0 * stride:y1 * stride]
+        else:
+            data = b"".join(self.pixels[y * stride + x0 * 3:y * stride + x1 * 3] for y in range(y0, y1))
+        return b"P6\n%d %d\n255\n" % (x1 - x0, y1 - y0) + bytes(data)
+
+
 # --- Main Application ---
 class Calculator(tk.Tk):
     def __init__(self):
+        # evaluation runs in a worker process (started before Tk, so the fork is clean)
+        self.evaluator = EvalWorker()
+        self._pending = None
         super().__init__()
         # borderless window but still movable via header
         self.overrideredirect(True)
@@ -182,6 +1424,8 @@ class Calculator(tk.Tk):
 
     # -------------------- Button handling --------------------
     def _on_button(self, ch):
+        if ch not in "$G🛠":
+            self._cancel_evaluation()
         if ch == "C":
             self._reset_display()
         elif ch == "$":
@@ -200,15 +1444,47 @@ class Calculator(tk.Tk):
 
     def _evaluate(self):
         expr = self.display.get()
-        try:
-            # safe-ish eval environment
-            result = eval(expr, {"__builtins__": None}, {})
-            self.last_results.append((expr, result))
-            self._set_display(str(result))
-        except Exception:
-            self._set_display("Error")
+        self._cancel_evaluation()
+        # parsed by the expression engine (no eval) in the worker process, so a huge or
+        # slow expression can't freeze the window; the answer is picked up by _poll_result
+        job = self.evaluator.submit(expr)
+        if job is None:
+            self._show_result(expr, *evaluate_to_text(expr))
+            return
+        self._pending = (job, expr)
+        self.after(EVAL_POLL_MS, self._poll_result)
+
+    def _poll_result(self, wait=0.0):
+        if self._pending is None:
+            return
+        reply = self.evaluator.poll(wait)
+        if reply is None:
+            self.after(EVAL_POLL_MS, self._poll_result)
+            return
+        job, expr = self._pending
+        self._pending = None
+        if reply[0] == job:
+            self._show_result(expr, reply[1], reply[2])
+
+    def _show_result(self, expr, status, text):
+        if status == "ok":
+            self.last_results.append((expr, text))
+            self._set_display(text)
+        else:
+            self._set_display(text)
             self.after(1000, self._reset_display)
 
+    def _cancel_evaluation(self):
+        # typing, C or Escape while an answer is pending drops it (and stops the worker)
+        if self._pending is not None:
+            self._pending = None
+            self.evaluator.cancel()
+
+    def destroy(self):
+        self._pending = None
+        self.evaluator.close()
+        super().destroy()
+
     # -------------------- Info Window (⋯ top button) --------------------
     def _open_info_window(self):
         win, top = self._create_window(380, 260, "Information")
@@ -327,9 +1603,9 @@ class Calculator(tk.Tk):
 
         tk.Button(win, text="Convert", bg="#00ff00", fg="black", command=convert).pack(pady=6)
 
-    # -------------------- Graph Window (100x100 grid, clickable) --------------------
+    # -------------------- Graph Window (grid with pan/zoom, clickable) --------------------
     def _open_graph_window(self):
-        win, top = self._create_window(520, 520, "Graph Plotter")
+        win, top = self._create_window(520, 580, "Graph Plotter")
         canvas_size = 400
         padding_top = 48  # space for controls
         canvas = tk.Canvas(win, width=canvas_size, height=canvas_size, bg="white")
@@ -339,84 +1615,225 @@ class Calculator(tk.Tk):
         ctrl = tk.Frame(win, bg="#c0c0c0")
         ctrl.place(x=8, y=6)  # place at top-left area
 
-        tk.Label(ctrl, text="X (0-100):", bg="#c0c0c0").grid(row=0, column=0, padx=4)
+        tk.Label(ctrl, text="X:", bg="#c0c0c0").grid(row=0, column=0, padx=4)
         x_entry = tk.Entry(ctrl, width=6)
         x_entry.grid(row=0, column=1, padx=4)
 
-        tk.Label(ctrl, text="Y (0-100):", bg="#c0c0c0").grid(row=0, column=2, padx=4)
+        tk.Label(ctrl, text="Y:", bg="#c0c0c0").grid(row=0, column=2, padx=4)
         y_entry = tk.Entry(ctrl, width=6)
         y_entry.grid(row=0, column=3, padx=4)
 
-        points = set()  # set of (x,y) pairs
-
-        # draw grid lines (100x100 -> draw every cell as 4px)
-        cell = canvas_size / 100.0  # float cell size
-        # draw faint grid every 5 units for readability
-        for i in range(0, 101):
-            x = i * cell
-            y = i * cell
-            color = "#eee" if i % 5 != 0 else "#ddd"
-            canvas.create_line(x, 0, x, canvas_size, fill=color)
-            canvas.create_line(0, y, canvas_size, y, fill=color)
+        # the canvas starts on 0..100 on both axes (4px per cell); wheel zooms, drag pans
+        view = Viewport(0, 100, 0, 100, canvas_size, canvas_size)
+        points = PointStore()
+        index = PointIndex(points)  # finds the points in view without scanning them all
+        curves = []  # y = f(x) curves overlaid on the points
+        state = {"redraw": None, "mode": "points", "press": None, "dragging": False}
+
+        # grid and points are pixels in one buffer shown as one image; the grid is
+        # rendered once and kept as the buffer's background
+        raster = PointRaster(canvas_size, canvas_size, render_grid(view))
+        photo = tk.PhotoImage(width=canvas_size, height=canvas_size)
+        canvas.create_image(0, 0, anchor="nw", image=photo, tags="raster")
+        canvas.image = photo  # keep a reference, or Tk drops the image
+
+        count_label = tk.Label(win, text="Points: 0", bg="#c0c0c0", font=("Segoe UI", 9))
+
+        def flush():
+            # copy only what changed since the last flush into the PhotoImage
+            region = raster.take_dirty()
+            if region is not None:
+                x, y, data = region
+                photo.tk.call(photo.name, "put", data, "-format", "ppm", "-to", x, y)
+            shown = " (density)" if state["mode"] == "density" else ""
+            count_label.config(text=f"Points: {len(points):,}{shown}")
+
+        def redraw():
+            # whole view: grid for this zoom, the points the index finds in view, curves
+            state["redraw"] = None
+            try:
+                raster.reset(render_grid(view))
+                state["mode"] = draw_points(raster, index, view)
+                flush()
+                draw_curves()
+            except tk.TclError:
+                pass  # window closed before the idle pass ran
+
+        def schedule_redraw():
+            # a burst of wheel/drag events is drawn once, on the next idle pass
+            if state["redraw"] is None:
+                state["redraw"] = win.after_idle(redraw)
+
+        def add_point(x, y):
+            # a new point joins the index's tail; only its square is redrawn
+            points.add(x, y)
+            raster.plot(*view.to_canvas(x, y))
+            flush()
+
+        def add_points(xs, ys):
+            points.add_many(xs, ys)
+            index.rebuild()
+            redraw()
+
+        def zoom_at(factor, px, py):
+            view.zoom(factor, px, py)
+            schedule_redraw()
+
+        def pan_by(dpx, dpy):
+            view.pan(dpx, dpy)
+            schedule_redraw()
+
+        def reset_view():
+            view.x_min, view.x_max, view.y_min, view.y_max = 0, 100, 0, 100
+            schedule_redraw()
+
+        flush()
 
         def plot_point_from_entries():
             try:
                 x = float(x_entry.get())
                 y = float(y_entry.get())
-                if not (0 <= x <= 100 and 0 <= y <= 100):
+                if not (math.isfinite(x) and math.isfinite(y)):
                     raise ValueError
             except Exception:
-                messagebox.showerror("Invalid", "X and Y must be numbers between 0 and 100.")
+                messagebox.showerror("Invalid", "X and Y must be numbers.")
                 return
-            ix = int(round(x))
-            iy = int(round(y))
-            if (ix, iy) in points:
-                return
-            if len(points) >= 10000:  # 100x100 maximum unique cells
-                messagebox.showwarning("Limit", "Maximum points reached.")
-                return
-            points.add((ix, iy))
-            cx = ix * cell
-            cy = (100 - iy) * cell
-            # draw small filled rectangle (pixel)
-            canvas.create_rectangle(cx, cy, cx + cell, cy + cell, fill="red", outline="")
+            add_point(x, y)
 
         def on_canvas_click(event):
-            # event.x,event.y for canvas coordinate
-            # map to 0..100
-            ix = int(event.x // cell)
-            iy = int(100 - (event.y // cell))
-            if ix < 0 or iy < 0 or ix > 100 or iy > 100:
-                return
-            if (ix, iy) in points:
+            # snap to the grid cell under the mouse (at the current zoom): the point is the
+            # cell's top-left corner, so its square fills the cell at the default zoom
+            if not (0 <= event.x < canvas_size and 0 <= event.y < canvas_size):
                 return
-            points.add((ix, iy))
-            cx = ix * cell
-            cy = (100 - iy) * cell
-            canvas.create_rectangle(cx, cy, cx + cell, cy + cell, fill="red", outline="")
+            step = grid_step(view.scale_x)[0]
+            digits = max(0, -math.floor(math.log10(step)))
+            wx, wy = view.to_world(event.x, event.y)
+            ix = round(math.floor(wx / step) * step, digits)
+            iy = round((math.floor(wy / step) + 1) * step, digits)
+            if step >= 1:
+                ix, iy = int(ix), int(iy)
+            add_point(ix, iy)
             # update entries
             x_entry.delete(0, tk.END); x_entry.insert(0, str(ix))
             y_entry.delete(0, tk.END); y_entry.insert(0, str(iy))
 
-        canvas.bind("<Button-1>", on_canvas_click)
+        def on_press(event):
+            state["press"] = (event.x, event.y)
+            state["dragging"] = False
+
+        def on_drag(event):
+            if state["press"] is None:
+                return
+            x0, y0 = state["press"]
+            if not state["dragging"] and max(abs(event.x - x0), abs(event.y - y0)) < DRAG_THRESHOLD_PX:
+                return
+            state["dragging"] = True
+            state["press"] = (event.x, event.y)
+            pan_by(event.x - x0, event.y - y0)
+
+        def on_release(event):
+            # a press that didn't move is a click: plot a point
+            if state["press"] is not None and not state["dragging"]:
+                on_canvas_click(event)
+            state["press"] = None
+            state["dragging"] = False
+
+        def on_wheel(event):
+            if getattr(event, "num", None) in (4, 5):  # X11 sends buttons 4/5
+                notches = 1 if event.num == 4 else -1
+            else:
+                notches = event.delta / 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+            zoom_at(ZOOM_STEP ** notches, event.x, event.y)
+
+        canvas.bind("<ButtonPress-1>", on_press)
+        canvas.bind("<B1-Motion>", on_drag)
+        canvas.bind("<ButtonRelease-1>", on_release)
+        canvas.bind("<MouseWheel>", on_wheel)
+        canvas.bind("<Button-4>", on_wheel)
+        canvas.bind("<Button-5>", on_wheel)
 
         btn_frame = tk.Frame(win, bg="#c0c0c0")
         btn_frame.pack(pady=6)
         tk.Button(btn_frame, text="Plot from entries", bg="#00ff00", fg="black", command=plot_point_from_entries).pack(side="left", padx=6)
+
+        def load_points():
+            path = filedialog.askopenfilename(parent=win, title="Load points",
+                                              filetypes=[("CSV files", "*.csv *.txt"), ("All files", "*.*")])
+            if not path:
+                return
+            try:
+                xs, ys = read_points_csv(path)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Load points", f"Couldn't read points from {path}:\n{e}")
+                return
+            add_points(xs, ys)
+
+        tk.Button(btn_frame, text="Load points...", bg="#c0c0c0", fg="black", command=load_points).pack(side="left", padx=6)
+        tk.Button(btn_frame, text="Reset view", bg="#c0c0c0", fg="black", command=reset_view).pack(side="left", padx=6)
+
         def clear_graph():
-            canvas.delete("all")
+            # no per-point work: drop the arrays and the index, paint the cached grid back
             points.clear()
-            # redraw grid
-            for i in range(0, 101):
-                x = i * cell
-                y = i * cell
-                color = "#eee" if i % 5 != 0 else "#ddd"
-                canvas.create_line(x, 0, x, canvas_size, fill=color)
-                canvas.create_line(0, y, canvas_size, y, fill=color)
+            index.clear()
+            raster.reset()
+            state["mode"] = "points"
+            flush()
+            canvas.delete("curve")
+            curves.clear()
+            for label in legend.winfo_children():
+                label.destroy()
         tk.Button(btn_frame, text="Clear", bg="#ff0000", fg="white", command=clear_graph).pack(side="left", padx=6)
+        count_label.pack()
+
+        # functions: one polyline per continuous piece, sampled in one pass over the view
+        fn_frame = tk.Frame(win, bg="#c0c0c0")
+        fn_frame.pack(pady=(0, 6))
+        tk.Label(fn_frame, text="y =", bg="#c0c0c0").pack(side="left", padx=(4, 2))
+        fn_entry = tk.Entry(fn_frame, width=24)
+        fn_entry.pack(side="left", padx=4)
+        legend = tk.Frame(win, bg="#c0c0c0")
+        legend.pack()
+
+        def draw_curves():
+            # only curves whose samples changed are redrawn (segments() caches per view)
+            for curve in curves:
+                tag = f"curve{id(curve)}"
+                if curve.drawn_key == view.key:
+                    continue
+                canvas.delete(tag)
+                for seg in curve.segments(view):
+                    canvas.create_line(seg, fill=curve.color, width=2, tags=("curve", tag))
+                curve.drawn_key = view.key
+
+        def add_function(event=None):
+            expr = fn_entry.get().strip()
+            if not expr:
+                return
+            if not expr.replace(" ", "").lower().startswith("y="):
+                expr = f"y = {expr}"
+            try:
+                curve = FunctionCurve(expr, CURVE_COLORS[len(curves) % len(CURVE_COLORS)])
+            except (ExpressionError, ArithmeticError, RecursionError):
+                messagebox.showerror("Invalid", f"Can't plot {expr}\nUse x, numbers, + - * / ** //, ( ) and "
+                                     + ", ".join(GRAPH_FUNCTIONS) + ".")
+                return
+            curves.append(curve)
+            tk.Label(legend, text=expr, bg="#c0c0c0", fg=curve.color,
+                     font=("Segoe UI", 9, "bold")).pack(side="left", padx=4)
+            fn_entry.delete(0, tk.END)
+            draw_curves()
+
+        fn_entry.bind("<Return>", add_function)
+        tk.Button(fn_frame, text="Add function", bg="#00ff00", fg="black", command=add_function).pack(side="left", padx=4)
+        win._graph = {"canvas": canvas, "view": view, "curves": curves, "fn_entry": fn_entry,
+                      "add_function": add_function, "clear": clear_graph, "points": points,
+                      "raster": raster, "photo": photo, "add_point": add_point, "add_points": add_points,
+                      "click": on_canvas_click, "index": index, "state": state, "zoom": zoom_at,
+                      "pan": pan_by, "redraw": redraw, "reset_view": reset_view}
 
         # isolate keyboard input: entries should accept input without main display capturing keys.
         # The global _on_key handler checks event.widget and ignores input when focus is an Entry other than main display.
+        return win
 
     # -------------------- Preferences --------------------
     def _open_preferences_window(self):
@@ -492,6 +1909,8 @@ class Calculator(tk.Tk):
             return
 
         key = event.keysym
+        if key in ("BackSpace", "Escape") or (event.char and event.char in "0123456789.+-*/"):
+            self._cancel_evaluation()
         if key in ("Return", "KP_Enter"):
             self._evaluate()
         elif key == "BackSpace":
@@ -6,7 +6,1718 @@ from tkinter import messagebox
 from typing import Any
 import threading
 import time
+import sys
 import tkinter.font as tkfont
+import json
+import os
+import queue
+import bisect
+
+# numpy is optional — bulk flip resolution falls back to simulate() without it.
+# it is imported on first use: importing it costs more than the rest of startup
+_np = None
+
+
+def _load_numpy():
+    """Return the numpy module, importing it on first call (None if not installed)."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+            _np = numpy
+        except Exception:
+            _np = False
+    return _np or None
+
+
+# module load time; the startup profile measures from here
+STARTUP_T0 = time.perf_counter()
+# time-to-first-interactive-frame the startup path should stay under, in ms
+STARTUP_BUDGET_MS = 200
+
+
+# chance per finished flip to find an item (only when the Inventory is owned);
+# which item is decided by the loot table (see LootTable)
+CUBE_DROP_CHANCE = 0.05
+# shop price of the Inventory, in rebirths
+INVENTORY_COST = 5
+# tabs that must be visited for "Visited everything"
+CORE_TABS = ("Flip", "Settings", "Achievements")
+# coin (fill, outline) per visible face
+COIN_FACE_COLORS = {
+    "Heads": ("#E6B800", "#c68f00"),
+    "Tails": ("#cfcfcf", "#9e9e9e"),
+}
+# flips resolved per numpy pass in resolve_flips (bounds temporary array memory)
+FLIP_BATCH_CHUNK = 1 << 20
+# offline catch-up: up to this many missed flips are played out one by one, more are
+# settled in closed form (see CoinFlipGame.catch_up)
+CATCH_UP_EXACT = 4096
+# pixel height of one inventory row (the inventory list scrolls in whole rows)
+INVENTORY_ROW_HEIGHT = 36
+# toast popups shown at once (more events wait in the queue, merging repeats)
+TOAST_SLOTS = 3
+# vertical distance between stacked toasts, in pixels
+TOAST_SPACING = 72
+# ms the coin sprite cache may sit unused before its images are freed
+SPRITE_IDLE_MS = 60_000
+# most coins a single flip can spin at once (Settings > Animation)
+MAX_COINS = 16
+# spin phase between neighbouring coins in the grid, in turns (so they don't spin in lockstep)
+COIN_PHASE_STEP = 0.37
+# window bounce: timer interval (ms) and speed (pixels per second along x and y)
+BOUNCE_TICK_MS = 20
+BOUNCE_VELOCITY = (160.0, 120.0)
+# Statistics tab: flips in the rolling heads ratio, streak lengths in the histogram
+# (longer runs share the last bar) and how often the visible tab repaints, in ms
+STATS_WINDOW = 1000
+STATS_STREAK_MAX = 20
+STATS_REFRESH_MS = 250
+# kind -> (text, font, padding, milliseconds on screen)
+TOAST_STYLES = {
+    "achievement": ("New Achievement:\n{name}", ("Arial", 14, "bold"), 12, 3000),
+    "item": ("Found: {name}", ("Arial", 12, "bold"), 8, 2000),
+    "catch_up": ("While you were away\n{name}", ("Arial", 11, "bold"), 12, 8000),
+}
+# where progress is saved when the game is launched normally
+SAVE_DIR = os.path.join(os.path.expanduser("~"), ".coinflipper")
+# journal entries written before the save is compacted into a new snapshot
+SNAPSHOT_EVERY = 256
+# seconds the save writer waits to merge bursts of changes into one journal entry
+SAVE_INTERVAL = 0.25
+# the last session's input log, written to the save directory on close (see SessionLog)
+SESSION_LOG_NAME = "last_session.json"
+
+
+class AchievementRule:
+    """One achievement: earned when its counter reaches target.
+
+    kind is "flips" (flip_count), "heads_streak" (consecutive heads), "rebirths"
+    (rebirth_count) or "tabs" (target is the set of tab names that must be visited).
+    Permanent rules survive rebirths and are not needed to unlock the Rebirth button.
+    "rebirths" rules are always permanent: one needed for a rebirth could only be
+    earned by rebirthing, and one reset by a rebirth could never be earned again.
+    """
+
+    KINDS = ("flips", "heads_streak", "rebirths", "tabs")
+
+    def __init__(self, name, kind, target, permanent=None):
+        if kind not in self.KINDS:
+            raise ValueError(f"unknown achievement kind: {kind}")
+        if permanent is None:
+            permanent = kind == "rebirths"
+        elif kind == "rebirths" and not permanent:
+            raise ValueError(f"rebirths achievements must be permanent: {name}")
+        self.name = name
+        self.kind = kind
+        self.target = frozenset(target) if kind == "tabs" else int(target)
+        self.permanent = bool(permanent)
+
+
+# achievements -- order matters for display
+DEFAULT_ACHIEVEMENTS = (
+    AchievementRule("1st Coin Flip", "flips", 1),
+    AchievementRule("5th Coin Flip", "flips", 5),
+    AchievementRule("20th Coin Flip", "flips", 20),
+    AchievementRule("50th Coin Flip", "flips", 50),
+    AchievementRule("100th Coin Flip", "flips", 100),
+    AchievementRule("Visited everything", "tabs", CORE_TABS),
+    AchievementRule("I Like Heads", "heads_streak", 4),
+)
+
+
+class AchievementRegistry:
+    """Achievement rules indexed for cheap lookups however many there are.
+
+    Counter rules (flips, heads_streak, rebirths) are kept in sorted threshold lists,
+    so a counter moving from prev to cur finds every crossed rule with two bisects
+    (O(log n + k)), and in a dict by exact threshold for the one-step case.
+    Tab rules are indexed by each tab they need.
+    """
+
+    def __init__(self, rules=DEFAULT_ACHIEVEMENTS):
+        self.rules = {}
+        for rule in rules:
+            if rule.name in self.rules:
+                raise ValueError(f"duplicate achievement: {rule.name}")
+            self.rules[rule.name] = rule
+        # kind -> (sorted thresholds, names in the same order)
+        self._thresholds = {}
+        # kind -> {threshold: [names]}
+        self._exact = {}
+        for kind in ("flips", "heads_streak", "rebirths"):
+            ordered = sorted((r.target, i, r.name) for i, r in enumerate(rules) if r.kind == kind)
+            self._thresholds[kind] = ([t for t, _, _ in ordered], [n for _, _, n in ordered])
+            exact = {}
+            for t, _, n in ordered:
+                exact.setdefault(t, []).append(n)
+            self._exact[kind] = exact
+        # tab -> tab rules that need it
+        self._by_tab = {}
+        for rule in rules:
+            if rule.kind == "tabs":
+                for tab in rule.target:
+                    self._by_tab.setdefault(tab, []).append(rule)
+        # rules that must all be earned before a rebirth
+        self.rebirth_gate = frozenset(r.name for r in rules if not r.permanent)
+        self.permanent = frozenset(r.name for r in rules if r.permanent)
+
+    def names(self):
+        return list(self.rules)
+
+    def crossed(self, kind, prev, cur):
+        """Names of kind rules with prev < threshold <= cur."""
+        thresholds, names = self._thresholds[kind]
+        if cur <= prev or not thresholds:
+            return []
+        lo = bisect.bisect_right(thresholds, prev)
+        hi = bisect.bisect_right(thresholds, cur)
+        return names[lo:hi]
+
+    def reached(self, kind, value):
+        """Names of kind rules whose threshold is exactly value."""
+        return self._exact[kind].get(value, ())
+
+    def names_of(self, kind):
+        """Names of kind rules (counter kinds only), in threshold order."""
+        return self._thresholds[kind][1]
+
+    def tab_rules(self, tab):
+        return self._by_tab.get(tab, ())
+
+
+class LootItem:
+    """One item flips can drop: relative weight, sell value (rebirths per unit) and
+    the rebirth count it starts dropping at."""
+
+    def __init__(self, name, weight, value, min_rebirths=0):
+        if weight <= 0:
+            raise ValueError(f"loot weight must be positive: {name}")
+        self.name = name
+        self.weight = float(weight)
+        self.value = int(value)
+        self.min_rebirths = int(min_rebirths)
+
+
+DEFAULT_LOOT = (
+    LootItem("Rebirth cube", 1, 5),
+)
+
+
+class LootTable:
+    """Items that can drop from a finished flip, picked with Walker's alias method.
+
+    drop_chance is the chance a flip finds anything at all; the item is then picked
+    by weight among those unlocked at the current rebirth count. Items are kept sorted
+    by min_rebirths, so the unlocked ones are always a prefix and get one alias table
+    per prefix (built on first use). A pick is O(1) and uses a single uniform draw, or
+    none while only one item is unlocked. Bulk flips split their drops across items
+    with one multinomial draw (split_bulk).
+    """
+
+    def __init__(self, items=DEFAULT_LOOT, drop_chance=CUBE_DROP_CHANCE):
+        self.items = sorted(items, key=lambda item: item.min_rebirths)
+        # sell value per item name (items not in the table are worth 0: not sellable)
+        self.values = {}
+        for item in self.items:
+            if item.name in self.values:
+                raise ValueError(f"duplicate loot item: {item.name}")
+            self.values[item.name] = item.value
+        self.drop_chance = drop_chance
+        self._unlock_at = [item.min_rebirths for item in self.items]
+        # unlocked prefix length -> (names, prob, alias, weights normalized to 1)
+        self._tables = {}
+
+    def value(self, name):
+        return self.values.get(name, 0)
+
+    def unlocked(self, rebirths):
+        """How many items drop at this rebirth count (they are the first that many)."""
+        return bisect.bisect_right(self._unlock_at, rebirths)
+
+    def _table(self, k):
+        table = self._tables.get(k)
+        if table is None:
+            # Vose's alias construction over the first k items
+            weights = [item.weight for item in self.items[:k]]
+            total = sum(weights)
+            scaled = [w * k / total for w in weights]
+            prob = [1.0] * k
+            alias = list(range(k))
+            small = [i for i, x in enumerate(scaled) if x < 1.0]
+            large = [i for i, x in enumerate(scaled) if x >= 1.0]
+            while small and large:
+                lo = small.pop()
+                hi = large.pop()
+                prob[lo] = scaled[lo]
+                alias[lo] = hi
+                scaled[hi] += scaled[lo] - 1.0
+                (small if scaled[hi] < 1.0 else large).append(hi)
+            # whatever is left is 1 up to rounding
+            table = ([item.name for item in self.items[:k]], prob, alias, [w / total for w in weights])
+            self._tables[k] = table
+        return table
+
+    def pick(self, rand, rebirths=0):
+        """Pick the item a drop turns into; rand is a random() callable. None if no item
+        is unlocked yet."""
+        k = self.unlocked(rebirths)
+        if k <= 1:
+            return self.items[0].name if k else None
+        names, prob, alias, _ = self._table(k)
+        u = rand() * k
+        i = min(int(u), k - 1)
+        return names[i] if u - i < prob[i] else names[alias[i]]
+
+    def split(self, drops, rand, rebirths=0):
+        """Split drops across items one pick at a time; returns {name: count}."""
+        k = self.unlocked(rebirths)
+        if drops <= 0 or k == 0:
+            return {}
+        if k == 1:
+            return {self.items[0].name: drops}
+        found = {}
+        for _ in range(drops):
+            name = self.pick(rand, rebirths)
+            found[name] = found.get(name, 0) + 1
+        return found
+
+    def split_bulk(self, drops, gen, rebirths=0):
+        """Split drops across items with one multinomial draw from numpy Generator gen."""
+        k = self.unlocked(rebirths)
+        if drops <= 0 or k == 0:
+            return {}
+        if k == 1:
+            return {self.items[0].name: drops}
+        names, _, _, p = self._table(k)
+        counts = gen.multinomial(drops, p)
+        return {names[i]: int(c) for i, c in enumerate(counts) if c}
+
+    def split_binomial(self, drops, rng, rebirths=0):
+        """Split drops across items in bounded time without numpy: one conditional
+        binomial draw per item (random.Random rng)."""
+        k = self.unlocked(rebirths)
+        if drops <= 0 or k == 0:
+            return {}
+        if k == 1:
+            return {self.items[0].name: drops}
+        names, _, _, p = self._table(k)
+        found = {}
+        left = drops
+        rest = 1.0
+        for name, q in zip(names[:-1], p[:-1]):
+            cnt = _binomial(rng, left, q / rest) if rest > 0 else 0
+            if cnt:
+                found[name] = cnt
+            left -= cnt
+            rest -= q
+        if left:
+            found[names[-1]] = left
+        return found
+
+
+# counters below this are shown and saved as plain integers
+_PLAIN_LIMIT = 10 ** 15
+_LOG10_2 = math.log10(2)
+
+
+def format_count(n):
+    """Label text for a counter of any size.
+
+    Up to 15 digits it is the plain number; beyond that scientific notation worked
+    out from the bit length and the top 64 bits, so it costs the same for a
+    million-digit value (str() of one would be quadratic, and refused past 4300 digits).
+    """
+    if -_PLAIN_LIMIT < n < _PLAIN_LIMIT:
+        return str(n)
+    sign = "-" if n < 0 else ""
+    n = abs(n)
+    shift = max(0, n.bit_length() - 64)
+    exp10 = math.log10(n >> shift) + shift * _LOG10_2
+    exponent = math.floor(exp10)
+    mantissa = 10 ** (exp10 - exponent)
+    if mantissa >= 9.9995:
+        mantissa, exponent = 1.0, exponent + 1
+    return f"{sign}{mantissa:.3f}e{exponent}"
+
+
+def pack_count(n):
+    """Counter value for save data: small values stay JSON numbers, large ones become
+    a hex string (linear time, and not subject to the int-to-str digit limit)."""
+    if -_PLAIN_LIMIT < n < _PLAIN_LIMIT:
+        return n
+    return hex(n)
+
+
+def unpack_count(value):
+    """Inverse of pack_count."""
+    if isinstance(value, str):
+        return int(value, 16)
+    return int(value)
+
+
+def _binomial(rng, n, p):
+    """Binomial(n, p) sample from a random.Random in bounded time (no numpy).
+
+    Small n is counted draw by draw, a small mean goes through Poisson sampling and
+    anything else through the normal approximation, clamped to 0..n.
+    """
+    if n <= 0 or p <= 0:
+        return 0
+    if p >= 1:
+        return n
+    if n <= 64:
+        return sum(1 for _ in range(n) if rng.random() < p)
+    mean = n * p
+    if mean < 30:
+        # Knuth: count uniforms until their product drops below e^-mean
+        limit = math.exp(-mean)
+        k = 0
+        prod = rng.random()
+        while prod > limit:
+            k += 1
+            prod *= rng.random()
+        return min(k, n)
+    return min(n, max(0, int(round(rng.gauss(mean, math.sqrt(mean * (1 - p)))))))
+
+
+def _leading_heads(rng):
+    """Heads before the first tails in a fair run of flips (P(k) = 2^-(k+1))."""
+    return int(-math.log2(1.0 - rng.random()))
+
+
+class FlipStats:
+    """Running flip statistics in constant memory (the Statistics tab).
+
+    Kept up to date in O(1) per flip: heads/tails/drop totals, the current and longest
+    run of each face, a histogram of finished run lengths (runs of hist_max or longer
+    share the last bucket) and the heads ratio over the last `window` flips, held in a
+    ring buffer. Nothing is ever rescanned, so memory stays the same after any number
+    of flips. version changes on every update so a view can skip repaints.
+    """
+
+    # flips per slice of a batch handed to _add_runs
+    RUN_SLICE = 1 << 18
+
+    def __init__(self, window=STATS_WINDOW, hist_max=STATS_STREAK_MAX):
+        self.window = window
+        self.hist_max = hist_max
+        self.heads = 0
+        self.tails = 0
+        self.drops = 0
+        # face of the run in progress ("Heads"/"Tails", None before any flip) and its length
+        self.run_side = None
+        self.run_len = 0
+        self.longest = {"Heads": 0, "Tails": 0}
+        # hist[k]: finished runs of length k (either face); hist[0] is unused
+        self.hist = [0] * (hist_max + 1)
+        # last `window` outcomes (1 = Heads), next slot to write, slots used, heads among them
+        self._ring = bytearray(window)
+        self._pos = 0
+        self._filled = 0
+        self._ring_heads = 0
+        self.version = 0
+
+    @property
+    def flips(self):
+        return self.heads + self.tails
+
+    def rolling_heads_ratio(self):
+        """Share of heads over the last `window` flips (None before the first flip)."""
+        return self._ring_heads / self._filled if self._filled else None
+
+    def drops_per_1000(self):
+        return self.drops * 1000.0 / self.flips if self.flips else 0.0
+
+    def record(self, outcome, dropped=False):
+        """Count one flip."""
+        is_heads = outcome == "Heads"
+        if is_heads:
+            self.heads += 1
+        else:
+            self.tails += 1
+        if dropped:
+            self.drops += 1
+        if outcome == self.run_side:
+            self.run_len += 1
+        else:
+            self._end_run()
+            self.run_side = outcome
+            self.run_len = 1
+        if self.run_len > self.longest[outcome]:
+            self.longest[outcome] = self.run_len
+        ring = self._ring
+        if self._filled == self.window:
+            self._ring_heads -= ring[self._pos]
+        else:
+            self._filled += 1
+        ring[self._pos] = is_heads
+        self._ring_heads += is_heads
+        self._pos = (self._pos + 1) % self.window
+        self.version += 1
+
+    def add_counts(self, heads, tails, drops=0):
+        """Count flips known only as totals (their order is unknown).
+
+        Only the totals move: the run in progress is closed and the streaks, histogram
+        and rolling ratio carry on from the next flip recorded in order.
+        """
+        self.heads += heads
+        self.tails += tails
+        self.drops += drops
+        if heads or tails:
+            self._end_run()
+            self.run_side = None
+            self.run_len = 0
+        self.version += 1
+
+    def add_batch(self, heads, drops=0):
+        """Count a batch of flips given in order as a numpy bool array (True = Heads).
+
+        Runs are found with array operations, so the cost per flip stays constant;
+        the ring buffer takes only the batch's last `window` outcomes.
+        """
+        np = _load_numpy()
+        m = int(heads.size)
+        if m == 0:
+            return
+        n_heads = int(np.count_nonzero(heads))
+        self.heads += n_heads
+        self.tails += m - n_heads
+        self.drops += drops
+        # slices small enough that the run arrays stay in cache (about twice as fast
+        # as one pass over a 1M-flip chunk)
+        for start in range(0, m, self.RUN_SLICE):
+            self._add_runs(np, heads[start:start + self.RUN_SLICE])
+        # ring buffer: overwrite the oldest slots with the batch's tail, wrapping once
+        tail = heads[-self.window:].astype(np.uint8).tobytes()
+        ring = self._ring
+        pos = self._pos
+        for chunk in (tail[:self.window - pos], tail[self.window - pos:]):
+            if not chunk:
+                continue
+            end = pos + len(chunk)
+            self._ring_heads += sum(chunk) - sum(ring[pos:end])
+            ring[pos:end] = chunk
+            pos = end % self.window
+        self._pos = pos
+        self._filled = min(self.window, self._filled + len(tail))
+        self.version += 1
+
+    def _add_runs(self, np, heads):
+        # streaks and histogram for flips in order; the index where each run but the
+        # last ends gives the rest: inner runs lie between two of those, and faces
+        # alternate from run to run
+        m = int(heads.size)
+        ends = np.flatnonzero(heads[1:] != heads[:-1])
+        first_face = "Heads" if heads[0] else "Tails"
+        first_len = int(ends[0]) + 1 if ends.size else m
+        if first_face == self.run_side:
+            # the first run continues the run in progress
+            first_len += self.run_len
+        else:
+            self._end_run()
+        if not ends.size:
+            self.run_side = first_face
+            self.run_len = first_len
+            self._note_longest(first_face, first_len)
+            return
+        other_face = "Tails" if first_face == "Heads" else "Heads"
+        # the first run is finished too (it may be longer than the histogram's range)
+        self.hist[min(first_len, self.hist_max)] += 1
+        self._note_longest(first_face, first_len)
+        inner = np.diff(ends)
+        if inner.size:
+            counts = np.bincount(inner).tolist()
+            for k in range(1, len(counts)):
+                self.hist[min(k, self.hist_max)] += counts[k]
+            # inner run 0 is the second run, so it shows the other face
+            self._note_longest(other_face, int(inner[0::2].max()))
+            if inner.size > 1:
+                self._note_longest(first_face, int(inner[1::2].max()))
+        self.run_side = first_face if ends.size % 2 == 0 else other_face
+        self.run_len = m - 1 - int(ends[-1])
+        self._note_longest(self.run_side, self.run_len)
+
+    def _end_run(self):
+        if self.run_len:
+            self.hist[min(self.run_len, self.hist_max)] += 1
+
+    def _note_longest(self, face, length):
+        if length > self.longest[face]:
+            self.longest[face] = length
+
+    def histogram(self):
+        """[(run length, count)] for lengths 1..hist_max, counting the run in progress."""
+        counts = list(self.hist)
+        if self.run_len:
+            counts[min(self.run_len, self.hist_max)] += 1
+        return list(enumerate(counts))[1:]
+
+
+class CoinFlipGame:
+    """Game rules and state for the coin flipper, with no Tk dependency.
+
+    CoinFlipApp drives one of these for the window; it can also be used on its own
+    (balance sweeps, load tests) through flip() and simulate(n).
+    Methods that can earn achievements return the list of names newly earned so the
+    caller can show popups.
+    """
+
+    def __init__(self, rng=None, registry=None, seed=None, loot=None):
+        # flip outcomes and cube drops come from separate seeded streams (see reseed);
+        # passing rng (a random.Random, or anything with random() and getrandbits(), which
+        # seeds the numpy streams) makes both use that one stream instead
+        if rng is not None:
+            self.seed = None
+            self.outcome_rng = self.drop_rng = rng
+        else:
+            self.reseed(seed)
+        # SessionLog recording this game's inputs (see start_session), or None
+        self.recorder = None
+        self.registry = registry if registry is not None else AchievementRegistry()
+        self.flip_count = 0
+        self.consec_heads = 0
+        self._rebirth_count = 0
+        # per rebirth count: base frame delay -> effective delay, and the saved form
+        self._delay_cache = {}
+        self._packed_rebirths = 0
+        # achievements mapping name -> earned(bool) -- order matters for display;
+        # change it through award_achievement/_reset_achievements so the gate count stays right
+        self.achievements = {name: False for name in self.registry.names()}
+        # how many rebirth-gate achievements are still locked (0 = Rebirth available)
+        self._gate_locked = len(self.registry.rebirth_gate)
+        self.visited_tabs = set()
+        self.all_tabs = set(CORE_TABS)
+        self.inventory_owned = False
+        # inventory contents: item name -> count
+        self.inventory_items = {}
+        # what flips can drop, and the sell value of every item (rebirths per unit)
+        self.loot = loot if loot is not None else LootTable()
+        self.item_values = self.loot.values
+        # numpy Generators for resolve_flips, seeded from the streams on first use
+        self._np_outcomes = None
+        self._np_drops = None
+        # totals, streaks and rolling ratios of this session's flips (not saved)
+        self.stats = FlipStats()
+
+    @property
+    def rebirth_count(self):
+        return self._rebirth_count
+
+    @rebirth_count.setter
+    def rebirth_count(self, value):
+        # everything derived from the count is cached until it changes
+        self._rebirth_count = value
+        self._delay_cache = {}
+        self._packed_rebirths = None
+
+    # -------------------- rng streams / session recording --------------------
+    def reseed(self, seed=None):
+        """Restart the outcome and drop streams from seed (a fresh random seed if None).
+
+        Each stream is derived from the seed and its own name, so how many drop rolls
+        happen never shifts the outcomes and vice versa.
+        """
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), "big")
+        self.seed = seed
+        self.outcome_rng = random.Random(f"{seed}:outcomes")
+        self.drop_rng = random.Random(f"{seed}:drops")
+        self._np_outcomes = None
+        self._np_drops = None
+
+    def session_state(self):
+        """State a session replay must reproduce: the saved state plus visited tabs."""
+        state = self.to_save()
+        state["visited_tabs"] = sorted(self.visited_tabs)
+        return state
+
+    def start_session(self, seed=None):
+        """Reseed the streams and start recording inputs; returns the SessionLog."""
+        self.reseed(seed)
+        self.recorder = SessionLog(self.seed, self.session_state())
+        return self.recorder
+
+    def _record(self, *event):
+        if self.recorder is not None:
+            self.recorder.record(*event)
+
+    # -------------------- achievements --------------------
+    def award_achievement(self, name):
+        """Mark an achievement earned; returns True only if it was newly earned."""
+        if name not in self.achievements or self.achievements[name]:
+            return False
+        self.achievements[name] = True
+        if name in self.registry.rebirth_gate:
+            self._gate_locked -= 1
+        return True
+
+    def all_achievements_earned(self):
+        """True once every achievement needed for a rebirth is earned (O(1))."""
+        return self._gate_locked == 0
+
+    def _reset_achievements(self, keep_permanent=False):
+        for name in self.achievements:
+            if not (keep_permanent and name in self.registry.permanent):
+                self.achievements[name] = False
+        self._gate_locked = len(self.registry.rebirth_gate)
+
+    def _award_names(self, names):
+        return [name for name in names if self.award_achievement(name)]
+
+    def _award_crossed(self, kind, prev, cur):
+        # award every kind rule whose threshold lies in (prev, cur]
+        return self._award_names(self.registry.crossed(kind, prev, cur))
+
+    def _award_streak_runs(self, carry, first, fresh_peak):
+        """Award streak rules for a run of flips.
+
+        first is where the run that continued the carried-in streak ended up, fresh_peak
+        the longest run that started from zero inside the batch.
+        """
+        awarded = self._award_crossed("heads_streak", carry, first)
+        awarded.extend(self._award_crossed("heads_streak", 0, fresh_peak))
+        return awarded
+
+    def _streak_rules_open(self):
+        return any(not self.achievements[name] for name in self.registry.names_of("heads_streak"))
+
+    def grant_achievement(self, name):
+        """Award an achievement directly (SDN Grant); returns True if newly earned."""
+        self._record("a", name)
+        return self.award_achievement(name)
+
+    def visit_tab(self, tab_text):
+        self._record("t", tab_text)
+        self.visited_tabs.add(tab_text)
+        awarded = []
+        for rule in self.registry.tab_rules(tab_text):
+            if not self.achievements[rule.name] and self.visited_tabs >= rule.target:
+                if self.award_achievement(rule.name):
+                    awarded.append(rule.name)
+        return awarded
+
+    # -------------------- flipping --------------------
+    def begin_flip(self):
+        """Start a flip: pick the outcome, count it and award flip milestones.
+
+        Returns (outcome, awarded). The outcome only takes effect in finish_flip, which
+        the window calls once the spin animation ends.
+        """
+        self._record("b")
+        # same draw simulate() uses, so both paths consume the streams identically
+        outcome = "Heads" if self.outcome_rng.random() < 0.5 else "Tails"
+        self.flip_count += 1
+        return outcome, self._award_names(self.registry.reached("flips", self.flip_count))
+
+    def finish_flip(self, outcome):
+        """Land a flip on outcome: update the heads streak and roll for a cube drop.
+
+        Returns (awarded, dropped) where dropped is an item name or None.
+        """
+        self._record("l")
+        if outcome == "Heads":
+            self.consec_heads += 1
+            awarded = self._award_names(self.registry.reached("heads_streak", self.consec_heads))
+        else:
+            self.consec_heads = 0
+            awarded = []
+        dropped = None
+        if self.inventory_owned and self.drop_rng.random() < self.loot.drop_chance:
+            dropped = self.loot.pick(self.drop_rng.random, self.rebirth_count)
+            if dropped is not None:
+                self.inventory_items[dropped] = self.inventory_items.get(dropped, 0) + 1
+        self.stats.record(outcome, dropped is not None)
+        return awarded, dropped
+
+    def flip(self):
+        """Run one whole flip and return its outcome."""
+        outcome, _ = self.begin_flip()
+        self.finish_flip(outcome)
+        return outcome
+
+    def simulate(self, n):
+        """Advance n flips as fast as possible.
+
+        Produces the same state as n calls to flip(); returns a summary dict with the
+        heads/tails split, the achievements earned and the items found.
+        """
+        n = int(n)
+        self._record("S", n)
+        return self._simulate(n)
+
+    def _simulate(self, n):
+        if n <= 0:
+            return {"heads": 0, "tails": 0, "achievements": [], "items": {}}
+        rand = self.outcome_rng.random
+        drop = self.drop_rng.random
+        owned = self.inventory_owned
+        carry = streak = self.consec_heads
+        loot = self.loot
+        rebirths = self.rebirth_count
+        chance = loot.drop_chance
+        # with one item unlocked a drop needs no pick (and no extra draw)
+        multi = loot.unlocked(rebirths) > 1
+        heads = 0
+        drops = 0
+        found = {}
+        # first: length the carried-in run reached; peak: longest run started inside the loop
+        first = None
+        peak = 0
+        # locals only inside the loop; everything else is settled afterwards
+        for _ in range(n):
+            if rand() < 0.5:
+                heads += 1
+                streak += 1
+            else:
+                if first is None:
+                    first = streak
+                elif streak > peak:
+                    peak = streak
+                streak = 0
+            if owned and drop() < chance:
+                drops += 1
+                if multi:
+                    name = loot.pick(drop, rebirths)
+                    found[name] = found.get(name, 0) + 1
+        if first is None:
+            first = streak
+        elif streak > peak:
+            peak = streak
+        prev = self.flip_count
+        self.flip_count = prev + n
+        self.consec_heads = streak
+        awarded = self._award_crossed("flips", prev, self.flip_count)
+        awarded.extend(self._award_streak_runs(carry, first, peak))
+        if not multi:
+            found = loot.split(drops, drop, rebirths)
+        items = self._add_found(found)
+        self.stats.add_counts(heads, n - heads, sum(items.values()))
+        return {"heads": heads, "tails": n - heads, "achievements": awarded, "items": items}
+
+    def _add_found(self, found):
+        # add {name: count} of dropped items to the inventory; returns the non-zero part
+        items = {}
+        for name, cnt in found.items():
+            if cnt:
+                self.inventory_items[name] = self.inventory_items.get(name, 0) + cnt
+                items[name] = cnt
+        return items
+
+    def resolve_flips(self, n):
+        """Resolve n flips at once with numpy (auto-flip, SDN Give Flips, catch-up).
+
+        Outcomes are drawn as packed random bits and cube drops as one binomial draw per
+        chunk, then settled by apply_flip_batch. Returns the same summary as simulate();
+        without numpy it simply calls simulate(n).
+        """
+        n = int(n)
+        self._record("F", n)
+        np = _load_numpy()
+        if np is None:
+            return self._simulate(n)
+        self._seed_np(np)
+        gen = self._np_outcomes
+        total = {"heads": 0, "tails": 0, "achievements": [], "items": {}}
+        left = n
+        while left > 0:
+            m = min(left, FLIP_BATCH_CHUNK)
+            heads = np.unpackbits(np.frombuffer(gen.bytes((m + 7) // 8), dtype=np.uint8), count=m).view(bool)
+            found = {}
+            if self.inventory_owned:
+                drops = int(self._np_drops.binomial(m, self.loot.drop_chance))
+                found = self.loot.split_bulk(drops, self._np_drops, self.rebirth_count)
+            part = self.apply_flip_batch(heads, found)
+            total["heads"] += part["heads"]
+            total["tails"] += part["tails"]
+            total["achievements"].extend(part["achievements"])
+            for name, cnt in part["items"].items():
+                total["items"][name] = total["items"].get(name, 0) + cnt
+            left -= m
+        return total
+
+    def _seed_np(self, np):
+        # numpy Generators drawn from the two streams, made on first use
+        if self._np_outcomes is None:
+            self._np_outcomes = np.random.default_rng(self.outcome_rng.getrandbits(64))
+            self._np_drops = np.random.default_rng(self.drop_rng.getrandbits(64))
+
+    def catch_up(self, n):
+        """Credit n flips missed while the game was closed or minimized.
+
+        Up to CATCH_UP_EXACT flips are played out like simulate(n). Beyond that the
+        result is sampled in closed form, so hours of flips cost the same as a few:
+        the heads count and the drops are binomial draws, the carried streak is
+        extended by the heads before the first tails, the new streak is the heads
+        after the last tails, and the longest run in between (for streak achievements)
+        comes from P(no run of L heads in n flips) ~ exp(-n / 2^(L+1)).
+        Returns the same summary as simulate().
+        """
+        n = int(n)
+        self._record("C", n)
+        if n <= CATCH_UP_EXACT:
+            return self._simulate(n)
+        rng = self.outcome_rng
+        np = _load_numpy()
+        if np is not None:
+            self._seed_np(np)
+            heads = int(self._np_outcomes.binomial(n, 0.5))
+        else:
+            heads = _binomial(rng, n, 0.5)
+        carry = self.consec_heads
+        if heads == n:
+            first = streak = carry + n
+            peak = 0
+        else:
+            lead = min(_leading_heads(rng), heads)
+            streak = min(_leading_heads(rng), heads - lead)
+            first = carry + lead
+            # longest run between the first and the last tails
+            u = 1.0 - rng.random()
+            peak = int(math.log2(n / -math.log(u))) - 1 if u < 1.0 else heads
+            peak = max(0, min(peak, heads - lead - streak))
+        prev = self.flip_count
+        self.flip_count = prev + n
+        self.consec_heads = streak
+        awarded = self._award_crossed("flips", prev, self.flip_count)
+        awarded.extend(self._award_streak_runs(carry, first, peak))
+        found = {}
+        if self.inventory_owned:
+            chance = self.loot.drop_chance
+            if np is not None:
+                drops = int(self._np_drops.binomial(n, chance))
+                found = self.loot.split_bulk(drops, self._np_drops, self.rebirth_count)
+            else:
+                drops = _binomial(self.drop_rng, n, chance)
+                found = self.loot.split_binomial(drops, self.drop_rng, self.rebirth_count)
+        items = self._add_found(found)
+        self.stats.add_counts(heads, n - heads, sum(items.values()))
+        return {"heads": heads, "tails": n - heads, "achievements": awarded, "items": items}
+
+    def apply_flip_batch(self, heads, drops=0):
+        """Apply a batch of already-decided flips in order.
+
+        heads is a bool array (True = Heads); drops is the items found as {name: count},
+        the number of drops, or a bool array of per-flip drop rolls (a number or rolls
+        are turned into items by the loot table). The resulting state is exactly what
+        the same flips through begin_flip/finish_flip would leave, including heads-streak
+        achievements firing when a streak (carried in from earlier flips) reaches their
+        threshold and drops only counting while the Inventory is owned. (With several
+        items unlocked, which item each drop is gets picked after the batch.)
+        """
+        np = _load_numpy()
+        heads = np.asarray(heads, dtype=bool)
+        m = int(heads.size)
+        if m == 0:
+            return {"heads": 0, "tails": 0, "achievements": [], "items": {}}
+        n_heads = int(np.count_nonzero(heads))
+        carry = self.consec_heads
+        # first: length the carried-in run reached; peak: longest run started inside the batch
+        first = carry
+        peak = 0
+        if n_heads == m:
+            # one unbroken run continuing the current streak
+            streak = first = carry + m
+        else:
+            tails_at = np.flatnonzero(~heads)
+            last = int(tails_at[-1])
+            # streak after the batch is the run of heads after the last tails
+            streak = m - 1 - last
+            if self._streak_rules_open():
+                # the run before the first tails extends the carried streak; later runs
+                # start from zero
+                first = carry + int(tails_at[0])
+                peak = streak
+                if tails_at.size > 1:
+                    peak = max(peak, int(np.diff(tails_at).max()) - 1)
+        prev = self.flip_count
+        self.flip_count = prev + m
+        self.consec_heads = streak
+        awarded = self._award_crossed("flips", prev, self.flip_count)
+        awarded.extend(self._award_streak_runs(carry, first, peak))
+        items = {}
+        if self.inventory_owned:
+            if isinstance(drops, dict):
+                found = drops
+            else:
+                if not isinstance(drops, (int, np.integer)):
+                    drops = np.count_nonzero(np.asarray(drops, dtype=bool))
+                found = self.loot.split(int(drops), self.drop_rng.random, self.rebirth_count)
+            items = self._add_found(found)
+        self.stats.add_batch(heads, sum(items.values()))
+        return {"heads": n_heads, "tails": m - n_heads, "achievements": awarded, "items": items}
+
+    # -------------------- rebirth / shop / inventory --------------------
+    def effective_frame_delay(self, base_frame_delay=50):
+        """Frame delay in ms after the 2^rebirth_count speed multiplier, clamped to 5 ms.
+
+        Worked out in log2 space: base / 2^n is base >> n, which is 0 as soon as n
+        reaches base's bit length, so 2^n is never built. Cached per rebirth count.
+        """
+        delay = self._delay_cache.get(base_frame_delay)
+        if delay is None:
+            try:
+                base = int(base_frame_delay)
+            except Exception:
+                base = 50
+            n = self.rebirth_count
+            if n <= 0 or base <= 0:
+                scaled = base
+            elif n >= base.bit_length():
+                scaled = 0
+            else:
+                scaled = base >> n
+            delay = max(5, scaled)
+            self._delay_cache[base_frame_delay] = delay
+        return delay
+
+    def rebirth(self):
+        """Gain a rebirth and reset achievements (except permanent ones), flips, the heads
+        streak and visited tabs. Returns rebirth achievements earned by the new count."""
+        self._record("r")
+        self._reset_achievements(keep_permanent=True)
+        self.flip_count = 0
+        self.consec_heads = 0
+        self.visited_tabs = set()
+        return self._add_rebirths(1)
+
+    def add_rebirths(self, n):
+        """Add n rebirths; returns the rebirth achievements crossed."""
+        self._record("R", pack_count(n))
+        return self._add_rebirths(n)
+
+    def _add_rebirths(self, n):
+        if n <= 0:
+            return []
+        prev = self.rebirth_count
+        self.rebirth_count += n
+        return self._award_crossed("rebirths", prev, self.rebirth_count)
+
+    def shop_unlocked(self):
+        return self.rebirth_count >= 1
+
+    def buy_inventory(self):
+        """Buy the Inventory for INVENTORY_COST rebirths; returns True on purchase."""
+        self._record("p")
+        if self.inventory_owned or self.rebirth_count < INVENTORY_COST:
+            return False
+        self.rebirth_count -= INVENTORY_COST
+        self.inventory_owned = True
+        return True
+
+    def unlock_inventory(self):
+        """Own the Inventory without paying for it (SDN Give Item)."""
+        self._record("o")
+        self.inventory_owned = True
+
+    def add_item(self, name, count):
+        self._record("i", name, pack_count(count))
+        if count > 0:
+            self.inventory_items[name] = self.inventory_items.get(name, 0) + count
+
+    def sell_item(self, name, qty):
+        """Sell up to qty units of name.
+
+        Returns (rebirths gained, rebirth achievements crossed); (0, []) if nothing sold.
+        """
+        self._record("s", name, pack_count(qty))
+        cnt = self.inventory_items.get(name, 0)
+        val = self.loot.value(name)
+        if qty <= 0 or cnt <= 0 or val <= 0:
+            return 0, []
+        to_sell = min(qty, cnt)
+        remaining = cnt - to_sell
+        if remaining > 0:
+            self.inventory_items[name] = remaining
+        else:
+            del self.inventory_items[name]
+        gained = to_sell * val
+        return gained, self._add_rebirths(gained)
+
+    def to_save(self):
+        """Persistent part of the game state as plain JSON-friendly values."""
+        return {
+            "flip_count": pack_count(self.flip_count),
+            "consec_heads": self.consec_heads,
+            "rebirth_count": self._saved_rebirths(),
+            "achievements": dict(self.achievements),
+            "inventory_owned": self.inventory_owned,
+            "inventory_items": {name: pack_count(cnt) for name, cnt in self.inventory_items.items()},
+        }
+
+    def _saved_rebirths(self):
+        # packed once per count: a save after every flip must not redo bigint work
+        if self._packed_rebirths is None:
+            self._packed_rebirths = pack_count(self.rebirth_count)
+        return self._packed_rebirths
+
+    def load_save(self, data):
+        """Restore state written by to_save(); unknown or missing keys are ignored."""
+        self.flip_count = unpack_count(data.get("flip_count", self.flip_count))
+        self.consec_heads = int(data.get("consec_heads", self.consec_heads))
+        self.rebirth_count = unpack_count(data.get("rebirth_count", self.rebirth_count))
+        for name, earned in data.get("achievements", {}).items():
+            if name in self.achievements:
+                self.achievements[name] = bool(earned)
+        self._gate_locked = sum(1 for name in self.registry.rebirth_gate if not self.achievements[name])
+        self.inventory_owned = bool(data.get("inventory_owned", self.inventory_owned))
+        if "inventory_items" in data:
+            self.inventory_items = {str(k): unpack_count(v) for k, v in data["inventory_items"].items()}
+
+    def reset(self):
+        """Wipe all progress (SDN Revoke All)."""
+        self._record("x")
+        self._reset_achievements()
+        self.flip_count = 0
+        self.consec_heads = 0
+        self.visited_tabs = set()
+        self.rebirth_count = 0
+        self.inventory_owned = False
+        self.inventory_items = {}
+        self.stats = FlipStats()
+
+
+class SessionLog:
+    """Compact record of one play session: seed, starting state, inputs, final state.
+
+    Events are short lists in the order the game saw them:
+      ["f", n]          n flips, each begun and landed back to back
+      ["b"], ["l"]      a flip begun / landed with other inputs in between
+      ["s", item, qty]  sell          ["p"] buy Inventory      ["r"] rebirth
+      ["R", n]          give rebirths ["F", n] bulk flips      ["S", n] simulate
+      ["C", n]          offline catch-up of n flips
+      ["i", item, n]    give item     ["o"] unlock Inventory   ["a", name] grant
+      ["t", tab]        visit tab     ["x"] reset
+    (counts in s/R/i are stored with pack_count, like counters in save data.)
+    Together with the seed that is enough to rebuild the session: replay() runs it
+    on a fresh game without Tk or animation, verify() compares it with final.
+    """
+
+    VERSION = 1
+
+    def __init__(self, seed, start, events=None, final=None):
+        self.seed = seed
+        self.start = start
+        self.events = events if events is not None else []
+        self.final = final
+        # flips recorded as begun but not landed yet (several while coins flip together)
+        self._open = 0
+
+    def record(self, kind, *args):
+        events = self.events
+        if kind == "b":
+            self._open += 1
+        elif kind == "l":
+            self._open = max(0, self._open - 1)
+        if kind == "l" and self._open == 0 and events and events[-1] == ["b"]:
+            # the only open flip, begun and landed back to back: fold into the current run of flips
+            events.pop()
+            if events and events[-1][0] == "f":
+                events[-1][1] += 1
+            else:
+                events.append(["f", 1])
+            return
+        events.append([kind, *args])
+
+    def finish(self, game):
+        """Store the game's current state as the state a replay must end in."""
+        self.final = game.session_state()
+
+    def to_dict(self):
+        return {"version": self.VERSION, "seed": self.seed, "start": self.start,
+                "events": self.events, "final": self.final}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["seed"], data["start"], data.get("events", []), data.get("final"))
+
+    def save(self, path):
+        """Write the log as compact JSON (atomic replace)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def replay(self, registry=None):
+        """Run the recorded inputs on a fresh game and return it."""
+        game = CoinFlipGame(seed=self.seed, registry=registry)
+        game.load_save(self.start)
+        game.visited_tabs = set(self.start.get("visited_tabs", []))
+        # outcomes of flips begun but not landed yet
+        pending = []
+        for event in self.events:
+            kind = event[0]
+            if kind == "f":
+                # same state as n flip() calls, without the per-flip overhead
+                game._simulate(event[1])
+            elif kind == "b":
+                pending.append(game.begin_flip()[0])
+            elif kind == "l":
+                game.finish_flip(pending.pop(0))
+            elif kind == "s":
+                game.sell_item(event[1], unpack_count(event[2]))
+            elif kind == "p":
+                game.buy_inventory()
+            elif kind == "r":
+                game.rebirth()
+            elif kind == "R":
+                game.add_rebirths(unpack_count(event[1]))
+            elif kind == "F":
+                game.resolve_flips(event[1])
+            elif kind == "S":
+                game.simulate(event[1])
+            elif kind == "C":
+                game.catch_up(event[1])
+            elif kind == "i":
+                game.add_item(event[1], unpack_count(event[2]))
+            elif kind == "o":
+                game.unlock_inventory()
+            elif kind == "a":
+                game.grant_achievement(event[1])
+            elif kind == "t":
+                game.visit_tab(event[1])
+            elif kind == "x":
+                game.reset()
+        return game
+
+    def verify(self, game=None):
+        """Replay the session (unless given the replayed game) and compare with final.
+
+        Returns the names of the state keys that differ; an empty list means the replay
+        reproduced the session exactly.
+        """
+        if game is None:
+            game = self.replay()
+        state = game.session_state()
+        final = self.final or {}
+        return [key for key in final if state.get(key) != final[key]]
+
+
+class SaveStore:
+    """Crash-safe progress storage: an append-only journal plus compacted snapshots.
+
+    record() only queues a state patch; a background thread merges queued patches,
+    appends them to journal.jsonl and fsyncs, so the Tk thread never waits on disk.
+    Every SNAPSHOT_EVERY entries the full state is written to snapshot.json (atomic
+    replace) and the journal is truncated, which keeps load() near-constant time.
+    """
+
+    def __init__(self, directory=SAVE_DIR):
+        self.directory = directory
+        self.snapshot_path = os.path.join(directory, "snapshot.json")
+        self.journal_path = os.path.join(directory, "journal.jsonl")
+        self._queue = queue.Queue()
+        self._thread = None
+        # writer-side mirror of the saved state, used to write snapshots
+        self._state = {}
+        self._seq = 0
+        self._journal_len = 0
+        # byte length of the journal's valid entries (a crash can leave a torn last line)
+        self._journal_end = 0
+        # the writer needs load()'s seq and journal length, or it would truncate the
+        # journal and restart seq at 1 (entries the next load() would then skip)
+        self._loaded = False
+
+    def load(self):
+        """Return the saved state (snapshot plus journal tail), or {} if nothing is saved."""
+        state = {}
+        seq = 0
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                snapshot = json.load(f)
+            state = dict(snapshot.get("state", {}))
+            seq = int(snapshot.get("seq", 0))
+        except (OSError, ValueError):
+            pass
+        journal_len = 0
+        journal_end = 0
+        try:
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break
+                    journal_len += 1
+                    journal_end += len(line)
+                    # entries already folded into the snapshot are skipped
+                    if entry.get("seq", 0) > seq:
+                        seq = entry["seq"]
+                        state.update(entry.get("patch", {}))
+        except OSError:
+            pass
+        self._state = dict(state)
+        self._seq = seq
+        self._journal_len = journal_len
+        self._journal_end = journal_end
+        self._loaded = True
+        return state
+
+    def record(self, patch):
+        """Queue a patch (changed keys -> new values) to be saved; never blocks.
+
+        The first record() on a store that was never load()ed loads it first.
+        """
+        if not patch:
+            return
+        if self._thread is None:
+            if not self._loaded:
+                self.load()
+            self._thread = threading.Thread(target=self._run, name="SaveStore", daemon=True)
+            self._thread.start()
+        self._queue.put(dict(patch))
+
+    def close(self, timeout=2.0):
+        """Flush queued patches and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # drop a torn entry left by a crash so new entries start on a clean line
+            if os.path.exists(self.journal_path) and os.path.getsize(self.journal_path) > self._journal_end:
+                os.truncate(self.journal_path, self._journal_end)
+        except OSError:
+            pass
+        stop = False
+        while not stop:
+            merged = self._queue.get()
+            if merged is None:
+                break
+            # let a burst of changes pile up for SAVE_INTERVAL so it becomes a single entry
+            deadline = time.monotonic() + SAVE_INTERVAL
+            while True:
+                remaining = deadline - time.monotonic()
+                try:
+                    more = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    # close(): write what we have and stop
+                    stop = True
+                    break
+                merged.update(more)
+            if merged:
+                try:
+                    self._append(merged)
+                except OSError:
+                    pass
+
+    def _append(self, patch):
+        self._seq += 1
+        line = json.dumps({"seq": self._seq, "patch": patch}, separators=(",", ":")) + "\n"
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self._state.update(patch)
+        self._journal_len += 1
+        if self._journal_len >= SNAPSHOT_EVERY:
+            self._compact()
+
+    def _compact(self):
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"seq": self._seq, "state": self._state}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.snapshot_path)
+        # the snapshot now covers every journal entry (their seq <= snapshot seq)
+        with open(self.journal_path, "w", encoding="utf-8"):
+            pass
+        self._journal_len = 0
+        self._journal_end = 0
+
+
+class FrameClock:
+    """Schedules animation frames against absolute time.perf_counter() deadlines.
+
+    Frame i of a run is due at start + i * delay, so a slow frame doesn't push back the
+    ones after it; frames whose deadline has already passed are dropped instead, keeping
+    the whole run at frames * delay. Per-run jitter and drop counts are kept for stats().
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.start(0, 0)
+
+    def start(self, frames, delay_ms):
+        """Begin a run of frames (plus a final landing frame at index frames)."""
+        self.frames = frames
+        self.delay = max(0, delay_ms) / 1000.0
+        self.t0 = self.clock()
+        self.next_frame = 0
+        self.drawn = 0
+        self.dropped = 0
+        self.jitter_total = 0.0
+        self.jitter_max = 0.0
+        self.finished_at = None
+
+    def tick(self):
+        """Return the index of the frame to draw now, skipping any that are overdue."""
+        now = self.clock()
+        if self.delay > 0:
+            due = int((now - self.t0) / self.delay)
+        else:
+            due = self.next_frame
+        frame = max(self.next_frame, min(due, self.frames))
+        self.dropped += frame - self.next_frame
+        self.next_frame = frame + 1
+        self.drawn += 1
+        # jitter: how late this frame is against its own deadline
+        late = max(0.0, now - (self.t0 + frame * self.delay))
+        self.jitter_total += late
+        if late > self.jitter_max:
+            self.jitter_max = late
+        if frame >= self.frames:
+            self.finished_at = now
+        return frame
+
+    def wait_ms(self):
+        """Milliseconds until the next frame's deadline (for after())."""
+        deadline = self.t0 + self.next_frame * self.delay
+        # round up: after() firing early would draw a frame ahead of its deadline
+        return max(0, math.ceil(round((deadline - self.clock()) * 1000, 6)))
+
+    def stats(self):
+        """Timing of the current/last run; times in ms."""
+        end = self.finished_at if self.finished_at is not None else self.clock()
+        return {
+            "frames": self.frames,
+            "drawn": self.drawn,
+            "dropped": self.dropped,
+            "planned_ms": self.frames * self.delay * 1000.0,
+            "actual_ms": (end - self.t0) * 1000.0,
+            "jitter_mean_ms": self.jitter_total / self.drawn * 1000.0 if self.drawn else 0.0,
+            "jitter_max_ms": self.jitter_max * 1000.0,
+        }
+
+
+class CoinSprites:
+    """Coin spin frames pre-rendered into PhotoImages, to swap on one canvas image item.
+
+    An image is keyed by its pixel size and colors, so keyframes that share a width
+    (the spin is symmetric) share an image. The caller renders the whole keyframe
+    table with prerender() whenever the coin size changes, so a flip only swaps
+    images that already exist. Rendering fills one horizontal run per outline edge
+    and one for the face on each row; pixels outside the coin stay transparent, so
+    the images don't depend on the background. The caller clears the cache when the
+    coin size changes or the cache goes unused.
+    """
+
+    def __init__(self, master, outline_width=4):
+        self.master = master
+        self.outline_width = outline_width
+        self._images = {}
+        # images rendered since creation (a cache miss each)
+        self.rendered = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    def get(self, coords, fill, outline):
+        """Image of the coin drawn in bounding box coords."""
+        x0, y0, x1, y1 = coords
+        key = (max(1, int(round(x1 - x0))), max(1, int(round(y1 - y0))), fill, outline)
+        image = self._images.get(key)
+        if image is None:
+            image = self._render(*key)
+            self._images[key] = image
+        return image
+
+    def prerender(self, frames):
+        """Render the image of every (coords, fill, outline, ...) keyframe not cached yet."""
+        before = self.rendered
+        for frame in frames:
+            self.get(frame[0], frame[1], frame[2])
+        return self.rendered - before
+
+    def clear(self):
+        self._images = {}
+
+    def _render(self, w, h, fill, outline):
+        image = tk.PhotoImage(master=self.master, width=w, height=h)
+        rx, ry = w / 2, h / 2
+        irx, iry = rx - self.outline_width, ry - self.outline_width
+        for y in range(h):
+            dy = y + 0.5 - ry
+            t = 1.0 - (dy / ry) ** 2
+            if t <= 0:
+                continue
+            half = rx * math.sqrt(t)
+            left, right = int(round(rx - half)), int(round(rx + half))
+            if right <= left:
+                continue
+            runs = [(left, right, outline)]
+            if irx > 0 and abs(dy) < iry:
+                inner = irx * math.sqrt(1.0 - (dy / iry) ** 2)
+                il, ir = int(round(rx - inner)), int(round(rx + inner))
+                if ir > il:
+                    runs = [(left, il, outline), (il, ir, fill), (ir, right, outline)]
+            for a, b, color in runs:
+                if b > a:
+                    image.put(color, to=(a, y, b, y + 1))
+        self.rendered += 1
+        return image
+
+
+class WindowMotion:
+    """Moves any number of toplevel windows across the screen from one shared after() timer.
+
+    Each window has a float position and a velocity in pixels per second; a tick moves it
+    by velocity * elapsed time, so the speed doesn't depend on how regularly the timer
+    fires. Windows bounce off the screen edges. Screen and window sizes are read once and
+    kept up to date from each window's <Configure> events, so a tick makes no winfo
+    queries, only a position-only geometry() call for windows whose pixel position changed.
+
+    The owner forwards those events to on_configure() from its own <Configure> bindings;
+    WindowMotion never binds or unbinds anything itself (unbinding one funcid removes
+    every binding for the sequence on some Tk versions, the app's own handlers included).
+    """
+
+    # longest step a single tick may take (s), so a stalled event loop doesn't teleport windows
+    MAX_STEP = 0.1
+
+    def __init__(self, master, tick_ms=BOUNCE_TICK_MS, clock=time.perf_counter):
+        self.master = master
+        self.tick_ms = tick_ms
+        self.clock = clock
+        # window -> [x, y, vx, vy, width, height, last x set, last y set]
+        self._windows = {}
+        self._screen = None
+        self._job = None
+        self._last = None
+        # ticks run and geometry() calls made, for profiling
+        self.ticks = 0
+        self.moves = 0
+
+    def __len__(self):
+        return len(self._windows)
+
+    def __contains__(self, win):
+        return win in self._windows
+
+    @property
+    def running(self):
+        return self._job is not None
+
+    def add(self, win, vx, vy):
+        """Start moving win at (vx, vy) pixels per second (or change its velocity)."""
+        state = self._windows.get(win)
+        if state is not None:
+            state[2], state[3] = float(vx), float(vy)
+            return
+        win.update_idletasks()
+        x, y = win.winfo_x(), win.winfo_y()
+        self._windows[win] = [float(x), float(y), float(vx), float(vy),
+                              win.winfo_width(), win.winfo_height(), x, y]
+        if self._job is None:
+            self._last = self.clock()
+            self._job = self.master.after(self.tick_ms, self.tick)
+
+    def remove(self, win):
+        self._windows.pop(win, None)
+        if not self._windows:
+            self.stop()
+
+    def stop(self):
+        """Stop the timer and forget every window."""
+        for win in list(self._windows):
+            self.remove(win)
+        if self._job is not None:
+            try:
+                self.master.after_cancel(self._job)
+            except Exception:
+                pass
+            self._job = None
+
+    def invalidate(self):
+        """Re-read the screen size on the next tick (e.g. after a monitor change)."""
+        self._screen = None
+
+    def on_configure(self, event):
+        """Track the size of a moving window; pass every <Configure> event of the windows added."""
+        # bindings on a toplevel also fire for its children, which are never in _windows
+        state = self._windows.get(event.widget)
+        if state is not None:
+            state[4], state[5] = event.width, event.height
+
+    def tick(self):
+        self._job = None
+        if not self._windows:
+            return
+        now = self.clock()
+        dt = min(max(0.0, now - self._last), self.MAX_STEP)
+        self._last = now
+        self.ticks += 1
+        if self._screen is None:
+            self._screen = (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
+        sw, sh = self._screen
+        for win, state in list(self._windows.items()):
+            x, y, vx, vy, w, h = state[:6]
+            x += vx * dt
+            y += vy * dt
+            # bounce off edges
+            if x < 0 or x + w > sw:
+                state[2] = -vx
+                x = max(0.0, min(x, float(sw - w)))
+            if y < 0 or y + h > sh:
+                state[3] = -vy
+                y = max(0.0, min(y, float(sh - h)))
+            state[0], state[1] = x, y
+            ix, iy = int(x), int(y)
+            if ix == state[6] and iy == state[7]:
+                continue
+            try:
+                win.geometry(f"+{ix}+{iy}")
+            except tk.TclError:
+                # the window was destroyed while moving
+                self._windows.pop(win, None)
+                continue
+            state[6], state[7] = ix, iy
+            self.moves += 1
+        if self._windows:
+            self._job = self.master.after(self.tick_ms, self.tick)
+
+
+class ToastManager:
+    """Small pool of reusable popup windows fed by a coalescing queue.
+
+    Toplevels are created once and withdrawn between uses. An event whose toast is
+    already showing (or waiting) bumps a counter instead of opening another window
+    ("Found: Rebirth cube ×37"); coalesced counts how often that happened. Toasts are
+    positioned from a cached copy of the master geometry, refreshed after the master
+    moves or resizes, so showing one never forces a layout pass.
+    """
+
+    def __init__(self, master, slots=TOAST_SLOTS):
+        self.master = master
+        self.slots = slots
+        self.shown = 0
+        self.coalesced = 0
+        # optional callback run after coalesced changes
+        self.on_coalesce = None
+        self._pool = []
+        # (kind, name) -> toast currently on screen
+        self._active = {}
+        # (kind, name) -> count, in arrival order
+        self._queue = {}
+        self._geom = None
+
+    def invalidate_geometry(self):
+        """Call when the master moved or resized."""
+        self._geom = None
+
+    def show(self, kind, name):
+        key = (kind, name)
+        toast = self._active.get(key)
+        if toast is not None:
+            # same event already on screen: count it and keep it up a little longer
+            toast["count"] += 1
+            self._coalesce()
+            self._label(toast)
+            # the " ×N" suffix widens the label; resize so it isn't clipped
+            self._place(toast)
+            self._arm(toast)
+            return
+        if key in self._queue:
+            self._queue[key] += 1
+            self._coalesce()
+            return
+        self._queue[key] = 1
+        self._pump()
+
+    def _coalesce(self):
+        self.coalesced += 1
+        if self.on_coalesce is not None:
+            try:
+                self.on_coalesce(self.coalesced)
+            except Exception:
+                pass
+
+    def _pump(self):
+        while self._queue and len(self._active) < self.slots:
+            key = next(iter(self._queue))
+            count = self._queue.pop(key)
+            toast = self._pool.pop() if self._pool else self._make()
+            used = {t["slot"] for t in self._active.values()}
+            toast["slot"] = min(i for i in range(self.slots) if i not in used)
+            toast["key"] = key
+            toast["count"] = count
+            self._active[key] = toast
+            self._label(toast)
+            self._place(toast)
+            toast["top"].deiconify()
+            self._arm(toast)
+            self.shown += 1
+
+    def _make(self):
+        top = tk.Toplevel(self.master)
+        top.withdraw()
+        top.overrideredirect(True)
+        top.attributes("-topmost", True)
+        msg = tk.Label(top, bg="#222", fg="#fff")
+        msg.pack()
+        return {"top": top, "msg": msg, "job": None, "key": None, "count": 0, "slot": 0}
+
+    def _label(self, toast):
+        kind, name = toast["key"]
+        text, font, pad, _ = TOAST_STYLES[kind]
+        text = text.format(name=name)
+        if toast["count"] > 1:
+            text += f" ×{toast['count']}"
+        toast["msg"].configure(text=text, font=font)
+        toast["msg"].pack_configure(padx=pad, pady=pad)
+
+    def _place(self, toast):
+        if self._geom is None:
+            m = self.master
+            self._geom = (m.winfo_rootx(), m.winfo_rooty(), m.winfo_width(), m.winfo_height())
+        mx, my, mw, mh = self._geom
+        _, _, pad, _ = TOAST_STYLES[toast["key"][0]]
+        # requested size of the label is known without waiting for an idle layout pass
+        tw = toast["msg"].winfo_reqwidth() + 2 * pad
+        th = toast["msg"].winfo_reqheight() + 2 * pad
+        x = mx + (mw - tw) // 2
+        y = my + (mh - th) // 2 + toast["slot"] * TOAST_SPACING
+        toast["top"].geometry(f"{tw}x{th}+{x}+{y}")
+
+    def _arm(self, toast):
+        if toast["job"] is not None:
+            try:
+                self.master.after_cancel(toast["job"])
+            except Exception:
+                pass
+        ms = TOAST_STYLES[toast["key"][0]][3]
+        toast["job"] = self.master.after(ms, lambda: self._hide(toast))
+
+    def _hide(self, toast):
+        toast["job"] = None
+        try:
+            toast["top"].withdraw()
+        except Exception:
+            pass
+        self._active.pop(toast["key"], None)
+        self._pool.append(toast)
+        self._pump()
+
+
+def _game_attr(name):
+    # property forwarding an app attribute to the same attribute on app.game
+    return property(lambda self: getattr(self.game, name),
+                    lambda self, value: setattr(self.game, name, value))
 
 
 class CoinFlipApp:
@@ -27,16 +1738,14 @@ class CoinFlipApp:
     inventory_tab_added: bool = False
     test_tab_added: bool = False
     test_win_added: bool = False
-    inventory_owned: bool = False
-    inventory_items: Any = None
     inventory_items_frame: Any = None
     inventory_item_labels: Any = None
-    item_values: Any = None
     flip_label: Any = None
     rebirth_label: Any = None
+    rebirth_frame: Any = None
+    buy_inventory_btn: Any = None
     rebirth_counter_label: Any = None
     ach_labels: Any = None
-    achievements: Any = None
     dev_code_var: Any = None
     dev_tab_added: bool = False
     dev_ach_vars: Any = None
@@ -57,10 +1766,29 @@ class CoinFlipApp:
     win_width_var: Any = None
     win_height_var: Any = None
     win_color_var: Any = None
-    win_bounce_job: Any = None
     win_bouncing: bool = False
-    def __init__(self, master):
+    game: Any = None
+
+    # game state lives on self.game (CoinFlipGame); these keep the old attribute names working
+    flip_count = _game_attr("flip_count")
+    consec_heads = _game_attr("consec_heads")
+    rebirth_count = _game_attr("rebirth_count")
+    achievements = _game_attr("achievements")
+    visited_tabs = _game_attr("visited_tabs")
+    all_tabs = _game_attr("all_tabs")
+    inventory_owned = _game_attr("inventory_owned")
+    inventory_items = _game_attr("inventory_items")
+    item_values = _game_attr("item_values")
+
+    def __init__(self, master, save_dir=None, on_first_frame=None):
+        self._init_t0 = time.perf_counter()
         self.master = master
+        self.game = CoinFlipGame()
+        # progress is only persisted when a save directory is given (the game launcher passes SAVE_DIR)
+        self.save_store = SaveStore(save_dir) if save_dir else None
+        self._saved_state = {}
+        # pending coalesced save (see _save_progress)
+        self._save_job = None
         master.title("Coin Flipper")
         master.resizable(False, False)
 
@@ -72,46 +1800,51 @@ class CoinFlipApp:
 
         # Create tabs: Flip, Settings and Achievements
         self.notebook = ttk.Notebook(master)
+        # pooled popups for achievements and found items
+        self.toasts = ToastManager(master)
         self.tab_flip = ttk.Frame(self.notebook)
         self.tab_settings = ttk.Frame(self.notebook)
         self.tab_achievements = ttk.Frame(self.notebook)
+        self.tab_stats = ttk.Frame(self.notebook)
     # Shop tab exists but is not added until rebirth_count >= 1
         self.tab_shop = ttk.Frame(self.notebook)
         self.shop_tab_added = False
         # Inventory tab (purchased in shop)
         self.tab_inventory = ttk.Frame(self.notebook)
         self.inventory_tab_added = False
-        self.inventory_owned = False
-        # inventory contents: item name -> count
-        self.inventory_items = {}
         # references for inventory UI widgets (populated when inventory tab is revealed)
         self.inventory_items_frame = None
         self.inventory_item_labels = {}
-        # values for items (rebirths per unit)
-        self.item_values = {
-            "Rebirth cube": 5,
-        }
         self.notebook.add(self.tab_flip, text="Flip")
         self.notebook.add(self.tab_settings, text="Settings")
         self.notebook.add(self.tab_achievements, text="Achievements")
+        self.notebook.add(self.tab_stats, text="Statistics")
         self.notebook.pack(fill="both", expand=True)
 
         # Flip tab UI: flip counter (above the canvas) and the canvas itself
         # initialize counter label (start at 0)
-        # rebirth count (initialize before creating rebirth label)
-        self.rebirth_count = 0
         self.flip_label = ttk.Label(self.tab_flip, text="Flips: 0")
         self.flip_label.pack(pady=(8, 2))
 
         # rebirth counter visible on Flip tab
-        self.rebirth_counter_label = ttk.Label(self.tab_flip, text=f"Rebirths: {self.rebirth_count}")
+        self.rebirth_counter_label = ttk.Label(self.tab_flip, text=f"Rebirths: {format_count(self.rebirth_count)}")
         self.rebirth_counter_label.pack(pady=(0, 6))
 
         # Canvas lives in the Flip tab
         self.canvas = tk.Canvas(self.tab_flip, width=self.width, height=self.height, bg="#f0f0f0", highlightthickness=0)
         self.canvas.pack()
 
-        # keep canvas responsive to window size changes (used for fullscreen)
+        # keep canvas responsive to window size changes (used for fullscreen). <Configure>
+        # on the master also fires for every child widget, so events are filtered and
+        # coalesced into at most one reflow per idle pass (see _on_window_configure)
+        self._reflow_pending = None
+        # master (width, height) the layout was last reflowed for
+        self._reflow_size = None
+        # events: <Configure> events seen; coalesced: merged into an already pending pass;
+        # skipped: events/passes dropped because the master's size had not changed
+        self.reflow_stats = {"events": 0, "coalesced": 0, "skipped": 0, "reflows": 0}
+        # moves the bouncing windows (see _toggle_bounce)
+        self.motion = WindowMotion(master)
         try:
             self.master.bind('<Configure>', lambda e: self._on_window_configure(e))
         except Exception:
@@ -137,12 +1870,40 @@ class CoinFlipApp:
         y1 = cy + radius
         self.oval = self.canvas.create_oval(x0, y0, x1, y1, fill="#E6B800", outline="#c68f00", width=4)
         self.text = self.canvas.create_text(cx, cy, text="Heads", font=("Arial", 28, "bold"), fill="#222")
+        # last values sent to Tk for the coin: [oval coords, fill, outline, text, text fill]
+        self._coin_drawn = [(x0, y0, x1, y1), "#E6B800", "#c68f00", "Heads", "#222"]
+        # spin keyframe table and the (anim_steps, rotations, cx, cy, base_radius) it was built for
+        self._keyframes = None
+        self._keyframes_key = None
+        # sprite renderer (Settings > Animation): one image item swapped per frame, shown
+        # in place of the oval while the coin spins; the text item stays on top
+        self.use_sprites = False
+        self.coin_sprites = CoinSprites(master)
+        self.coin_image = self.canvas.create_image(cx, cy, state="hidden")
+        self.canvas.tag_raise(self.text)
+        self._sprite_shown = None
+        self._sprite_evict_id = None
+        # multi-coin mode (Settings > Animation): a grid of (oval, text) item pairs used in
+        # place of the single coin when more than one coin is flipped at once
+        self.coin_count = 1
+        self._grid_items = []
+        # (cx, cy, radius) of each grid cell, and the last values sent to Tk per coin
+        self._grid_cells = []
+        self._grid_drawn = []
+        # face each grid coin rests on, and the outcomes of the flip in progress (or None)
+        self._grid_faces = []
+        self._grid_outcomes = None
+        self._grid_keyframes = None
+        self._grid_keyframes_key = None
         # instruction text
         self.instr = self.canvas.create_text(self.width // 2, self.height - 60,
                                              text="Press Enter to flip the coin", font=("Arial", 12), fill="#333")
 
         self.animating = False
         master.bind("<Return>", self.start_flip)
+        # drift-compensating frame scheduler and the timing stats of the last finished flip
+        self.frame_clock = FrameClock()
+        self.last_flip_stats = None
 
         # Default animation settings (background-only settings kept)
         self.base_frame_delay = 50        # ms per frame (base, adjusted by rebirths)
@@ -150,26 +1911,9 @@ class CoinFlipApp:
         self.rotations_default = 3   # default rotations during flip
     # force_mode removed — flips are always random
 
-        # Achievements state
-        self.flip_count = 0
-        # achievements mapping name -> earned(bool) -- order matters for display
-        self.achievements = {
-            "1st Coin Flip": False,
-            "5th Coin Flip": False,
-            "20th Coin Flip": False,
-            "50th Coin Flip": False,
-            "100th Coin Flip": False,
-            "Visited everything": False,
-            "I Like Heads": False,
-        }
+        # achievement labels (achievement state itself lives on self.game)
         self.ach_labels = {}
 
-        # track visited tabs for the "Visited everything" achievement
-        self.visited_tabs = set()
-        self.all_tabs = {"Flip", "Settings", "Achievements"}
-        # track consecutive heads for the "I Like Heads" achievement
-        self.consec_heads = 0
-
         # Settings variables (only background is exposed)
         self.bg_var = tk.StringVar(value="white")
         # Developer unlock code (hidden tab)
@@ -178,13 +1922,24 @@ class CoinFlipApp:
         # Window options
         self.fullscreen_var = tk.BooleanVar(value=False)
         self.borderless_var = tk.BooleanVar(value=False)
+        # Animation: draw the spin from pre-rendered sprites instead of vector shapes
+        self.sprites_var = tk.BooleanVar(value=False)
+        # Animation: how many coins each flip spins at once
+        self.coins_var = tk.IntVar(value=1)
     # force_var removed — flips are always random
 
-        # Build settings UI
-        self._build_settings_ui()
-
-        # Build achievements UI
-        self._build_achievements_ui()
+        # Settings, Achievements, Shop, Inventory and SDN are built the first time
+        # their tab is selected; only the Flip tab is built up front
+        self._lazy_tabs = {}
+        self._lazy_tab(self.tab_settings, self._build_settings_ui)
+        self._lazy_tab(self.tab_achievements, self._build_achievements_ui)
+        self._lazy_tab(self.tab_stats, self._build_stats_ui)
+        # Statistics widgets, the stats version they show and their repaint job
+        self.stats_labels = {}
+        self._stats_shown = None
+        self._stats_job = None
+        # Apply current bg at startup
+        self._apply_bg()
 
         # Bind notebook tab change to track visits
         self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
@@ -203,6 +1958,132 @@ class CoinFlipApp:
         except Exception:
             pass
 
+        # restore saved progress (snapshot + journal tail; no flips are replayed)
+        saved_at = None
+        if self.save_store is not None:
+            try:
+                state = self.save_store.load()
+                if state:
+                    self._restore_progress(state)
+                    saved_at = state.get("saved_at")
+            except Exception:
+                pass
+            self._saved_state = self._progress_state()
+
+        # record this session's inputs from here on (written next to the save on close)
+        self.session = self.game.start_session()
+
+        # a saved game earns the flips it missed while closed or minimized (see _catch_up_since)
+        self._away_since = None
+        if self.save_store is not None:
+            if saved_at is not None:
+                self._catch_up_since(saved_at)
+            try:
+                master.bind("<Unmap>", self._on_unmap, add="+")
+                master.bind("<Map>", self._on_map, add="+")
+            except Exception:
+                pass
+
+        # startup profile (ms): building the app now, the first interactive frame once
+        # the event loop is running; on_first_frame(profile) is called when it is complete
+        self.on_first_frame = on_first_frame
+        self.startup_profile = {"app_init_ms": (time.perf_counter() - self._init_t0) * 1000.0}
+        try:
+            master.after(0, self._mark_first_frame)
+        except Exception:
+            pass
+
+    def _mark_first_frame(self):
+        """Record time-to-first-interactive-frame: the window is drawn and input is handled."""
+        try:
+            self.master.update_idletasks()
+        except Exception:
+            pass
+        now = time.perf_counter()
+        self.startup_profile["first_frame_ms"] = (now - self._init_t0) * 1000.0
+        self.startup_profile["since_load_ms"] = (now - STARTUP_T0) * 1000.0
+        if self.on_first_frame is not None:
+            try:
+                self.on_first_frame(self.startup_profile)
+            except Exception:
+                pass
+
+    def _progress_state(self):
+        """Everything that is saved: game state plus which unlockable tabs are shown."""
+        state = self.game.to_save()
+        tabs = []
+        if getattr(self, 'shop_tab_added', False):
+            tabs.append("Shop")
+        if getattr(self, 'inventory_tab_added', False):
+            tabs.append("Inventory")
+        state["unlocked_tabs"] = tabs
+        # when this state was current, for the offline catch-up on the next launch; while
+        # minimized that is when the window went away (those flips haven't been credited)
+        since = getattr(self, '_away_since', None)
+        state["saved_at"] = int(since if since is not None else time.time())
+        return state
+
+    def _save_progress(self, now=False):
+        """Queue the keys that changed since the last save (the write happens off the Tk thread).
+
+        Calls are coalesced: the first schedules one diff SAVE_INTERVAL later and the
+        rest (a call per flip while flipping) ride along, so to_save() isn't rebuilt
+        on every flip. now=True saves straight away (closing).
+        """
+        if self.save_store is None:
+            return
+        if not now:
+            if self._save_job is None:
+                try:
+                    self._save_job = self.master.after(int(SAVE_INTERVAL * 1000), self._flush_progress)
+                except Exception:
+                    self._flush_progress()
+            return
+        self._flush_progress()
+
+    def _flush_progress(self):
+        if self._save_job is not None:
+            try:
+                self.master.after_cancel(self._save_job)
+            except Exception:
+                pass
+            self._save_job = None
+        try:
+            state = self._progress_state()
+            patch = {k: v for k, v in state.items() if self._saved_state.get(k) != v}
+            if patch:
+                self.save_store.record(patch)
+                self._saved_state.update(patch)
+        except Exception:
+            pass
+
+    def _restore_progress(self, state):
+        """Load saved state into the game and rebuild labels, the rebirth button and tabs."""
+        self.game.load_save(state)
+        try:
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
+        except Exception:
+            pass
+        self._update_rebirth_ui()
+        for name, earned in self.achievements.items():
+            lbl = self.ach_labels.get(name)
+            if lbl:
+                if earned:
+                    lbl.configure(text="✓ " + name, fg="#0a0")
+                else:
+                    lbl.configure(text="🔒 " + name, fg="#666")
+        try:
+            if self.game.all_achievements_earned() and not self.rebirth_frame.winfo_ismapped():
+                self.rebirth_frame.pack(pady=8)
+        except Exception:
+            pass
+        tabs = state.get("unlocked_tabs", [])
+        if "Shop" in tabs:
+            self._reveal_shop_tab()
+        if "Inventory" in tabs:
+            self._reveal_inventory_tab()
+        self.frame_delay = self._get_effective_frame_delay()
+
     def _build_settings_ui(self):
         # Background color options
         frm_bg = ttk.LabelFrame(self.tab_settings, text="Background")
@@ -230,10 +2111,21 @@ class CoinFlipApp:
         cb_full.pack(side="left", padx=8, pady=6)
         cb_border.pack(side="left", padx=8, pady=6)
 
-    # (Force result UI removed — flips are always random)
+        # Animation options
+        frm_anim = ttk.LabelFrame(self.tab_settings, text="Animation")
+        frm_anim.pack(fill="x", padx=10, pady=8)
+        cb_sprites = ttk.Checkbutton(frm_anim, text="Pre-rendered coin sprites", variable=self.sprites_var,
+                                     command=self._toggle_sprites)
+        cb_sprites.pack(side="left", padx=8, pady=6)
+        lbl_coins = ttk.Label(frm_anim, text="Coins per flip:")
+        lbl_coins.pack(side="left", padx=(12, 4), pady=6)
+        sp_coins = ttk.Spinbox(frm_anim, from_=1, to=MAX_COINS, width=4, textvariable=self.coins_var,
+                               command=self._apply_coin_count)
+        sp_coins.pack(side="left", padx=(0, 8), pady=6)
+        sp_coins.bind("<Return>", lambda e: self._apply_coin_count())
+        sp_coins.bind("<FocusOut>", lambda e: self._apply_coin_count())
 
-        # Apply current bg at startup
-        self._apply_bg()
+    # (Force result UI removed — flips are always random)
 
     def _build_achievements_ui(self):
         frm = ttk.LabelFrame(self.tab_achievements, text="Achievements")
@@ -252,91 +2144,173 @@ class CoinFlipApp:
 
         # Rebirth area (hidden until all achievements earned)
         self.rebirth_frame = ttk.Frame(self.tab_achievements)
-        self.rebirth_label = ttk.Label(self.rebirth_frame, text=f"Rebirths: {self.rebirth_count}")
+        self.rebirth_label = ttk.Label(self.rebirth_frame, text=f"Rebirths: {format_count(self.rebirth_count)}")
         self.rebirth_btn = ttk.Button(self.rebirth_frame, text="Rebirth", command=self._do_rebirth)
         self.rebirth_label.pack(side="left", padx=(4, 12))
         self.rebirth_btn.pack(side="left")
 
         # Show the rebirth button only if all achievements already earned
-        if all(self.achievements.values()):
+        if self.game.all_achievements_earned():
             self.rebirth_frame.pack(pady=8)
 
 
+    def _build_stats_ui(self):
+        """Build the Statistics tab (figures come from game.stats, see _refresh_stats_ui)."""
+        frm = ttk.LabelFrame(self.tab_stats, text="This session")
+        frm.pack(fill="x", padx=10, pady=8)
+        rows = [
+            ("flips", "Flips"),
+            ("split", "Heads / Tails"),
+            ("longest", "Longest streak (Heads / Tails)"),
+            ("current", "Current streak"),
+            ("rolling", f"Heads, last {STATS_WINDOW} flips"),
+            ("drops", "Drops per 1000 flips"),
+        ]
+        for i, (key, text) in enumerate(rows):
+            ttk.Label(frm, text=text + ":").grid(row=i, column=0, sticky="w", padx=6, pady=1)
+            lbl = ttk.Label(frm, text="-")
+            lbl.grid(row=i, column=1, sticky="w", padx=6, pady=1)
+            self.stats_labels[key] = lbl
+        # streak-length histogram: one bar per length, the last one for longer runs
+        frm_hist = ttk.LabelFrame(self.tab_stats, text="Streak lengths")
+        frm_hist.pack(fill="both", expand=True, padx=10, pady=8)
+        self.stats_canvas = tk.Canvas(frm_hist, height=120, bg="#f8f8f8", highlightthickness=0)
+        self.stats_canvas.pack(fill="both", expand=True, padx=6, pady=6)
+        self.stats_bars = []
+        for length in range(1, STATS_STREAK_MAX + 1):
+            bar = self.stats_canvas.create_rectangle(0, 0, 0, 0, fill="#E6B800", outline="#c68f00")
+            caption = "%d+" % length if length == STATS_STREAK_MAX else str(length)
+            label = self.stats_canvas.create_text(0, 0, text=caption, font=("Arial", 7), fill="#333", anchor="n")
+            self.stats_bars.append((bar, label))
+        # bars are laid out again when the canvas is resized
+        self.stats_canvas.bind("<Configure>", lambda e: self._draw_stats_histogram(force=True))
+        self._stats_hist_drawn = None
+
+    def _refresh_stats_ui(self):
+        """Repaint the Statistics tab if the numbers changed; reschedules while visible."""
+        self._stats_job = None
+        try:
+            if str(self.notebook.select()) != str(self.tab_stats):
+                return
+        except Exception:
+            return
+        stats = self.game.stats
+        if self.stats_labels and self._stats_shown != (id(stats), stats.version):
+            self._stats_shown = (id(stats), stats.version)
+            flips = stats.flips
+            labels = self.stats_labels
+            labels["flips"].configure(text=format_count(flips))
+            if flips:
+                labels["split"].configure(text=f"{format_count(stats.heads)} / {format_count(stats.tails)} "
+                                               f"({stats.heads * 100.0 / flips:.2f}% heads)")
+            else:
+                labels["split"].configure(text="-")
+            labels["longest"].configure(text=f"{format_count(stats.longest['Heads'])} / "
+                                             f"{format_count(stats.longest['Tails'])}")
+            labels["current"].configure(text=f"{format_count(stats.run_len)} {stats.run_side}" if stats.run_side else "-")
+            ratio = stats.rolling_heads_ratio()
+            labels["rolling"].configure(text="-" if ratio is None else f"{ratio * 100.0:.1f}%")
+            labels["drops"].configure(text=f"{stats.drops_per_1000():.2f}")
+            self._draw_stats_histogram()
+        try:
+            self._stats_job = self.master.after(STATS_REFRESH_MS, self._refresh_stats_ui)
+        except Exception:
+            self._stats_job = None
+
+    def _draw_stats_histogram(self, force=False):
+        counts = [cnt for _, cnt in self.game.stats.histogram()]
+        if not force and counts == self._stats_hist_drawn:
+            return
+        self._stats_hist_drawn = counts
+        canvas = self.stats_canvas
+        w = max(40, canvas.winfo_width())
+        h = max(40, canvas.winfo_height())
+        slot = w / len(self.stats_bars)
+        top_pad, caption_h = 6, 14
+        tallest = max(counts) or 1
+        for i, ((bar, label), cnt) in enumerate(zip(self.stats_bars, counts)):
+            x0 = i * slot + 2
+            x1 = (i + 1) * slot - 2
+            base = h - caption_h
+            y0 = base - (base - top_pad) * cnt / tallest
+            canvas.coords(bar, x0, y0, x1, base)
+            canvas.coords(label, (x0 + x1) / 2, base + 1)
+
+    def _lazy_tab(self, frame, builder):
+        """Defer building a tab's widgets until the tab is first selected."""
+        self._lazy_tabs[str(frame)] = builder
+
+    def _ensure_tab_built(self, tab_id):
+        """Run the pending builder for a tab, if any (each builder runs once)."""
+        builder = self._lazy_tabs.pop(str(tab_id), None)
+        if builder is not None:
+            try:
+                builder()
+            except Exception:
+                pass
+
     def _on_tab_changed(self, event=None):
-        # called when the notebook tab changes; record the visited tab
+        # called when the notebook tab changes; build it if needed and record the visit
         try:
             tab_id = self.notebook.select()
             tab_text = self.notebook.tab(tab_id, "text")
         except Exception:
             return
-        self.visited_tabs.add(tab_text)
-        # award if all visited
-        if self.visited_tabs >= self.all_tabs:
-            self.award_achievement("Visited everything")
+        self._ensure_tab_built(tab_id)
+        # the Statistics tab repaints only while it is the selected tab
+        if str(tab_id) == str(self.tab_stats):
+            self._refresh_stats_ui()
+        elif self._stats_job is not None:
+            try:
+                self.master.after_cancel(self._stats_job)
+            except Exception:
+                pass
+            self._stats_job = None
+        # award "Visited everything" once all core tabs are seen
+        for name in self.game.visit_tab(tab_text):
+            self._on_achievement_earned(name)
 
     def award_achievement(self, name: str):
         # mark earned and update UI; show popup
-        if name not in self.achievements:
-            return
-        if self.achievements[name]:
-            return
-        self.achievements[name] = True
+        if self.game.grant_achievement(name):
+            self._on_achievement_earned(name)
+
+    def _on_achievement_earned(self, name: str, popup=True):
+        # UI side of an achievement the game just awarded
         lbl = self.ach_labels.get(name)
         if lbl:
             lbl.configure(text="✓ " + name, fg="#0a0")
         # show popup notification for 3 seconds
-        self._show_achievement_popup(name)
+        if popup:
+            self._show_achievement_popup(name)
         # if now all achievements are earned, reveal the rebirth button
         try:
-            if all(self.achievements.values()):
+            if self.game.all_achievements_earned():
                 # show rebirth frame if not already visible
                 if not self.rebirth_frame.winfo_ismapped():
                     self.rebirth_frame.pack(pady=8)
         except Exception:
             pass
+        self._save_progress()
 
     def _show_achievement_popup(self, name: str):
-        # small borderless top-level window centered over the main window
-        top = tk.Toplevel(self.master)
-        top.overrideredirect(True)
-        top.attributes("-topmost", True)
-        msg = tk.Label(top, text=f"New Achievement:\n{name}", font=("Arial", 14, "bold"), bg="#222", fg="#fff")
-        msg.pack(padx=12, pady=12)
-        # position it centered over the main window
-        self.master.update_idletasks()
-        mw = self.master.winfo_width()
-        mh = self.master.winfo_height()
-        mx = self.master.winfo_rootx()
-        my = self.master.winfo_rooty()
-        top.update_idletasks()
-        tw = top.winfo_width()
-        th = top.winfo_height()
-        x = mx + (mw - tw) // 2
-        y = my + (mh - th) // 2
-        top.geometry(f"{tw}x{th}+{x}+{y}")
-        # destroy after 3 seconds
-        top.after(3000, top.destroy)
+        # small borderless toast centered over the main window for 3 seconds
+        self.toasts.show("achievement", name)
 
     def _get_effective_frame_delay(self):
         """Return the effective frame delay in ms after applying rebirth speed multiplier.
 
-        Uses the configured base frame delay and divides it by 2^rebirth_count.
-        Clamps to minimum 5 ms to avoid zero/negative delays.
+        Uses the configured base frame delay and divides it by 2^rebirth_count (in log
+        space, cached per rebirth count). Clamps to minimum 5 ms to avoid zero/negative delays.
         """
-        try:
-            base = int(self.base_frame_delay)
-        except Exception:
-            base = 50
-        factor = 2 ** self.rebirth_count if self.rebirth_count > 0 else 1
-        eff = max(5, int(base / factor))
-        return eff
+        return self.game.effective_frame_delay(getattr(self, 'base_frame_delay', 50))
 
     def _update_rebirth_ui(self):
         """Update all rebirth display widgets to match current rebirth_count."""
         try:
             if hasattr(self, 'rebirth_label'):
                 try:
-                    self.rebirth_label.configure(text=f"Rebirths: {self.rebirth_count}")
+                    self.rebirth_label.configure(text=f"Rebirths: {format_count(self.rebirth_count)}")
                 except Exception:
                     pass
         except Exception:
@@ -344,7 +2318,7 @@ class CoinFlipApp:
         try:
             if hasattr(self, 'rebirth_counter_label'):
                 try:
-                    self.rebirth_counter_label.configure(text=f"Rebirths: {self.rebirth_count}")
+                    self.rebirth_counter_label.configure(text=f"Rebirths: {format_count(self.rebirth_count)}")
                 except Exception:
                     pass
         except Exception:
@@ -352,19 +2326,18 @@ class CoinFlipApp:
 
     def _do_rebirth(self):
         """Reset achievements/counters and increase rebirth count (which speeds up flips)."""
-        # increment rebirth counter
-        self.rebirth_count += 1
+        # increment rebirth counter and reset achievements, flips, streak and visited tabs
+        awarded = self.game.rebirth()
         # update rebirth displays
         try:
             self._update_rebirth_ui()
         except Exception:
             pass
 
-        # reset achievements state and UI
-        for name in list(self.achievements.keys()):
-            self.achievements[name] = False
+        # reset achievements UI (permanent achievements stay earned)
+        for name, earned in self.achievements.items():
             lbl = self.ach_labels.get(name)
-            if lbl:
+            if lbl and not earned:
                 lbl.configure(text=("🔒 " + name), fg="#666")
 
         # hide rebirth button until achievements are earned again
@@ -373,25 +2346,25 @@ class CoinFlipApp:
                 self.rebirth_frame.pack_forget()
         except Exception:
             pass
+        for name in awarded:
+            self._on_achievement_earned(name)
 
-        # reset counters and UI
-        self.flip_count = 0
+        # reset counters UI
         try:
-            self.flip_label.configure(text=f"Flips: {self.flip_count}")
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
         except Exception:
             pass
-        self.consec_heads = 0
-        self.visited_tabs = set()
 
         # update internal frame_delay using new rebirth multiplier
         self.frame_delay = self._get_effective_frame_delay()
 
         # if player has reached 5 rebirths, reveal the Shop tab
         try:
-            if self.rebirth_count >= 1:
+            if self.game.shop_unlocked():
                 self._reveal_shop_tab()
         except Exception:
             pass
+        self._save_progress()
 
     def _apply_bg(self):
         # map selection to actual color
@@ -462,20 +2435,67 @@ class CoinFlipApp:
         """Handler for window configure events; reflows layout when size changes.
 
         This keeps the coin scaled to the visible canvas when the window is resized or when entering fullscreen.
+        Events from child widgets and moves of the window are ignored; the rest are coalesced into one
+        reflow on the next idle pass.
         """
+        stats = self.reflow_stats
+        stats["events"] += 1
+        if event is not None:
+            # the bouncing windows track their size from these events (see WindowMotion)
+            self.motion.on_configure(event)
+        if event is not None and event.widget is not self.master:
+            # a descendant widget was configured; the window itself didn't change
+            stats["skipped"] += 1
+            return
+        try:
+            # cached master geometry used to place toasts is stale now (moves included)
+            self.toasts.invalidate_geometry()
+        except Exception:
+            pass
         try:
             # only adjust while fullscreen or when the window size actually changed
-            if getattr(self, 'fullscreen_var', None) and self.fullscreen_var.get():
-                self._reflow_layout()
+            if not (getattr(self, 'fullscreen_var', None) and self.fullscreen_var.get()):
+                return
+            if event is not None and (event.width, event.height) == self._reflow_size:
+                stats["skipped"] += 1
+                return
+            self._schedule_reflow()
         except Exception:
             pass
 
+    def _schedule_reflow(self):
+        """Reflow once the pending events are handled; repeated calls share one pass."""
+        if self._reflow_pending is not None:
+            self.reflow_stats["coalesced"] += 1
+            return
+        try:
+            self._reflow_pending = self.master.after_idle(self._run_scheduled_reflow)
+        except Exception:
+            self._reflow_pending = None
+
+    def _run_scheduled_reflow(self):
+        self._reflow_pending = None
+        try:
+            size = (self.master.winfo_width(), self.master.winfo_height())
+        except Exception:
+            return
+        if size == self._reflow_size:
+            # the window ended up at the size we already laid out for
+            self.reflow_stats["skipped"] += 1
+            return
+        self._reflow_layout()
+
     def _reflow_layout(self):
         """Recompute canvas and coin geometry to fit the current window size.
 
         When in fullscreen, expand the canvas to fill available window space and scale the coin accordingly.
         When not fullscreen, revert to the initial design size.
         """
+        self.reflow_stats["reflows"] += 1
+        try:
+            self._reflow_size = (self.master.winfo_width(), self.master.winfo_height())
+        except Exception:
+            self._reflow_size = None
         try:
             # determine target canvas size
             is_full = getattr(self, 'fullscreen_var', None) and self.fullscreen_var.get()
@@ -508,6 +2528,10 @@ class CoinFlipApp:
             self.cx = cx
             self.cy = cy
             self.base_radius = radius
+            # coin geometry changed: spin keyframes must be rebuilt, sprites re-rendered
+            self._keyframes = None
+            self.coin_sprites.clear()
+            self._prerender_sprites()
 
             # update oval and text positions/sizes
             x0 = cx - radius
@@ -520,6 +2544,7 @@ class CoinFlipApp:
                 pass
             try:
                 self.canvas.coords(self.text, self.cx, self.cy)
+                self.canvas.coords(self.coin_image, self.cx, self.cy)
             except Exception:
                 pass
             try:
@@ -532,6 +2557,11 @@ class CoinFlipApp:
                 self._set_coin_ellipse(1.0, 1.0)
             except Exception:
                 pass
+            # the multi-coin grid follows the new coin area
+            try:
+                self._layout_coin_grid()
+            except Exception:
+                pass
         except Exception:
             pass
 
@@ -541,51 +2571,59 @@ class CoinFlipApp:
             return
         try:
             self.notebook.add(self.tab_shop, text="Shop")
-            # build simple shop UI with one item: Inventory (cost 5 rebirths)
-            frm = ttk.LabelFrame(self.tab_shop, text="Items")
-            frm.pack(fill="both", expand=True, padx=10, pady=10)
-            lbl = ttk.Label(frm, text="Inventory — Cost: 5 rebirths", padding=8)
-            lbl.pack(anchor="w", padx=8, pady=(6, 2))
-            # buy button
-            self.buy_inventory_btn = ttk.Button(frm, text="Buy Inventory (5)", command=self._buy_inventory)
-            self.buy_inventory_btn.pack(anchor="w", padx=8, pady=(0, 8))
-            # if already owned, disable button and reveal inventory
+            # the shop UI is built once, on first select (the tab can be removed by Revoke All)
+            if self.buy_inventory_btn is None:
+                self._lazy_tab(self.tab_shop, self._build_shop_ui)
+            self._refresh_shop_ui()
+            # if already owned, reveal inventory
             if getattr(self, 'inventory_owned', False):
-                try:
-                    self.buy_inventory_btn.configure(text="Inventory (Owned)", state="disabled")
-                    self._reveal_inventory_tab()
-                except Exception:
-                    pass
+                self._reveal_inventory_tab()
             self.shop_tab_added = True
         except Exception:
             pass
 
+    def _build_shop_ui(self):
+        """Build the shop: one item, Inventory (cost 5 rebirths)."""
+        frm = ttk.LabelFrame(self.tab_shop, text="Items")
+        frm.pack(fill="both", expand=True, padx=10, pady=10)
+        lbl = ttk.Label(frm, text="Inventory — Cost: 5 rebirths", padding=8)
+        lbl.pack(anchor="w", padx=8, pady=(6, 2))
+        # buy button
+        self.buy_inventory_btn = ttk.Button(frm, text="Buy Inventory (5)", command=self._buy_inventory)
+        self.buy_inventory_btn.pack(anchor="w", padx=8, pady=(0, 8))
+        self._refresh_shop_ui()
+
+    def _refresh_shop_ui(self):
+        """Match the buy button to whether the inventory is owned."""
+        try:
+            if getattr(self, 'inventory_owned', False):
+                self.buy_inventory_btn.configure(text="Inventory (Owned)", state="disabled")
+            else:
+                self.buy_inventory_btn.configure(text="Buy Inventory (5)", state="normal")
+        except Exception:
+            pass
+
     def _buy_inventory(self):
         """Purchase the Inventory if the player has enough rebirths (cost 5)."""
         try:
             if getattr(self, 'inventory_owned', False):
                 return
-            cost = 5
-            if self.rebirth_count < cost:
+            # deduct cost and mark owned
+            if not self.game.buy_inventory():
                 try:
                     messagebox.showwarning("Shop", "Not enough rebirths to buy Inventory.")
                 except Exception:
                     pass
                 return
-            # deduct cost
-            self.rebirth_count -= cost
             try:
                 self._update_rebirth_ui()
             except Exception:
                 pass
-            # mark owned and update UI
-            self.inventory_owned = True
-            try:
-                self.buy_inventory_btn.configure(text="Inventory (Owned)", state="disabled")
-            except Exception:
-                pass
+            # update UI
+            self._refresh_shop_ui()
             # reveal inventory tab
             self._reveal_inventory_tab()
+            self._save_progress()
         except Exception:
             pass
 
@@ -595,75 +2633,158 @@ class CoinFlipApp:
             return
         try:
             self.notebook.add(self.tab_inventory, text="Inventory")
-            # build inventory UI: a frame listing items and sell buttons
-            frm = ttk.LabelFrame(self.tab_inventory, text="Inventory")
-            frm.pack(fill="both", expand=True, padx=10, pady=10)
-            self.inventory_items_frame = frm
-            # populate current items (will show 'empty' if none)
+            # build inventory UI once, on first select (the tab can be removed by Revoke All and added back)
+            if self.inventory_items_frame is None:
+                self._lazy_tab(self.tab_inventory, self._build_inventory_ui)
+            # populate current items (will show 'empty' if none; no-op until built)
             self._update_inventory_ui()
             self.inventory_tab_added = True
         except Exception:
             pass
 
+    def _build_inventory_ui(self):
+        """Build the inventory list: a scrollable canvas holding only the rows in view."""
+        frm = ttk.LabelFrame(self.tab_inventory, text="Inventory")
+        frm.pack(fill="both", expand=True, padx=10, pady=10)
+        self.inventory_items_frame = frm
+        self._inv_empty_label = ttk.Label(frm, text="Inventory is empty.", padding=12)
+        self._inv_canvas = tk.Canvas(frm, highlightthickness=0, height=INVENTORY_ROW_HEIGHT * 6,
+                                     yscrollincrement=INVENTORY_ROW_HEIGHT)
+        self._inv_scroll = ttk.Scrollbar(frm, orient="vertical", command=self._inv_canvas.yview)
+
+        def _on_yscroll(first, last):
+            self._inv_scroll.set(first, last)
+            # scrolled or resized: swap rows in and out of view
+            self._render_inventory_rows()
+
+        self._inv_canvas.configure(yscrollcommand=_on_yscroll)
+        self._inv_canvas.bind("<Configure>", self._on_inventory_canvas_configure)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self._inv_canvas.bind(seq, self._on_inventory_wheel)
+        # item names in display order, rows currently bound to an item, and spare rows
+        self._inv_names = []
+        self._inv_rows = {}
+        self._inv_free_rows = []
+        self._inv_shown = None
+        self._update_inventory_ui()
+
     def _update_inventory_ui(self):
-        """Refresh the inventory tab UI to reflect current items and counts."""
-        try:
-            frm = self.inventory_items_frame
-            if frm is None:
-                return
-            # clear existing children
-            for child in list(frm.winfo_children()):
-                child.destroy()
+        """Refresh the inventory tab UI to reflect current items and counts.
 
-            if not self.inventory_items:
-                lbl = ttk.Label(frm, text="Inventory is empty.", padding=12)
-                lbl.pack(padx=10, pady=10)
+        Rows are keyed by item name and updated in place; the scroll region only changes
+        when the set of items does, and only rows in view exist as widgets.
+        """
+        try:
+            if self.inventory_items_frame is None:
                 return
-
-            # For each item, show name, count, and sell button where applicable
-            for name, count in list(self.inventory_items.items()):
-                row = ttk.Frame(frm)
-                row.pack(fill="x", padx=8, pady=6)
-                lbl = ttk.Label(row, text=f"{name}: {count}")
-                lbl.pack(side="left")
-                self.inventory_item_labels[name] = lbl
-                # selling behavior depends on item value
-                val = self.item_values.get(name, 0)
-                if val > 0:
-                    # Sell One
-                    btn_one = ttk.Button(row, text=f"Sell One ({val}R)", command=lambda n=name: self._sell_item(n, 1))
-                    btn_one.pack(side="right", padx=(4,0))
-                    # Sell All
-                    btn_all = ttk.Button(row, text=f"Sell All ({val}R ea)", command=lambda n=name: self._sell_all(n))
-                    btn_all.pack(side="right")
+            names = list(self.inventory_items)
+            if names != self._inv_names:
+                self._inv_names = names
+                self._inv_canvas.configure(scrollregion=(0, 0, 1, len(names) * INVENTORY_ROW_HEIGHT))
+            shown = bool(names)
+            if shown != self._inv_shown:
+                # switch between the empty message and the list
+                self._inv_shown = shown
+                if shown:
+                    self._inv_empty_label.pack_forget()
+                    self._inv_scroll.pack(side="right", fill="y")
+                    self._inv_canvas.pack(side="left", fill="both", expand=True)
                 else:
-                    # not sellable
-                    lbl_ns = ttk.Label(row, text="(not sellable)")
-                    lbl_ns.pack(side="right")
+                    self._inv_canvas.pack_forget()
+                    self._inv_scroll.pack_forget()
+                    self._inv_empty_label.pack(padx=10, pady=10)
+            self._render_inventory_rows()
         except Exception:
             pass
 
+    def _render_inventory_rows(self):
+        """Bind rows to the items in view; only changed label text is sent to Tk."""
+        canvas = getattr(self, '_inv_canvas', None)
+        if canvas is None:
+            return
+        names = self._inv_names
+        total = len(names)
+        top = int(canvas.canvasy(0)) // INVENTORY_ROW_HEIGHT
+        visible = max(1, canvas.winfo_height()) // INVENTORY_ROW_HEIGHT + 2
+        wanted = names[max(0, top):min(total, top + visible)]
+        wanted_set = set(wanted)
+        # release rows that scrolled out of view or whose item is gone
+        for name in [n for n in self._inv_rows if n not in wanted_set]:
+            row = self._inv_rows.pop(name)
+            canvas.itemconfigure(row["win"], state="hidden")
+            self.inventory_item_labels.pop(name, None)
+            self._inv_free_rows.append(row)
+        first = max(0, top)
+        for offset, name in enumerate(wanted):
+            row = self._inv_rows.get(name)
+            if row is None:
+                row = self._inv_free_rows.pop() if self._inv_free_rows else self._make_inventory_row()
+                self._bind_inventory_row(row, name)
+                self._inv_rows[name] = row
+                self.inventory_item_labels[name] = row["label"]
+            y = (first + offset) * INVENTORY_ROW_HEIGHT
+            if row["y"] != y:
+                canvas.coords(row["win"], 0, y)
+                row["y"] = y
+            text = f"{name}: {format_count(self.inventory_items.get(name, 0))}"
+            if row["text"] != text:
+                row["label"].configure(text=text)
+                row["text"] = text
+
+    def _make_inventory_row(self):
+        # one reusable row: count label, two sell buttons and a "not sellable" note
+        canvas = self._inv_canvas
+        frame = ttk.Frame(canvas)
+        row = {"frame": frame, "name": None, "text": None, "y": None, "sellable": None}
+        row["label"] = ttk.Label(frame)
+        row["label"].pack(side="left", padx=(8, 0))
+        row["btn_one"] = ttk.Button(frame, command=lambda: self._sell_item(row["name"], 1))
+        row["btn_all"] = ttk.Button(frame, command=lambda: self._sell_all(row["name"]))
+        row["not_sellable"] = ttk.Label(frame, text="(not sellable)")
+        row["win"] = canvas.create_window(0, 0, window=frame, anchor="nw",
+                                          width=max(1, canvas.winfo_width()), height=INVENTORY_ROW_HEIGHT)
+        for widget in (frame, row["label"], row["not_sellable"]):
+            for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+                widget.bind(seq, self._on_inventory_wheel)
+        return row
+
+    def _bind_inventory_row(self, row, name):
+        # point a row at an item; selling behavior depends on item value
+        row["name"] = name
+        row["text"] = None
+        val = self.game.loot.value(name)
+        sellable = val > 0
+        if sellable:
+            row["btn_one"].configure(text=f"Sell One ({val}R)")
+            row["btn_all"].configure(text=f"Sell All ({val}R ea)")
+        if sellable != row["sellable"]:
+            row["sellable"] = sellable
+            if sellable:
+                row["not_sellable"].pack_forget()
+                row["btn_one"].pack(side="right", padx=(4, 8))
+                row["btn_all"].pack(side="right")
+            else:
+                row["btn_one"].pack_forget()
+                row["btn_all"].pack_forget()
+                row["not_sellable"].pack(side="right", padx=(0, 8))
+        self._inv_canvas.itemconfigure(row["win"], state="normal")
+
+    def _on_inventory_canvas_configure(self, event):
+        # keep rows as wide as the list
+        for row in list(self._inv_rows.values()) + self._inv_free_rows:
+            self._inv_canvas.itemconfigure(row["win"], width=event.width)
+        self._render_inventory_rows()
+
+    def _on_inventory_wheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            self._inv_canvas.yview_scroll(-1, "units")
+        else:
+            self._inv_canvas.yview_scroll(1, "units")
+
     def _show_item_popup(self, name: str):
-        """Brief popup to show when an item is found."""
-        try:
-            top = tk.Toplevel(self.master)
-            top.overrideredirect(True)
-            top.attributes("-topmost", True)
-            msg = tk.Label(top, text=f"Found: {name}", font=("Arial", 12, "bold"), bg="#222", fg="#fff")
-            msg.pack(padx=8, pady=8)
-            # center
-            self.master.update_idletasks()
-            mw = self.master.winfo_width()
-            mh = self.master.winfo_height()
-            mx = self.master.winfo_rootx()
-            my = self.master.winfo_rooty()
-            top.update_idletasks()
-            tw = top.winfo_width()
-            th = top.winfo_height()
-            x = mx + (mw - tw) // 2
-            y = my + (mh - th) // 2
-            top.geometry(f"{tw}x{th}+{x}+{y}")
-            top.after(2000, top.destroy)
+        """Brief popup to show when an item is found (repeats merge into one toast)."""
+        try:
+            self.toasts.show("item", name)
         except Exception:
             try:
                 messagebox.showinfo("Item", f"Found: {name}")
@@ -671,7 +2792,7 @@ class CoinFlipApp:
                 pass
 
     def _sell_rebirth_cube(self, item_name: str):
-        """Sell one Rebirth cube for 5 rebirths if available."""
+        """Sell one unit of item_name (kept for the old Rebirth cube button)."""
         try:
             # delegate to generic sell handler (1 unit)
             self._sell_item(item_name, 1)
@@ -679,7 +2800,7 @@ class CoinFlipApp:
             pass
 
     def _sell_item(self, item_name: str, qty: int):
-        """Generic seller: remove qty units of item_name and award rebirths based on item_values."""
+        """Generic seller: remove qty units of item_name and award rebirths by its loot-table value."""
         try:
             if qty <= 0:
                 return
@@ -690,28 +2811,22 @@ class CoinFlipApp:
                 except Exception:
                     pass
                 return
-            to_sell = min(qty, cnt)
             # compute value
-            val = self.item_values.get(item_name, 0)
+            val = self.game.loot.value(item_name)
             if val <= 0:
                 try:
                     messagebox.showwarning("Inventory", f"{item_name} is not sellable.")
                 except Exception:
                     pass
                 return
-            # remove
-            remaining = cnt - to_sell
-            if remaining > 0:
-                self.inventory_items[item_name] = remaining
-            else:
-                del self.inventory_items[item_name]
-            # award rebirths
-            gained = to_sell * val
-            self.rebirth_count += gained
+            # remove and award rebirths
+            _, awarded = self.game.sell_item(item_name, qty)
             try:
                 self._update_rebirth_ui()
             except Exception:
                 pass
+            for name in awarded:
+                self._on_achievement_earned(name)
             # update UI
             try:
                 self._update_inventory_ui()
@@ -719,10 +2834,11 @@ class CoinFlipApp:
                 pass
             # reveal shop if threshold reached
             try:
-                if self.rebirth_count >= 1:
+                if self.game.shop_unlocked():
                     self._reveal_shop_tab()
             except Exception:
                 pass
+            self._save_progress()
         except Exception:
             pass
 
@@ -741,9 +2857,24 @@ class CoinFlipApp:
             pass
 
     def _on_close(self):
-        # print closing note and then destroy the main window
+        # save progress, print closing note and then destroy the main window
+        if self.save_store is not None:
+            self._save_progress(now=True)
+            try:
+                self.save_store.close()
+            except Exception:
+                pass
+            # keep the last session so a bug report can come with a replayable log
+            try:
+                self.session.finish(self.game)
+                self.session.save(os.path.join(self.save_store.directory, SESSION_LOG_NAME))
+            except Exception:
+                pass
         try:
-            print("This dosnt save by the way sorry")
+            if self.save_store is not None:
+                print("Progress saved.")
+            else:
+                print("This dosnt save by the way sorry")
         except Exception:
             pass
         try:
@@ -777,57 +2908,12 @@ class CoinFlipApp:
             self.notebook.add(self.tab_dev, text="SDN")
             self.dev_tab_added = True
 
-            # Achievements granting
-            frm_ach = ttk.LabelFrame(self.tab_dev, text="Grant Achievements")
-            frm_ach.pack(fill="x", padx=10, pady=8)
-            self.dev_ach_vars = {}
-            for name in self.achievements.keys():
-                var = tk.BooleanVar(value=False)
-                cb = ttk.Checkbutton(frm_ach, text=name, variable=var)
-                cb.pack(anchor="w", padx=6, pady=2)
-                self.dev_ach_vars[name] = var
-            btn_grant = ttk.Button(frm_ach, text="Grant Selected", command=self._grant_selected_achievements)
-            btn_grant.pack(padx=6, pady=(4,8))
-
-            # Items (SDN): give arbitrary items
-            frm_items = ttk.LabelFrame(self.tab_dev, text="Items")
-            frm_items.pack(fill="x", padx=10, pady=8)
-            lbl_item_name = ttk.Label(frm_items, text="Item name:")
-            lbl_item_name.pack(side="left", padx=(6,4))
+            # SDN inputs exist right away; the tab's widgets are built when it is first selected
             self.dev_item_name_var = tk.StringVar(value="Rebirth cube")
-            ent_item_name = ttk.Entry(frm_items, textvariable=self.dev_item_name_var, width=20)
-            ent_item_name.pack(side="left", padx=(0,6))
-            lbl_item_count = ttk.Label(frm_items, text="Count:")
-            lbl_item_count.pack(side="left", padx=(6,4))
             self.dev_item_count_var = tk.IntVar(value=1)
-            ent_item_count = ttk.Entry(frm_items, textvariable=self.dev_item_count_var, width=6)
-            ent_item_count.pack(side="left", padx=(0,6))
-            btn_give_item = ttk.Button(frm_items, text="Give Item(s)", command=self._dev_give_item)
-            btn_give_item.pack(side="left", padx=(6,0))
-
-            # Rebirths
-            frm_reb = ttk.LabelFrame(self.tab_dev, text="Give Rebirths")
-            frm_reb.pack(fill="x", padx=10, pady=8)
             self.dev_rebirths_var = tk.IntVar(value=0)
-            ent_reb = ttk.Entry(frm_reb, textvariable=self.dev_rebirths_var, width=8)
-            ent_reb.pack(side="left", padx=6)
-            btn_reb = ttk.Button(frm_reb, text="Add Rebirths", command=self._dev_add_rebirths)
-            btn_reb.pack(side="left", padx=6)
-
-            # Flips
-            frm_flips = ttk.LabelFrame(self.tab_dev, text="Give Flips")
-            frm_flips.pack(fill="x", padx=10, pady=8)
             self.dev_flips_var = tk.IntVar(value=0)
-            ent_flips = ttk.Entry(frm_flips, textvariable=self.dev_flips_var, width=8)
-            ent_flips.pack(side="left", padx=6)
-            btn_flips = ttk.Button(frm_flips, text="Add Flips", command=self._dev_add_flips)
-            btn_flips.pack(side="left", padx=6)
-
-            # Revoke area (SDN-only): wipe all progress
-            frm_rev = ttk.LabelFrame(self.tab_dev, text="Revoke")
-            frm_rev.pack(fill="x", padx=10, pady=8)
-            btn_revoke = ttk.Button(frm_rev, text="Revoke All (reset everything)", command=self._revoke_all)
-            btn_revoke.pack(padx=6, pady=6)
+            self._lazy_tab(self.tab_dev, self._build_dev_tab_ui)
 
             # Test window (dev-only): quick access to popups and animations for testing
             try:
@@ -847,6 +2933,8 @@ class CoinFlipApp:
                         pass
                 try:
                     self.test_win.protocol("WM_DELETE_WINDOW", _on_test_close)
+                    # keeps the window's size current while it bounces
+                    self.test_win.bind("<Configure>", self.motion.on_configure, add="+")
                 except Exception:
                     pass
                 self.test_win_added = True
@@ -865,8 +2953,25 @@ class CoinFlipApp:
                 btn_flip.pack(fill="x", padx=8, pady=4)
                 btn_item = ttk.Button(frm_test, text="Show Item Popup (Rebirth cube)", command=lambda: self._show_item_popup('Rebirth cube'))
                 btn_item.pack(fill="x", padx=8, pady=4)
+                # how many popups were merged into an existing toast instead of opening a window
+                lbl_coalesced = ttk.Label(frm_test, text=f"Coalesced toasts: {self.toasts.coalesced}")
+                lbl_coalesced.pack(anchor="w", padx=8, pady=(0, 4))
+                self.toasts.on_coalesce = lambda n: lbl_coalesced.configure(text=f"Coalesced toasts: {n}")
                 btn_reflow = ttk.Button(frm_test, text="Reflow Layout (resize coin)", command=lambda: self._reflow_layout())
                 btn_reflow.pack(fill="x", padx=8, pady=4)
+                # resize events seen vs full reflows actually run
+                lbl_reflows = ttk.Label(frm_test)
+                lbl_reflows.pack(anchor="w", padx=8, pady=(0, 4))
+
+                def refresh_reflow_stats():
+                    try:
+                        st = self.reflow_stats
+                        lbl_reflows.configure(text=f"Reflows: {st['reflows']} run, {st['skipped']} skipped, "
+                                                   f"{st['coalesced']} coalesced ({st['events']} events)")
+                        lbl_reflows.after(1000, refresh_reflow_stats)
+                    except Exception:
+                        pass
+                refresh_reflow_stats()
                 # open the Window Editor automatically for SDN users
                 try:
                     self._open_window_editor()
@@ -877,6 +2982,56 @@ class CoinFlipApp:
         except Exception:
             pass
 
+    def _build_dev_tab_ui(self):
+        """Build the SDN tab widgets (runs the first time the tab is selected)."""
+        # Achievements granting
+        frm_ach = ttk.LabelFrame(self.tab_dev, text="Grant Achievements")
+        frm_ach.pack(fill="x", padx=10, pady=8)
+        self.dev_ach_vars = {}
+        for name in self.achievements.keys():
+            var = tk.BooleanVar(value=False)
+            cb = ttk.Checkbutton(frm_ach, text=name, variable=var)
+            cb.pack(anchor="w", padx=6, pady=2)
+            self.dev_ach_vars[name] = var
+        btn_grant = ttk.Button(frm_ach, text="Grant Selected", command=self._grant_selected_achievements)
+        btn_grant.pack(padx=6, pady=(4,8))
+
+        # Items (SDN): give arbitrary items
+        frm_items = ttk.LabelFrame(self.tab_dev, text="Items")
+        frm_items.pack(fill="x", padx=10, pady=8)
+        lbl_item_name = ttk.Label(frm_items, text="Item name:")
+        lbl_item_name.pack(side="left", padx=(6,4))
+        ent_item_name = ttk.Entry(frm_items, textvariable=self.dev_item_name_var, width=20)
+        ent_item_name.pack(side="left", padx=(0,6))
+        lbl_item_count = ttk.Label(frm_items, text="Count:")
+        lbl_item_count.pack(side="left", padx=(6,4))
+        ent_item_count = ttk.Entry(frm_items, textvariable=self.dev_item_count_var, width=6)
+        ent_item_count.pack(side="left", padx=(0,6))
+        btn_give_item = ttk.Button(frm_items, text="Give Item(s)", command=self._dev_give_item)
+        btn_give_item.pack(side="left", padx=(6,0))
+
+        # Rebirths
+        frm_reb = ttk.LabelFrame(self.tab_dev, text="Give Rebirths")
+        frm_reb.pack(fill="x", padx=10, pady=8)
+        ent_reb = ttk.Entry(frm_reb, textvariable=self.dev_rebirths_var, width=8)
+        ent_reb.pack(side="left", padx=6)
+        btn_reb = ttk.Button(frm_reb, text="Add Rebirths", command=self._dev_add_rebirths)
+        btn_reb.pack(side="left", padx=6)
+
+        # Flips
+        frm_flips = ttk.LabelFrame(self.tab_dev, text="Give Flips")
+        frm_flips.pack(fill="x", padx=10, pady=8)
+        ent_flips = ttk.Entry(frm_flips, textvariable=self.dev_flips_var, width=8)
+        ent_flips.pack(side="left", padx=6)
+        btn_flips = ttk.Button(frm_flips, text="Add Flips", command=self._dev_add_flips)
+        btn_flips.pack(side="left", padx=6)
+
+        # Revoke area (SDN-only): wipe all progress
+        frm_rev = ttk.LabelFrame(self.tab_dev, text="Revoke")
+        frm_rev.pack(fill="x", padx=10, pady=8)
+        btn_revoke = ttk.Button(frm_rev, text="Revoke All (reset everything)", command=self._revoke_all)
+        btn_revoke.pack(padx=6, pady=6)
+
     def _grant_selected_achievements(self):
         for name, var in getattr(self, 'dev_ach_vars', {}).items():
             try:
@@ -911,9 +3066,9 @@ class CoinFlipApp:
                     pass
                 return
             # add to inventory
-            self.inventory_items[name] = self.inventory_items.get(name, 0) + cnt
+            self.game.add_item(name, cnt)
             # ensure inventory is available to view/sell
-            self.inventory_owned = True
+            self.game.unlock_inventory()
             try:
                 self._reveal_inventory_tab()
             except Exception:
@@ -922,6 +3077,7 @@ class CoinFlipApp:
                 self._update_inventory_ui()
             except Exception:
                 pass
+            self._save_progress()
             try:
                 messagebox.showinfo("SDN", f"Added {cnt} x {name} to inventory.")
             except Exception:
@@ -936,15 +3092,18 @@ class CoinFlipApp:
             return
         if n <= 0:
             return
-        self.rebirth_count += n
+        awarded = self.game.add_rebirths(n)
         try:
             self._update_rebirth_ui()
         except Exception:
             pass
-        if self.rebirth_count >= 1:
+        for name in awarded:
+            self._on_achievement_earned(name)
+        if self.game.shop_unlocked():
             self._reveal_shop_tab()
         # update frame delay
         self.frame_delay = self._get_effective_frame_delay()
+        self._save_progress()
 
     def _dev_add_flips(self):
         try:
@@ -953,16 +3112,85 @@ class CoinFlipApp:
             return
         if n <= 0:
             return
-        prev = self.flip_count
-        self.flip_count += n
+        # resolve all given flips in one batch (outcomes, streak, milestones, drops)
+        summary = self.game.resolve_flips(n)
         try:
-            self.flip_label.configure(text=f"Flips: {self.flip_count}")
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
         except Exception:
             pass
-        # award milestone achievements if crossed
-        for milestone, name in ((1, "1st Coin Flip"), (5, "5th Coin Flip"), (20, "20th Coin Flip"), (50, "50th Coin Flip"), (100, "100th Coin Flip")):
-            if prev < milestone <= self.flip_count:
-                self.award_achievement(name)
+        for name in summary["achievements"]:
+            self._on_achievement_earned(name)
+        for name in summary["items"]:
+            try:
+                self._show_item_popup(name)
+            except Exception:
+                pass
+        if summary["items"]:
+            try:
+                if getattr(self, 'inventory_tab_added', False):
+                    self._update_inventory_ui()
+            except Exception:
+                pass
+        self._save_progress()
+
+    def _on_unmap(self, event=None):
+        # minimized: flips missed from now on are credited when the window comes back
+        if event is not None and event.widget is not self.master:
+            return
+        if self._away_since is None:
+            self._away_since = time.time()
+
+    def _on_map(self, event=None):
+        if event is not None and event.widget is not self.master:
+            return
+        since = self._away_since
+        self._away_since = None
+        if since is not None:
+            self._catch_up_since(since)
+
+    def _catch_up_since(self, since):
+        """Credit the flips that would have been played since `since` (a time.time() value).
+
+        The rate is one flip per anim_steps_default frames at the effective frame delay.
+        The game settles them in closed form (CoinFlipGame.catch_up), so this costs the
+        same for a minute or a month; everything gained is summed up in one popup.
+        Returns the catch-up summary, or None when not even one flip was missed.
+        """
+        try:
+            away = time.time() - float(since)
+        except (TypeError, ValueError):
+            return None
+        flip_ms = max(1, self.anim_steps_default * self._get_effective_frame_delay())
+        n = int(away * 1000 // flip_ms)
+        if n <= 0:
+            return None
+        summary = self.game.catch_up(n)
+        try:
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
+        except Exception:
+            pass
+        # achievements and items go into the summary instead of a popup each
+        for name in summary["achievements"]:
+            self._on_achievement_earned(name, popup=False)
+        if summary["items"]:
+            try:
+                if getattr(self, 'inventory_tab_added', False):
+                    self._update_inventory_ui()
+            except Exception:
+                pass
+        self._save_progress()
+        hours, rest = divmod(int(away), 3600)
+        lines = [f"{hours}h {rest // 60}m: {format_count(n)} flips "
+                 f"({format_count(summary['heads'])} heads / {format_count(summary['tails'])} tails)"]
+        for name, cnt in summary["items"].items():
+            lines.append(f"Found: {name} ×{format_count(cnt)}")
+        if summary["achievements"]:
+            lines.append("Achievements: " + ", ".join(summary["achievements"]))
+        try:
+            self.toasts.show("catch_up", "\n".join(lines))
+        except Exception:
+            pass
+        return summary
 
     def _revoke_all(self):
         """Revoke all progress: confirmation, then reset achievements, flips, rebirths, visited tabs,
@@ -975,23 +3203,20 @@ class CoinFlipApp:
         if not ok:
             return
 
-        # Reset achievements and UI
+        # Reset game state (achievements, counts, rebirths, inventory)
+        self.game.reset()
+
+        # Reset achievements UI
         for name in list(self.achievements.keys()):
-            self.achievements[name] = False
             lbl = self.ach_labels.get(name)
             if lbl:
                 lbl.configure(text=("🔒 " + name), fg="#666")
 
-        # Reset counts and UI labels
-        self.flip_count = 0
+        # Reset UI labels
         try:
-            self.flip_label.configure(text=f"Flips: {self.flip_count}")
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
         except Exception:
             pass
-        self.consec_heads = 0
-        self.visited_tabs = set()
-
-        self.rebirth_count = 0
         try:
             self._update_rebirth_ui()
         except Exception:
@@ -1031,13 +3256,13 @@ class CoinFlipApp:
 
         # Additional cleanup: ensure all non-core tabs are removed and internal state reset
         try:
-            # remove any notebook tabs that aren't the core three
+            # remove any notebook tabs that aren't the core three (Statistics always stays)
             for tab_id in list(self.notebook.tabs()):
                 try:
                     txt = self.notebook.tab(tab_id, 'text')
                 except Exception:
                     continue
-                if txt not in ("Flip", "Settings", "Achievements"):
+                if txt not in ("Flip", "Settings", "Achievements", "Statistics"):
                     try:
                         self.notebook.forget(tab_id)
                     except Exception:
@@ -1049,7 +3274,7 @@ class CoinFlipApp:
             # reset flip/rebirth counters & UI
             self.flip_count = 0
             try:
-                self.flip_label.configure(text=f"Flips: {self.flip_count}")
+                self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
             except Exception:
                 pass
             self.rebirth_count = 0
@@ -1078,14 +3303,10 @@ class CoinFlipApp:
             except Exception:
                 pass
 
-            # cancel and remove window editor if present
+            # stop bouncing and remove window editor if present
             try:
-                if getattr(self, 'win_bounce_job', None):
-                    try:
-                        self.master.after_cancel(self.win_bounce_job)
-                    except Exception:
-                        pass
-                    self.win_bounce_job = None
+                self.motion.stop()
+                self.win_bouncing = False
             except Exception:
                 pass
             try:
@@ -1123,6 +3344,8 @@ class CoinFlipApp:
         except Exception:
             pass
 
+        self._save_progress()
+
         try:
             messagebox.showinfo("Revoke", "Thank you for using SDN")
         except Exception:
@@ -1145,6 +3368,8 @@ class CoinFlipApp:
 
             try:
                 self.win_editor.protocol("WM_DELETE_WINDOW", _on_close)
+                # keeps the window's size current while it bounces
+                self.win_editor.bind("<Configure>", self.motion.on_configure, add="+")
             except Exception:
                 pass
 
@@ -1191,11 +3416,12 @@ class CoinFlipApp:
 
             # Bounce control removed per user request (feature kept internally)
 
-            # internal bounce state
-            self.win_bouncing = False
-            self.win_bounce_job = None
-            self._bounce_dx = 8
-            self._bounce_dy = 6
+            # join in if the other windows are already bouncing
+            if getattr(self, 'win_bouncing', False):
+                try:
+                    self.motion.add(self.win_editor, *BOUNCE_VELOCITY)
+                except Exception:
+                    pass
 
             self.win_editor_added = True
         except Exception:
@@ -1203,13 +3429,11 @@ class CoinFlipApp:
 
     def _close_window_editor(self):
         try:
-            if getattr(self, 'win_bounce_job', None):
+            if getattr(self, 'win_editor', None):
                 try:
-                    self.master.after_cancel(self.win_bounce_job)
+                    self.motion.remove(self.win_editor)
                 except Exception:
                     pass
-                self.win_bounce_job = None
-            if getattr(self, 'win_editor', None):
                 try:
                     self.win_editor.destroy()
                 except Exception:
@@ -1275,7 +3499,11 @@ class CoinFlipApp:
             ms = max(5, min(1000, ms))
             steps = max(4, min(240, steps))
             self.base_frame_delay = ms
+            if steps != self.anim_steps_default:
+                # frame count changed: spin keyframes must be rebuilt
+                self._keyframes = None
             self.anim_steps_default = steps
+            self._prerender_sprites()
             # update current frame delay if not animating
             try:
                 self.frame_delay = self._get_effective_frame_delay()
@@ -1285,16 +3513,12 @@ class CoinFlipApp:
             pass
 
     def _toggle_bounce(self):
+        """Start or stop bouncing the main window, plus the Test window and Window Editor if open."""
         try:
             if getattr(self, 'win_bouncing', False):
                 # stop
                 self.win_bouncing = False
-                try:
-                    if self.win_bounce_job:
-                        self.master.after_cancel(self.win_bounce_job)
-                except Exception:
-                    pass
-                self.win_bounce_job = None
+                self.motion.stop()
                 try:
                     btn = getattr(self, '_btn_bounce', None)
                     if btn is not None:
@@ -1310,215 +3534,106 @@ class CoinFlipApp:
                         btn.configure(text="Stop Bounce")
                 except Exception:
                     pass
-                try:
-                    self._bounce_step()
-                except Exception:
-                    pass
-        except Exception:
-            pass
-
-    def _bounce_step(self):
-        try:
-            if not getattr(self, 'win_bouncing', False):
-                return
-            sw = self.master.winfo_screenwidth()
-            sh = self.master.winfo_screenheight()
-            w = self.master.winfo_width()
-            h = self.master.winfo_height()
-            x = self.master.winfo_x()
-            y = self.master.winfo_y()
-            dx = getattr(self, '_bounce_dx', 8)
-            dy = getattr(self, '_bounce_dy', 6)
-
-            nx = x + dx
-            ny = y + dy
-            # bounce off edges
-            if nx < 0 or (nx + w) > sw:
-                self._bounce_dx = -dx
-                nx = max(0, min(nx, sw - w))
-            if ny < 0 or (ny + h) > sh:
-                self._bounce_dy = -dy
-                ny = max(0, min(ny, sh - h))
-
-            try:
-                # preserve current size when moving the window to avoid platform-specific side-effects
-                try:
-                    cw = int(w)
-                    ch = int(h)
-                    self.master.geometry(f"{cw}x{ch}+{int(nx)}+{int(ny)}")
-                except Exception:
-                    self.master.geometry(f"+{int(nx)}+{int(ny)}")
-            except Exception:
-                pass
-
-            # schedule next step
-            try:
-                # slower tick to reduce CPU and visual jumpiness
-                self.win_bounce_job = self.master.after(50, self._bounce_step)
-            except Exception:
-                self.win_bounce_job = None
-        except Exception:
-            pass
-
-        # remove Dev tab itself
-        try:
-            if getattr(self, 'dev_tab_added', False):
-                # forget the dev tab and mark as not added
-                self.notebook.forget(self.tab_dev)
-                self.dev_tab_added = False
-                # also clear dev_code_var so user must re-enter code to re-add
-                try:
-                    self.dev_code_var.set("")
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        # remove Test window if present
-        try:
-            if getattr(self, 'test_win_added', False):
-                try:
-                    self.test_win.destroy()
-                except Exception:
-                    pass
-                self.test_win_added = False
-        except Exception:
-            pass
-
-        # remove Window Editor if present
-        try:
-            if getattr(self, 'win_editor_added', False):
-                try:
-                    self._close_window_editor()
-                except Exception:
-                    pass
-                self.win_editor_added = False
-        except Exception:
-            pass
-
-        # reset effective frame delay
-        try:
-            self.frame_delay = self._get_effective_frame_delay()
-        except Exception:
-            pass
-
-        try:
-            messagebox.showinfo("Revoke", "Thank you for using SDN")
+                for win in self._bounce_windows():
+                    try:
+                        self.motion.add(win, *BOUNCE_VELOCITY)
+                    except Exception:
+                        pass
         except Exception:
             pass
 
+    def _bounce_windows(self):
+        """The windows that bounce together: the main window and any open dev windows."""
+        wins = [self.master]
+        if getattr(self, 'test_win_added', False) and self.test_win is not None:
+            wins.append(self.test_win)
+        if getattr(self, 'win_editor_added', False) and self.win_editor is not None:
+            wins.append(self.win_editor)
+        return wins
 
     def start_flip(self, event=None):
         if self.animating:
             return
+        if self.coin_count > 1:
+            self._start_grid_flip()
+            return
         self.animating = True
         # prepare a spinning animation using the default settings
         self.anim_steps = self.anim_steps_default
         self.anim_frame = 0
         self.rotations = self.rotations_default
         self.frame_delay = self._get_effective_frame_delay()
-        # choose final outcome now (always random)
-        self.final = random.choice(["Heads", "Tails"])
-        # increment flip count and award achievements at milestones
-        self.flip_count += 1
+        # sprites normally exist already; this only renders after they were evicted
+        self._prerender_sprites()
+        # frames are timed against absolute deadlines so the flip always lasts anim_steps * frame_delay
+        self.frame_clock.start(self.anim_steps, self.frame_delay)
+        # choose final outcome now (always random), count the flip and award milestones
+        self.final, awarded = self.game.begin_flip()
         # update flip counter UI
         try:
-            self.flip_label.configure(text=f"Flips: {self.flip_count}")
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
         except Exception:
             pass
         # award milestone achievements in order
-        if self.flip_count == 1:
-            self.award_achievement("1st Coin Flip")
-        if self.flip_count == 5:
-            self.award_achievement("5th Coin Flip")
-        if self.flip_count == 20:
-            self.award_achievement("20th Coin Flip")
-        if self.flip_count == 50:
-            self.award_achievement("50th Coin Flip")
-        if self.flip_count == 100:
-            self.award_achievement("100th Coin Flip")
+        for name in awarded:
+            self._on_achievement_earned(name)
         self._animate()
 
     def _animate(self):
+        if self._grid_outcomes is not None:
+            self._animate_grid()
+            return
         # spin animation using a cosine to simulate rotation (width goes to thin edge and back)
+        # the frame clock picks which frame is due now, dropping any we fell behind on
+        self.anim_frame = self.frame_clock.tick()
         if self.anim_frame >= self.anim_steps:
             # finish on the predetermined final face
             final = self.final
-            self.canvas.itemconfigure(self.text, text=final, fill="#222")
-            # optional color change per result
-            if final == "Heads":
-                self.canvas.itemconfigure(self.oval, fill="#E6B800", outline="#c68f00")
-            else:
-                self.canvas.itemconfigure(self.oval, fill="#cfcfcf", outline="#9e9e9e")
-            # restore full circular size
-            self._set_coin_ellipse(1.0, 1.0)
-            # update consecutive-heads counter and award if needed
-            if final == "Heads":
-                self.consec_heads += 1
-            else:
-                self.consec_heads = 0
-
-            if self.consec_heads == 4:
-                self.award_achievement("I Like Heads")
+            # optional color change per result, at full circular size
+            face_fill, face_outline = COIN_FACE_COLORS[final]
+            self._draw_coin_frame(self._coin_ellipse_coords(1.0, 1.0), face_fill, face_outline, final, "#222")
+            if self._sprite_shown is not None:
+                self._hide_coin_sprite()
+            # update consecutive-heads counter and roll for a Rebirth cube (Inventory owners only)
+            awarded, dropped = self.game.finish_flip(final)
+            for name in awarded:
+                self._on_achievement_earned(name)
 
-            # small chance to find a Rebirth cube if player owns an Inventory
             try:
-                if getattr(self, 'inventory_owned', False):
-                    if random.random() < 0.05:
-                        # add to inventory
-                        self.inventory_items['Rebirth cube'] = self.inventory_items.get('Rebirth cube', 0) + 1
-                        # show a brief popup and update UI if visible
-                        try:
-                            self._show_item_popup('Rebirth cube')
-                        except Exception:
-                            pass
-                        try:
-                            if getattr(self, 'inventory_tab_added', False):
-                                self._update_inventory_ui()
-                        except Exception:
-                            pass
+                if dropped:
+                    # show a brief popup and update UI if visible
+                    try:
+                        self._show_item_popup(dropped)
+                    except Exception:
+                        pass
+                    try:
+                        if getattr(self, 'inventory_tab_added', False):
+                            self._update_inventory_ui()
+                    except Exception:
+                        pass
             except Exception:
                 pass
 
             self.animating = False
+            self._save_progress()
+            # per-flip timing (jitter / dropped frames) for the last completed flip
+            self.last_flip_stats = self.frame_clock.stats()
+            # switched to several coins mid-flip: show the grid now
+            if self.coin_count > 1:
+                try:
+                    self._layout_coin_grid()
+                except Exception:
+                    pass
             return
 
-        # compute progress and angle
-        t = self.anim_frame / max(1, self.anim_steps)
-        rotations = getattr(self, 'rotations', self.rotations_default)
-        theta = t * rotations * 2 * math.pi
-        # horizontal scale simulates the coin turning edge-on
-        x_scale = abs(math.cos(theta))
-        # avoid completely zero width
-        x_scale = max(x_scale, 0.05)
-
-        # determine which face is visible based on rotation half-cycles
-        side_index = int(theta / math.pi) % 2
-        display = "Heads" if side_index == 0 else "Tails"
-
-        # set face color based on which side is currently visible
-        if display == "Heads":
-            face_fill = "#E6B800"
-            face_outline = "#c68f00"
+        # frames come precomputed from the keyframe table (see _get_keyframes)
+        if self.use_sprites:
+            self._draw_coin_sprite(*self._get_keyframes()[self.anim_frame])
         else:
-            face_fill = "#cfcfcf"
-            face_outline = "#9e9e9e"
+            self._draw_coin_frame(*self._get_keyframes()[self.anim_frame])
 
-        # apply the face color while it's visible; when edge-on it's still okay
-        self.canvas.itemconfigure(self.oval, fill=face_fill, outline=face_outline)
-
-        # hide text when the coin is near edge (very thin)
-        if x_scale < 0.12:
-            self.canvas.itemconfigure(self.text, text="", fill="")
-        else:
-            self.canvas.itemconfigure(self.text, text=display, fill="#222")
-
-        # slightly vary vertical size for a little perspective feel
-        y_scale = 0.98 + 0.02 * x_scale
-        self._set_coin_ellipse(x_scale, y_scale)
-
-        self.anim_frame += 1
-        # schedule next frame using configured speed
-        self.master.after(self.frame_delay, self._animate)
+        # schedule next frame at its deadline
+        self.master.after(self.frame_clock.wait_ms(), self._animate)
 
     def _scale_coin(self, scale):
         # kept for backward compatibility: uniform scaling
@@ -1531,23 +3646,393 @@ class CoinFlipApp:
         # ensure text stays centered
         self.canvas.coords(self.text, self.cx, self.cy)
 
-    def _set_coin_ellipse(self, x_scale, y_scale=1.0):
-        # set the coin as an ellipse centered at (cx,cy) with separate x/y scales
+    def _coin_ellipse_coords(self, x_scale, y_scale=1.0):
+        # bounding box of the coin as an ellipse centered at (cx,cy) with separate x/y scales
         rx = self.base_radius * x_scale
         ry = self.base_radius * y_scale
         # ensure a minimum visible width to avoid zero-size geometry
         rx = max(rx, 2)
-        x0 = self.cx - rx
-        y0 = self.cy - ry
-        x1 = self.cx + rx
-        y1 = self.cy + ry
-        self.canvas.coords(self.oval, x0, y0, x1, y1)
+        return (self.cx - rx, self.cy - ry, self.cx + rx, self.cy + ry)
+
+    def _set_coin_ellipse(self, x_scale, y_scale=1.0):
+        # set the coin as an ellipse centered at (cx,cy) with separate x/y scales
+        coords = self._coin_ellipse_coords(x_scale, y_scale)
+        self.canvas.coords(self.oval, *coords)
         # keep text centered
         self.canvas.coords(self.text, self.cx, self.cy)
+        drawn = getattr(self, '_coin_drawn', None)
+        if drawn is not None:
+            drawn[0] = coords
+
+    def _get_keyframes(self):
+        """Return the spin keyframe table, rebuilding it only when its inputs changed.
+
+        Each frame is (oval coords, fill, outline, text, text fill) and is keyed by
+        (anim_steps, rotations, coin center, base_radius); _apply_anim_settings and
+        _reflow_layout drop the table when they change any of those.
+        """
+        key = (self.anim_steps, self.rotations, self.cx, self.cy, self.base_radius)
+        if self._keyframes_key == key and self._keyframes is not None:
+            return self._keyframes
+        steps = max(1, self.anim_steps)
+        frames = []
+        for frame in range(self.anim_steps):
+            # compute progress and angle
+            theta = frame / steps * self.rotations * 2 * math.pi
+            x_scale, y_scale, face_fill, face_outline, text, text_fill = self._spin_pose(theta)
+            frames.append((self._coin_ellipse_coords(x_scale, y_scale), face_fill, face_outline, text, text_fill))
+        self._keyframes = frames
+        self._keyframes_key = key
+        return frames
+
+    @staticmethod
+    def _spin_pose(theta):
+        """How a coin turned by theta radians looks: (x scale, y scale, fill, outline, text, text fill)."""
+        # horizontal scale simulates the coin turning edge-on (never completely zero width)
+        x_scale = max(abs(math.cos(theta)), 0.05)
+        # determine which face is visible based on rotation half-cycles
+        display = "Heads" if int(theta / math.pi) % 2 == 0 else "Tails"
+        face_fill, face_outline = COIN_FACE_COLORS[display]
+        # hide text when the coin is near edge (very thin)
+        if x_scale < 0.12:
+            text, text_fill = "", ""
+        else:
+            text, text_fill = display, "#222"
+        # slightly vary vertical size for a little perspective feel
+        y_scale = 0.98 + 0.02 * x_scale
+        return x_scale, y_scale, face_fill, face_outline, text, text_fill
+
+    def _draw_coin_frame(self, coords, fill, outline, text, text_fill):
+        """Draw one coin frame, sending Tk only the canvas calls whose values changed."""
+        drawn = self._coin_drawn
+        if drawn[0] != coords:
+            self.canvas.coords(self.oval, *coords)
+            drawn[0] = coords
+        if drawn[1] != fill or drawn[2] != outline:
+            self.canvas.itemconfigure(self.oval, fill=fill, outline=outline)
+            drawn[1] = fill
+            drawn[2] = outline
+        if drawn[3] != text or drawn[4] != text_fill:
+            self.canvas.itemconfigure(self.text, text=text, fill=text_fill)
+            drawn[3] = text
+            drawn[4] = text_fill
+
+    def _draw_coin_sprite(self, coords, fill, outline, text, text_fill):
+        """Draw one coin frame by swapping the pre-rendered image (sprite renderer)."""
+        image = self.coin_sprites.get(coords, fill, outline)
+        if self._sprite_shown is not image:
+            if self._sprite_shown is None:
+                self.canvas.itemconfigure(self.oval, state="hidden")
+                self.canvas.itemconfigure(self.coin_image, state="normal")
+            self.canvas.itemconfigure(self.coin_image, image=image)
+            self._sprite_shown = image
+        drawn = self._coin_drawn
+        if drawn[3] != text or drawn[4] != text_fill:
+            self.canvas.itemconfigure(self.text, text=text, fill=text_fill)
+            drawn[3] = text
+            drawn[4] = text_fill
+
+    def _hide_coin_sprite(self):
+        # back to the vector oval (at rest the coin is always drawn as shapes)
+        self.canvas.itemconfigure(self.coin_image, state="hidden", image="")
+        self.canvas.itemconfigure(self.oval, state="normal")
+        self._sprite_shown = None
+        # free the images if no flip uses them for a while
+        try:
+            if self._sprite_evict_id is not None:
+                self.master.after_cancel(self._sprite_evict_id)
+            self._sprite_evict_id = self.master.after(SPRITE_IDLE_MS, self._evict_sprites)
+        except Exception:
+            pass
+
+    def _prerender_sprites(self):
+        """Render the sprite of every spin keyframe now, so a flip never renders mid-animation."""
+        if not self.use_sprites:
+            return
+        try:
+            if not self.animating:
+                # at rest the next flip uses the defaults (see start_flip)
+                self.anim_steps = self.anim_steps_default
+                self.rotations = self.rotations_default
+            self.coin_sprites.prerender(self._get_keyframes())
+        except Exception:
+            pass
+
+    def _evict_sprites(self):
+        self._sprite_evict_id = None
+        if self._sprite_shown is None:
+            self.coin_sprites.clear()
+
+    def _toggle_sprites(self):
+        """Switch between the sprite renderer and vector drawing (Settings > Animation)."""
+        self.use_sprites = bool(self.sprites_var.get())
+        if not self.use_sprites:
+            if self._sprite_shown is not None:
+                self._hide_coin_sprite()
+            self.coin_sprites.clear()
+        else:
+            self._prerender_sprites()
+
+    # -------------------- multi-coin flips --------------------
+    def _apply_coin_count(self):
+        """Switch between one coin and a grid of coins (Settings > Animation).
+
+        Takes effect right away at rest; during a flip it waits for the coins to land.
+        """
+        try:
+            k = max(1, min(MAX_COINS, int(self.coins_var.get())))
+        except Exception:
+            return
+        if k == self.coin_count:
+            return
+        self.coin_count = k
+        if not self.animating:
+            self._layout_coin_grid()
+
+    def _coin_grid_cells(self, k):
+        """(cx, cy, radius) of k coins laid out in a grid over the single coin's area."""
+        pad = getattr(self, 'pad', 30)
+        area_w = max(20, self.width - 2 * pad)
+        area_h = max(20, (self.height - 120) - 2 * pad)
+        # the column count whose cells come closest to square
+        cols = min(range(1, k + 1), key=lambda c: abs((area_w / c) - (area_h / math.ceil(k / c))))
+        rows = math.ceil(k / cols)
+        cell_w, cell_h = area_w / cols, area_h / rows
+        radius = max(4.0, min(cell_w, cell_h) * 0.45)
+        cells = []
+        for i in range(k):
+            row, col = divmod(i, cols)
+            # center a short last row
+            in_row = min(cols, k - row * cols)
+            x = pad + (area_w - in_row * cell_w) / 2 + (col + 0.5) * cell_w
+            y = pad + (row + 0.5) * cell_h
+            cells.append((x, y, radius))
+        return cells
+
+    def _layout_coin_grid(self):
+        """Show coin_count coins in a grid (or the single coin when it is 1) at rest."""
+        k = self.coin_count
+        cells = self._coin_grid_cells(k) if k > 1 else []
+        self._grid_cells = cells
+        self._grid_keyframes = None
+        while len(self._grid_items) < len(cells):
+            oval = self.canvas.create_oval(0, 0, 1, 1, width=2, state="hidden")
+            text = self.canvas.create_text(0, 0, state="hidden")
+            self._grid_items.append((oval, text))
+            self._grid_drawn.append([None, None, None, None, None])
+            self._grid_faces.append("Heads")
+        font_size = max(6, int(cells[0][2] * 0.4)) if cells else 6
+        for i, (oval, text) in enumerate(self._grid_items):
+            if i < len(cells):
+                cx, cy, r = cells[i]
+                face = self._grid_faces[i]
+                self.canvas.itemconfigure(oval, state="normal")
+                self.canvas.itemconfigure(text, state="normal", font=("Arial", font_size, "bold"))
+                self._draw_grid_coin(i, (cx - r, cy - r, cx + r, cy + r), *COIN_FACE_COLORS[face], face, "#222")
+            else:
+                self.canvas.itemconfigure(oval, state="hidden")
+                self.canvas.itemconfigure(text, state="hidden")
+        # the single coin (vector or sprite) is hidden while the grid is up
+        if cells:
+            if self._sprite_shown is not None:
+                self._hide_coin_sprite()
+            self.canvas.itemconfigure(self.oval, state="hidden")
+            self.canvas.itemconfigure(self.text, state="hidden")
+        else:
+            if self._sprite_shown is None:
+                self.canvas.itemconfigure(self.oval, state="normal")
+            self.canvas.itemconfigure(self.text, state="normal")
+
+    def _draw_grid_coin(self, i, coords, fill, outline, text, text_fill):
+        oval, text_id = self._grid_items[i]
+        drawn = self._grid_drawn[i]
+        self.canvas.coords(oval, *coords)
+        self.canvas.itemconfigure(oval, fill=fill, outline=outline)
+        self.canvas.coords(text_id, (coords[0] + coords[2]) / 2, (coords[1] + coords[3]) / 2)
+        self.canvas.itemconfigure(text_id, text=text, fill=text_fill)
+        drawn[:] = [coords, fill, outline, text, text_fill]
+
+    def _get_grid_keyframes(self):
+        """Spin keyframes for the whole grid: per frame, one (coords, fill, outline, text, text fill) per coin.
+
+        Each coin starts COIN_PHASE_STEP of a turn after its neighbour. Rebuilt when
+        anim_steps, rotations or the grid layout change.
+        """
+        key = (self.anim_steps, self.rotations, tuple(self._grid_cells))
+        if self._grid_keyframes_key == key and self._grid_keyframes is not None:
+            return self._grid_keyframes
+        steps = max(1, self.anim_steps)
+        frames = []
+        for frame in range(self.anim_steps):
+            row = []
+            for i, (cx, cy, r) in enumerate(self._grid_cells):
+                theta = (frame / steps * self.rotations + i * COIN_PHASE_STEP) * 2 * math.pi
+                x_scale, y_scale, fill, outline, text, text_fill = self._spin_pose(theta)
+                rx, ry = max(r * x_scale, 2), r * y_scale
+                row.append(((cx - rx, cy - ry, cx + rx, cy + ry), fill, outline, text, text_fill))
+            frames.append(row)
+        self._grid_keyframes = frames
+        self._grid_keyframes_key = key
+        return frames
+
+    def _draw_coin_grid(self, frame):
+        """Draw one frame of every grid coin in a single Tcl call, sending only changed values."""
+        path = str(self.canvas)
+        ops = []
+        for (oval, text_id), drawn, (coords, fill, outline, text, text_fill) in zip(self._grid_items, self._grid_drawn, frame):
+            if drawn[0] != coords:
+                x0, y0, x1, y1 = coords
+                ops.append(f"{path} coords {oval} {x0:.2f} {y0:.2f} {x1:.2f} {y1:.2f}")
+                drawn[0] = coords
+            if drawn[1] != fill or drawn[2] != outline:
+                ops.append(f"{path} itemconfigure {oval} -fill {{{fill}}} -outline {{{outline}}}")
+                drawn[1] = fill
+                drawn[2] = outline
+            if drawn[3] != text or drawn[4] != text_fill:
+                ops.append(f"{path} itemconfigure {text_id} -text {{{text}}} -fill {{{text_fill}}}")
+                drawn[3] = text
+                drawn[4] = text_fill
+        if ops:
+            self.canvas.tk.eval("\n".join(ops))
+
+    def _start_grid_flip(self):
+        """Flip every grid coin at once, on one animation loop."""
+        if len(self._grid_cells) != self.coin_count:
+            self._layout_coin_grid()
+        self.animating = True
+        self.anim_steps = self.anim_steps_default
+        self.anim_frame = 0
+        self.rotations = self.rotations_default
+        self.frame_delay = self._get_effective_frame_delay()
+        self.frame_clock.start(self.anim_steps, self.frame_delay)
+        # every coin is a flip of its own: outcomes drawn and counted in grid order
+        outcomes = []
+        awarded = []
+        for _ in self._grid_cells:
+            outcome, names = self.game.begin_flip()
+            outcomes.append(outcome)
+            awarded.extend(names)
+        self._grid_outcomes = outcomes
+        try:
+            self.flip_label.configure(text=f"Flips: {format_count(self.flip_count)}")
+        except Exception:
+            pass
+        for name in awarded:
+            self._on_achievement_earned(name)
+        self._animate()
+
+    def _animate_grid(self):
+        self.anim_frame = self.frame_clock.tick()
+        if self.anim_frame < self.anim_steps:
+            self._draw_coin_grid(self._get_grid_keyframes()[self.anim_frame])
+            self.master.after(self.frame_clock.wait_ms(), self._animate)
+            return
+        # land every coin on its face, then apply the outcomes in grid order
+        outcomes = self._grid_outcomes
+        self._grid_outcomes = None
+        landing = []
+        for (cx, cy, r), face in zip(self._grid_cells, outcomes):
+            landing.append(((cx - r, cy - r, cx + r, cy + r), *COIN_FACE_COLORS[face], face, "#222"))
+        self._draw_coin_grid(landing)
+        self._grid_faces[:len(outcomes)] = outcomes
+        dropped_any = False
+        for face in outcomes:
+            awarded, dropped = self.game.finish_flip(face)
+            for name in awarded:
+                self._on_achievement_earned(name)
+            if dropped:
+                dropped_any = True
+                try:
+                    self._show_item_popup(dropped)
+                except Exception:
+                    pass
+        if dropped_any:
+            try:
+                if getattr(self, 'inventory_tab_added', False):
+                    self._update_inventory_ui()
+            except Exception:
+                pass
+        self.animating = False
+        self._save_progress()
+        self.last_flip_stats = self.frame_clock.stats()
+        # a coin count changed mid-flip applies now
+        if len(outcomes) != self.coin_count:
+            try:
+                self._layout_coin_grid()
+            except Exception:
+                pass
+
+
+def launch_app(root, on_first_frame=None):
+    """Create the game window on root and center it on the screen."""
+    app = CoinFlipApp(root, save_dir=SAVE_DIR, on_first_frame=on_first_frame)
+    # allow geometry to settle then center the main window on the screen
+    try:
+        root.update_idletasks()
+        w = root.winfo_width()
+        h = root.winfo_height()
+        sw = root.winfo_screenwidth()
+        sh = root.winfo_screenheight()
+        # ensure reasonable defaults
+        if not w or not h:
+            # fallback to a default size if not yet measured
+            w = getattr(app, 'width', 800) or 800
+            h = getattr(app, 'height', 600) or 600
+        x = max((sw - w) // 2, 0)
+        y = max((sh - h) // 2, 0)
+        root.geometry(f"{w}x{h}+{x}+{y}")
+    except Exception:
+        # ignore if centering fails on some platforms
+        pass
+    return app
+
+
+def _print_startup_profile(profile):
+    """Print the startup profile (--profile-startup)."""
+    total = profile.get("first_frame_ms", 0.0)
+    print(f"startup: app built in {profile.get('app_init_ms', 0.0):.1f} ms, "
+          f"first interactive frame after {total:.1f} ms "
+          f"({profile.get('since_load_ms', 0.0):.1f} ms since module load)")
+    if total > STARTUP_BUDGET_MS:
+        print(f"startup: over the {STARTUP_BUDGET_MS} ms budget")
+
+
+def replay_session_file(path):
+    """Replay a recorded session headlessly and check its final state (--replay FILE)."""
+    log = SessionLog.load(path)
+    start = time.perf_counter()
+    game = log.replay()
+    elapsed = time.perf_counter() - start
+    print(f"replayed {len(log.events)} events in {elapsed * 1000:.1f} ms")
+    if log.final is None:
+        print("log has no final state to verify")
+        return 0
+    diff = log.verify(game)
+    if diff:
+        for key in diff:
+            print(f"mismatch in {key}: recorded {log.final[key]!r}, replayed {game.session_state().get(key)!r}")
+        return 1
+    print("final state matches")
+    return 0
 
 
 if __name__ == "__main__":
+    # --replay FILE: replay a recorded session without opening any window and verify it
+    if "--replay" in sys.argv[1:]:
+        args = sys.argv[sys.argv.index("--replay") + 1:]
+        if not args or args[0].startswith("--"):
+            print("usage: CoinFlipping.py --replay FILE", file=sys.stderr)
+            sys.exit(2)
+        sys.exit(replay_session_file(args[0]))
+    # --fast-start: open the game window directly (no splash, slide-in or intro)
+    # --profile-startup: print time-to-first-interactive-frame once the window is up
+    on_first_frame = _print_startup_profile if "--profile-startup" in sys.argv[1:] else None
     root = tk.Tk()
+    if "--fast-start" in sys.argv[1:]:
+        launch_app(root, on_first_frame)
+        root.mainloop()
+        sys.exit(0)
+
     # start hidden while splash shows
     root.withdraw()
 
@@ -1572,25 +4057,7 @@ if __name__ == "__main__":
         try:
             # show main window and instantiate app
             root.deiconify()
-            app = CoinFlipApp(root)
-            # allow geometry to settle then center the main window on the screen
-            try:
-                root.update_idletasks()
-                w = root.winfo_width()
-                h = root.winfo_height()
-                sw = root.winfo_screenwidth()
-                sh = root.winfo_screenheight()
-                # ensure reasonable defaults
-                if not w or not h:
-                    # fallback to a default size if not yet measured
-                    w = getattr(app, 'width', 800) or 800
-                    h = getattr(app, 'height', 600) or 600
-                x = max((sw - w) // 2, 0)
-                y = max((sh - h) // 2, 0)
-                root.geometry(f"{w}x{h}+{x}+{y}")
-            except Exception:
-                # ignore if centering fails on some platforms
-                pass
+            launch_app(root, on_first_frame)
         except Exception:
             pass
 
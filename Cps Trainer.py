@@ -2,7 +2,7 @@ import tkinter as tk
 import time
 
 class ClickCounter:
-    def __init__(self, use_unit="SECOND", bordered=False):
+    def __init__(self, use_unit="SECOND", bordered=False, run=True):
         self.root = tk.Tk()
 
         # Borderless or not
@@ -47,7 +47,9 @@ class ClickCounter:
         self.root.bind("<Button-3>", lambda e: self.root.destroy())
 
         self.update_display()
-        self.root.mainloop()
+        # run=False leaves the event loop to the caller (used by bench_suite.py)
+        if run:
+            self.root.mainloop()
 
     def move_window(self, event):
         if self.root.overrideredirect():  # Only draggable if borderless
@@ -1,8 +1,13 @@
 import tkinter as tk
 import time
-import winsound
 import threading
 
+# winsound only exists on Windows; elsewhere the stopwatch runs silently
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
 running = False
 start_time = 0
 elapsed = 0
@@ -11,6 +16,8 @@ offset_y = 0
 last_beep_second = 0
 
 def play_beep(freq, duration=150):
+    if winsound is None:
+        return
     threading.Thread(target=lambda: winsound.Beep(freq, duration), daemon=True).start()
 
 # sound presets
@@ -107,4 +114,5 @@ clear_btn.grid(row=0, column=1, padx=5)
 stop_btn = tk.Button(btn_frame, text="Stop", width=7, command=stop)
 stop_btn.grid(row=0, column=2, padx=5)
 
-window.mainloop()
+if __name__ == "__main__":
+    window.mainloop()
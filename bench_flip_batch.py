@@ -0,0 +1,35 @@
+import random
+import sys
+import time
+from CoinFlipping import CoinFlipGame, _load_numpy
+
+np = _load_numpy()
+
+# flips per second CoinFlipGame.resolve_flips must reach on one core
+TARGET = 10_000_000
+N = 50_000_000
+
+if np is None:
+    print('numpy is not installed; resolve_flips falls back to simulate(), skipping benchmark.')
+    sys.exit(0)
+
+results = {}
+for label, owned in (('no inventory', False), ('inventory owned', True)):
+    game = CoinFlipGame(rng=random.Random(0))
+    game.inventory_owned = owned
+    game.resolve_flips(1_000_000)  # warm up
+    start = time.perf_counter()
+    game.resolve_flips(N)
+    elapsed = time.perf_counter() - start
+    results[label] = N / elapsed
+    print(f'resolve_flips ({label}): {N:,} flips in {elapsed:.3f} s = {N / elapsed:,.0f} flips/s')
+
+game = CoinFlipGame(rng=random.Random(0))
+start = time.perf_counter()
+game.simulate(2_000_000)
+elapsed = time.perf_counter() - start
+print(f'simulate (per-flip loop): {2_000_000 / elapsed:,.0f} flips/s')
+
+slowest = min(results.values())
+print(f'Target: {TARGET:,} flips/s -> {"PASS" if slowest >= TARGET else "FAIL"}')
+sys.exit(0 if slowest >= TARGET else 1)
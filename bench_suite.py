@@ -0,0 +1,420 @@
+"""Benchmark the hot paths of every app and compare them against stored baselines.
+
+    python bench_suite.py                  # run, compare with bench_baseline.json
+    python bench_suite.py --update         # run and store the results as the new baseline
+    python bench_suite.py --tolerance 10   # fail if anything got more than 10% slower
+    python bench_suite.py --only coinflip  # only benchmarks whose name starts with coinflip
+
+The first run (no baseline file yet) stores its results as the baseline. Baselines are
+per machine, so they are not committed. Tk benchmarks need a display: on a headless
+Linux box the suite starts its own Xvfb if one is installed, otherwise they are
+skipped (or fail with --require-display).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+import timeit
+
+import tkinter as tk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "bench_baseline.json")
+# percent a benchmark may slow down against its baseline before the run fails
+DEFAULT_TOLERANCE = 20.0
+# each benchmark is timed this many times; the fastest repeat counts (least noise)
+REPEATS = 5
+
+
+def load_script(name, filename):
+    """Import one of the app scripts by file name (they have spaces in them)."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def cancel_pending(root):
+    """Drop every after() callback a benchmark left scheduled on root."""
+    try:
+        for after_id in root.tk.splitlist(root.tk.call("after", "info")):
+            root.after_cancel(after_id)
+    except tk.TclError:
+        pass
+
+
+def measure(op):
+    """Seconds per call of op: fastest of REPEATS timed runs, each at least ~0.2 s."""
+    timer = timeit.Timer(op)
+    number, _ = timer.autorange()
+    return min(timer.repeat(REPEATS, number)) / number
+
+
+# ---- benchmarks: each returns {name: seconds per op} ----
+
+def bench_coinflip_game():
+    """Engine only (no Tk): single flips and bulk resolution."""
+    from CoinFlipping import CoinFlipGame, _load_numpy
+    results = {}
+    game = CoinFlipGame(rng=random.Random(0))
+    game.inventory_owned = True
+    results["coinflip.game_flip"] = measure(game.flip)
+    if _load_numpy() is not None:
+        results["coinflip.resolve_flips_1m"] = measure(lambda: game.resolve_flips(1_000_000))
+    return results
+
+
+def bench_coinflip_app():
+    """CoinFlipApp: whole flips, animation frames (vector, sprite, 16 coins) and the inventory list."""
+    from CoinFlipping import CoinFlipApp, FrameClock
+    root = tk.Tk()
+    try:
+        app = CoinFlipApp(root)
+        root.update()
+        # a frozen clock makes every tick the next frame: no frames dropped, no waiting
+        app.frame_clock = FrameClock(clock=lambda: 0.0)
+        app.game.reseed(0)
+
+        def full_flip():
+            app.start_flip()
+            while app.animating:
+                app._animate()
+            root.update_idletasks()
+
+        def animate_frame():
+            # average over whole flips, including the first and the landing frame
+            if app.animating:
+                app._animate()
+            else:
+                app.start_flip()
+            root.update_idletasks()
+
+        results = {}
+        for _ in range(200):
+            full_flip()  # earn the flip/streak achievements (and their toasts) up front
+        cancel_pending(root)
+        results["coinflip.app_flip"] = measure(full_flip)
+        cancel_pending(root)
+        results["coinflip.animate_frame"] = measure(animate_frame)
+        cancel_pending(root)
+
+        # the same frames through the sprite renderer, for comparison (images are
+        # rendered during the warm-up flips, so this is the steady-state cost)
+        app.sprites_var.set(True)
+        app._toggle_sprites()
+        for _ in range(3):
+            full_flip()
+        results["coinflip.animate_frame_sprites"] = measure(animate_frame)
+        cancel_pending(root)
+        app.sprites_var.set(False)
+        app._toggle_sprites()
+
+        # sixteen coins per flip: one frame draws the whole grid
+        app.coins_var.set(16)
+        app._apply_coin_count()
+        for _ in range(3):
+            full_flip()
+        results["coinflip.animate_frame_16coins"] = measure(animate_frame)
+        cancel_pending(root)
+        app.coins_var.set(1)
+        app._apply_coin_count()
+
+        # 500 item kinds, one count changing per refresh
+        app.game.inventory_owned = True
+        for i in range(500):
+            app.game.add_item(f"Item {i}", 1)
+        app._reveal_inventory_tab()
+        app.notebook.select(app.tab_inventory)
+        root.update()
+        counter = [0]
+
+        def update_inventory():
+            counter[0] += 1
+            app.inventory_items[f"Item {counter[0] % 500}"] += 1
+            app._update_inventory_ui()
+            root.update_idletasks()
+
+        results["coinflip.update_inventory_ui"] = measure(update_inventory)
+        cancel_pending(root)
+        return results
+    finally:
+        root.destroy()
+
+
+def bench_calculator():
+    """Calculator._evaluate on a typical expression typed on the keypad, round trip
+    through the evaluation worker included."""
+    calc_module = load_script("calculator", "Calculator 2.3.7.py")
+    calc = calc_module.Calculator()
+    try:
+        calc.update()
+
+        def evaluate():
+            calc._set_display("12.5*8-3/4+1234-56*7.25")
+            calc._evaluate()
+            while calc._pending is not None:
+                calc._poll_result(0.01)
+            calc.last_results.clear()
+
+        return {"calculator.evaluate": measure(evaluate)}
+    finally:
+        cancel_pending(calc)
+        calc.destroy()
+
+
+def bench_calculator_engine():
+    """The expression engine against eval, on a typical and a long expression (no Tk).
+
+    engine_* is a repeat of the same text (a compile-cache hit); engine_cold_* clears
+    the cache first, so it tokenizes, parses and compiles every time like eval does.
+    """
+    calc_module = load_script("calculator", "Calculator 2.3.7.py")
+    expressions = {
+        "typical": "12.5*8-3/4+1234-56*7.25",
+        "long": "+".join(f"{i}*{i + 1.5}/3-{i}**2//7" for i in range(40)),
+    }
+    results = {}
+
+    def cold(expr):
+        calc_module._compile_normalized.cache_clear()
+        return calc_module.evaluate_expression(expr)
+
+    for label, expr in expressions.items():
+        results[f"calculator.engine_{label}"] = measure(lambda: calc_module.evaluate_expression(expr))
+        results[f"calculator.engine_cold_{label}"] = measure(lambda: cold(expr))
+        # reference: what _evaluate used to do
+        results[f"calculator.eval_{label}"] = measure(lambda: eval(expr, {"__builtins__": None}, {}))
+    # one round trip through the warm worker process, and formatting a 1,000,000-digit result
+    worker = calc_module.EvalWorker()
+    try:
+        results["calculator.worker_roundtrip"] = measure(lambda: worker.result(expressions["typical"]))
+    finally:
+        worker.close()
+    big = 7 ** 1_183_000
+    results["calculator.format_big_int"] = measure(lambda: calc_module.format_result(big))
+    # sampling y = f(x) across the 400 px graph into polylines (what a viewport change costs)
+    view = calc_module.Viewport(0, 100, 0, 100, 400, 400)
+    func = calc_module.compile_function("50 + 40sin(x/5) + 1/(x-50)")
+    results["calculator.plot_function"] = measure(lambda: calc_module.curve_segments(func, view))
+    return results
+
+
+def bench_graph_points():
+    """Graph point layer with a million points on it: plotting one more, drawing them all,
+    and one frame of panning at the default zoom (density) and zoomed in (indexed points). No Tk."""
+    calc_module = load_script("calculator", "Calculator 2.3.7.py")
+    np = calc_module._load_numpy()
+    if np is None:
+        return {}
+    view = calc_module.Viewport(0, 100, 0, 100, 400, 400)
+    raster = calc_module.PointRaster(400, 400, calc_module.render_grid(view))
+    points = calc_module.PointStore()
+    rng = np.random.default_rng(0)
+    xs, ys = rng.uniform(0, 100, 1_000_000), rng.uniform(0, 100, 1_000_000)
+    points.add_many(xs, ys)
+
+    def click():
+        # what a click costs before Tk: store it, draw it, cut out the dirty rectangle
+        points.add(50.0, 50.0)
+        raster.plot(*view.to_canvas(50.0, 50.0))
+        raster.take_dirty()
+
+    def draw_all():
+        raster.reset()
+        raster.plot_many(*view.to_canvas(xs, ys))
+        raster.take_dirty()
+
+    index = calc_module.PointIndex(points)
+    index.rebuild()
+
+    def pan_frame(view):
+        def frame():
+            view.pan(3, 2)
+            raster.reset(calc_module.render_grid(view))
+            calc_module.draw_points(raster, index, view)
+            raster.take_dirty()
+        return frame
+
+    zoomed_in = calc_module.Viewport(40, 50, 40, 50, 400, 400)
+    return {"calculator.graph_click_1m": measure(click),
+            "calculator.graph_draw_1m": measure(draw_all),
+            "calculator.graph_pan_1m": measure(pan_frame(view)),
+            "calculator.graph_pan_zoomed_1m": measure(pan_frame(zoomed_in))}
+
+
+def bench_cps_trainer():
+    """ClickCounter.update_display with 500 clicks in the window."""
+    cps_module = load_script("cps_trainer", "Cps Trainer.py")
+    counter = cps_module.ClickCounter(use_unit="MINUTE", bordered=True, run=False)
+    try:
+        counter.click_times = [time.time()] * 500
+        counter.root.update()
+
+        def update_display():
+            counter.update_display()
+            counter.root.update_idletasks()
+
+        return {"cps.update_display": measure(update_display)}
+    finally:
+        cancel_pending(counter.root)
+        counter.root.destroy()
+
+
+def bench_stopwatch():
+    """update_timer: one tick of the running stopwatch."""
+    stopwatch = load_script("stopwatch", "Most exact Stop Watch.py")
+    try:
+        stopwatch.running = True
+        stopwatch.start_time = time.perf_counter_ns()
+        stopwatch.window.update()
+
+        def tick():
+            stopwatch.update_timer()
+            stopwatch.window.update_idletasks()
+
+        return {"stopwatch.update_timer": measure(tick)}
+    finally:
+        stopwatch.running = False
+        cancel_pending(stopwatch.window)
+        stopwatch.window.destroy()
+
+
+# (app the results belong to, function, needs a display)
+BENCHMARKS = [
+    ("coinflip", bench_coinflip_game, False),
+    ("coinflip", bench_coinflip_app, True),
+    ("calculator", bench_calculator, True),
+    ("calculator", bench_calculator_engine, False),
+    ("calculator", bench_graph_points, False),
+    ("cps", bench_cps_trainer, True),
+    ("stopwatch", bench_stopwatch, True),
+]
+
+
+def ensure_display():
+    """Make sure Tk can open windows; returns an Xvfb process to stop later (or None).
+
+    Raises RuntimeError when there is no display and no Xvfb to start.
+    """
+    if os.name != "posix" or sys.platform == "darwin" or os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("no DISPLAY and Xvfb is not installed")
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen([xvfb, "-displayfd", str(write_fd), "-nolisten", "tcp", "-screen", "0", "1024x768x24"],
+                            pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        number = f.readline().strip()
+    if not number:
+        proc.kill()
+        raise RuntimeError("Xvfb failed to start")
+    os.environ["DISPLAY"] = ":" + number
+    return proc
+
+
+def load_baseline(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, results):
+    data = {
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "recorded": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": {name: {"seconds": sec} for name, sec in sorted(results.items())},
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+def compare(results, baseline, tolerance):
+    """Print each result against its baseline; returns the names that regressed."""
+    base = (baseline or {}).get("results", {})
+    regressed = []
+    print(f"{'benchmark':32} {'now':>12} {'baseline':>12} {'change':>8}")
+    for name, sec in sorted(results.items()):
+        old = base.get(name, {}).get("seconds")
+        if old:
+            change = (sec / old - 1.0) * 100.0
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSED"
+                regressed.append(name)
+            print(f"{name:32} {sec * 1e6:10.2f}us {old * 1e6:10.2f}us {change:+7.1f}%{flag}")
+        else:
+            print(f"{name:32} {sec * 1e6:10.2f}us {'(new)':>12}")
+    return regressed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown in percent (default %(default)s)")
+    parser.add_argument("--update", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--only", nargs="*", default=[], help="run benchmarks whose name starts with these")
+    parser.add_argument("--require-display", action="store_true",
+                        help="fail instead of skipping Tk benchmarks when no display is available")
+    args = parser.parse_args(argv)
+
+    # a benchmark group runs if any --only prefix could match one of its results
+    selected = [b for b in BENCHMARKS
+                if not args.only or any(o.startswith(b[0]) or b[0].startswith(o) for o in args.only)]
+    xvfb = None
+    display_ok = True
+    if any(needs for _, _, needs in selected):
+        try:
+            xvfb = ensure_display()
+        except RuntimeError as e:
+            display_ok = False
+            print(f"Tk benchmarks skipped: {e}")
+            if args.require_display:
+                return 2
+
+    results = {}
+    try:
+        for _, func, needs_display in selected:
+            if needs_display and not display_ok:
+                continue
+            for name, sec in func().items():
+                if not args.only or any(name.startswith(o) for o in args.only):
+                    results[name] = sec
+    finally:
+        if xvfb is not None:
+            xvfb.terminate()
+            xvfb.wait()
+
+    baseline = load_baseline(args.baseline)
+    regressed = compare(results, baseline, args.tolerance)
+    if args.update or baseline is None:
+        if baseline is not None:
+            # keep baseline entries for benchmarks that were not run this time
+            merged = {n: v["seconds"] for n, v in baseline.get("results", {}).items()}
+            merged.update(results)
+            results = merged
+        save_baseline(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if regressed:
+        print(f"{len(regressed)} benchmark(s) more than {args.tolerance:g}% slower than baseline: {', '.join(regressed)}")
+        return 1
+    print(f"All benchmarks within {args.tolerance:g}% of baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
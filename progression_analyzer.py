@@ -0,0 +1,324 @@
+"""Monte Carlo pacing analyzer for Coin Flipper: simulate many player sessions on all cores.
+
+    python progression_analyzer.py --sessions 1000000 --out runs/pacing
+    python progression_analyzer.py --out runs/pacing          # resume / re-report a run
+    python progression_analyzer.py --sessions 200000 --out runs/fast --frame-delay 30
+
+Every simulated player flips nonstop, rebirths as soon as the rebirth gate opens, buys
+the Inventory as soon as it is affordable and sells every item the moment it drops.
+A flip lasts anim_steps frames of the effective frame delay at the current rebirth
+count (CoinFlipGame.effective_frame_delay, what the window's _get_effective_frame_delay
+uses) plus --think-ms.
+
+Sessions are not stepped flip by flip. The flips a rebirth cycle takes (the flip
+milestones plus the first heads streak long enough for the streak achievement) follow
+a distribution computed exactly once from the achievement rules and sampled by inverse
+CDF; drops are geometric gaps. Each chunk of sessions then advances event by event
+(cycle end, drop) as numpy arrays, so the rebirth count, and with it the flip speed,
+is constant between events and the times are exact. Tab-visit achievements are
+assumed to be earned on the first flip of a cycle.
+
+Chunks run in a process pool and each finished chunk is written to the output
+directory as its own .npz file (float32 columns), so an interrupted run resumes
+where it stopped and the report can be rebuilt from disk at any time.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from CoinFlipping import CoinFlipGame, INVENTORY_COST, _load_numpy
+
+np = _load_numpy()
+
+# sessions per chunk (one task for the pool, one file on disk)
+CHUNK = 50_000
+# the window's defaults (CoinFlipApp.base_frame_delay / anim_steps_default)
+BASE_FRAME_DELAY = 50
+ANIM_STEPS = 24
+# cumulative probability at which the cycle-length distribution is cut off
+TAIL = 1e-12
+# the loot item the *_first_cube metrics follow
+CUBE_ITEM = "Rebirth cube"
+# rebirth-gate achievement kinds cycle_length_cdf models (tabs: earned on a cycle's first flip)
+GATE_KINDS = ("flips", "heads_streak", "tabs")
+
+
+def cycle_length_cdf(game):
+    """CDF of the flips one rebirth cycle takes: max(flip goal, first long-enough streak).
+
+    Returns (cdf, minimum): cdf[x] = P(cycle <= x). Raises ValueError for gate rules
+    of a kind it can't model (anything but GATE_KINDS).
+    """
+    gate = [game.registry.rules[name] for name in game.registry.rebirth_gate]
+    unsupported = sorted({r.kind for r in gate} - set(GATE_KINDS))
+    if unsupported:
+        raise ValueError(f"can't model rebirth-gate achievements of kind: {', '.join(unsupported)}")
+    flips_goal = max([r.target for r in gate if r.kind == "flips"], default=0)
+    streak_goal = max([r.target for r in gate if r.kind == "heads_streak"], default=0)
+    if streak_goal <= 0:
+        cdf = np.ones(1)
+    else:
+        # first time a run of streak_goal heads completes: walk the streak-length chain
+        state = np.zeros(streak_goal)
+        state[0] = 1.0
+        done = [0.0]
+        total = 0.0
+        while total < 1.0 - TAIL and len(done) < (1 << 24):
+            finished = 0.5 * state[-1]
+            restart = 0.5 * state.sum()
+            state[1:] = 0.5 * state[:-1]
+            state[0] = restart
+            total += finished
+            done.append(total)
+        cdf = np.array(done)
+    return cdf, max(flips_goal, 1)
+
+
+def flip_ms_table(game, base_frame_delay, anim_steps, think_ms, size=128):
+    """Milliseconds per flip at rebirth counts 0..size-1 (counts above use the last)."""
+    saved = game.rebirth_count
+    table = []
+    for count in range(size):
+        game.rebirth_count = count
+        table.append(anim_steps * game.effective_frame_delay(base_frame_delay) + think_ms)
+    game.rebirth_count = saved
+    return np.array(table, dtype=np.float64)
+
+
+def metric_names(rebirths):
+    return (["time_to_shop", "time_to_inventory", "flips_to_first_cube", "time_to_first_cube"]
+            + [f"time_to_rebirth_{n}" for n in rebirths])
+
+
+def simulate_chunk(params, index):
+    """Simulate one chunk of sessions; returns {metric: float32 array} (NaN = not reached)."""
+    rng = np.random.default_rng([params["seed"], index])
+    n = params["chunk"]
+    game = CoinFlipGame(seed=0)
+    loot = game.loot
+    cdf, cycle_min = cycle_length_cdf(game)
+    flip_ms = flip_ms_table(game, params["frame_delay"], params["anim_steps"], params["think_ms"])
+    top = len(flip_ms) - 1
+    cap_ms = params["max_hours"] * 3600_000.0
+    # loot: cumulative weights in unlock order, to pick an item inside the unlocked prefix
+    items = sorted(loot.items, key=lambda item: item.min_rebirths)
+    unlock_at = np.array([item.min_rebirths for item in items])
+    cum_weight = np.cumsum([item.weight for item in items])
+    values = np.array([item.value for item in items], dtype=np.int64)
+    # position of CUBE_ITEM among them (-1: not in the table, never found)
+    cube = next((j for j, item in enumerate(items) if item.name == CUBE_ITEM), -1)
+    chance = loot.drop_chance
+
+    def cycles(size):
+        return np.maximum(np.searchsorted(cdf, rng.random(size)), cycle_min)
+
+    count = np.zeros(n, dtype=np.int64)
+    t = np.zeros(n)
+    flips = np.zeros(n, dtype=np.int64)
+    owned = np.zeros(n, dtype=bool)
+    bought_at = np.zeros(n, dtype=np.int64)
+    left = cycles(n)
+    gap = np.zeros(n, dtype=np.int64)
+    out = {name: np.full(n, np.nan) for name in metric_names(params["rebirths"])}
+    shop, inventory = out["time_to_shop"], out["time_to_inventory"]
+    cube_flips, cube_time = out["flips_to_first_cube"], out["time_to_first_cube"]
+    rebirth_goals = [(goal, out[f"time_to_rebirth_{goal}"]) for goal in params["rebirths"]]
+
+    active = np.arange(n)
+    while active.size:
+        i = active
+        has = owned[i]
+        # flips until the next event; the count (and so the flip speed) is fixed until then
+        step = np.where(has, np.minimum(left[i], gap[i]), left[i])
+        t[i] += step * flip_ms[np.minimum(count[i], top)]
+        flips[i] += step
+        left[i] -= step
+        gap[i] -= np.where(has, step, 0)
+
+        dropped = i[has & (gap[i] == 0)]
+        if dropped.size:
+            # the drop is sold right away: pick an item among those unlocked
+            k = np.searchsorted(unlock_at, count[dropped], side="right")
+            found = dropped[k > 0]
+            k = k[k > 0]
+            if found.size:
+                pick = np.searchsorted(cum_weight, rng.random(found.size) * cum_weight[k - 1], side="right")
+                pick = np.minimum(pick, k - 1)
+                count[found] += values[pick]
+                cubes = found[pick == cube]
+                first = cubes[np.isnan(cube_flips[cubes])]
+                cube_flips[first] = flips[first] - bought_at[first]
+                cube_time[first] = t[first]
+            gap[dropped] = rng.geometric(chance, dropped.size)
+
+        ended = i[left[i] == 0]
+        if ended.size:
+            # gate open: rebirth and start the next cycle
+            count[ended] += 1
+            left[ended] = cycles(ended.size)
+
+        reached = i[np.isnan(shop[i]) & (count[i] >= 1)]
+        shop[reached] = t[reached]
+        for goal, times in rebirth_goals:
+            reached = i[np.isnan(times[i]) & (count[i] >= goal)]
+            times[reached] = t[reached]
+
+        buy = i[~owned[i] & (count[i] >= INVENTORY_COST)]
+        if buy.size:
+            count[buy] -= INVENTORY_COST
+            owned[buy] = True
+            bought_at[buy] = flips[buy]
+            inventory[buy] = t[buy]
+            gap[buy] = rng.geometric(chance, buy.size)
+
+        # a session is finished once every milestone is reached (or it ran out of time)
+        pending = np.zeros(i.size, dtype=bool)
+        for times in out.values():
+            pending |= np.isnan(times[i])
+        active = i[pending & (t[i] < cap_ms)]
+
+    # times in seconds; float32 keeps the files compact
+    return {name: (col / 1000.0 if name.startswith("time") else col).astype(np.float32)
+            for name, col in out.items()}
+
+
+# ---- on-disk run: run.json (parameters) plus one chunk_NNNNNN.npz per finished chunk ----
+
+def chunk_path(out_dir, index):
+    return os.path.join(out_dir, f"chunk_{index:06d}.npz")
+
+
+def write_chunk(out_dir, index, columns):
+    tmp = chunk_path(out_dir, index) + ".tmp"
+    with open(tmp, "wb") as f:
+        np.savez(f, **columns)
+    os.replace(tmp, chunk_path(out_dir, index))
+
+
+def open_run(out_dir, params, fresh=False):
+    """Create the run directory or check it belongs to the same parameters."""
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = os.path.join(out_dir, "run.json")
+    if os.path.exists(manifest) and not fresh:
+        with open(manifest, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+        if params.get("sessions") is None:
+            return saved
+        if saved != params:
+            raise SystemExit(f"{out_dir} holds a run with other parameters; use another --out or --fresh")
+        return saved
+    if params.get("sessions") is None:
+        raise SystemExit("--sessions is required to start a new run")
+    for name in os.listdir(out_dir):
+        if name.startswith("chunk_") and name.endswith(".npz"):
+            os.remove(os.path.join(out_dir, name))
+    with open(manifest, "w", encoding="utf-8") as f:
+        json.dump(params, f, indent=2)
+    return params
+
+
+def load_results(out_dir, params):
+    columns = {name: [] for name in metric_names(params["rebirths"])}
+    for index in range(chunk_total(params)):
+        path = chunk_path(out_dir, index)
+        if os.path.exists(path):
+            with np.load(path) as data:
+                for name in columns:
+                    columns[name].append(data[name])
+    return {name: np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+            for name, parts in columns.items()}
+
+
+def chunk_total(params):
+    return math.ceil(params["sessions"] / params["chunk"])
+
+
+# ---- report ----
+
+def format_value(name, value):
+    if not name.startswith("time"):
+        return f"{value:,.0f}"
+    for unit, size in (("h", 3600.0), ("min", 60.0)):
+        if value >= size:
+            return f"{value / size:.2f} {unit}"
+    return f"{value:.1f} s"
+
+
+def histogram(values, bins=12, width=40):
+    """Text histogram on log-spaced bins."""
+    lo, hi = float(values.min()), float(values.max())
+    if lo <= 0 or hi <= lo:
+        edges = np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+    else:
+        edges = np.geomspace(lo, hi, bins + 1)
+    counts, edges = np.histogram(values, bins=edges)
+    peak = counts.max() or 1
+    return [(edges[k], edges[k + 1], counts[k], "#" * int(round(width * counts[k] / peak))) for k in range(bins)]
+
+
+def report(results, bins):
+    total = max((len(col) for col in results.values()), default=0)
+    print(f"{total:,} sessions")
+    for name, col in results.items():
+        done = col[~np.isnan(col)]
+        print()
+        print(f"{name}: reached in {len(done):,} of {len(col):,} sessions")
+        if not len(done):
+            continue
+        p50, p90, p99 = np.percentile(done, [50, 90, 99])
+        print(f"  mean {format_value(name, done.mean())}  p50 {format_value(name, p50)}  "
+              f"p90 {format_value(name, p90)}  p99 {format_value(name, p99)}  max {format_value(name, done.max())}")
+        for lo, hi, cnt, bar in histogram(done.astype(np.float64), bins):
+            print(f"  {format_value(name, lo):>12} - {format_value(name, hi):<12} {cnt:>10,} {bar}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="run directory (created, or resumed if it exists)")
+    parser.add_argument("--sessions", type=int, help="number of player sessions (new runs)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="sessions per chunk/file")
+    parser.add_argument("--rebirths", type=int, nargs="+", default=[1, 5, 10, 25, 100],
+                        help="report time until the rebirth count first reaches each of these")
+    parser.add_argument("--frame-delay", type=int, default=BASE_FRAME_DELAY, help="base ms per frame")
+    parser.add_argument("--anim-steps", type=int, default=ANIM_STEPS, help="frames per flip")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="player time between flips")
+    parser.add_argument("--max-hours", type=float, default=1000.0, help="stop a session after this long")
+    parser.add_argument("--bins", type=int, default=12, help="histogram bins")
+    parser.add_argument("--fresh", action="store_true", help="discard an existing run in --out")
+    args = parser.parse_args(argv)
+
+    if np is None:
+        print("numpy is not installed; the analyzer needs it.")
+        return 1
+
+    params = {
+        "sessions": args.sessions, "seed": args.seed, "chunk": args.chunk,
+        "rebirths": sorted(set(args.rebirths)), "frame_delay": args.frame_delay,
+        "anim_steps": args.anim_steps, "think_ms": args.think_ms, "max_hours": args.max_hours,
+    }
+    params = open_run(args.out, params, args.fresh)
+    todo = [k for k in range(chunk_total(params)) if not os.path.exists(chunk_path(args.out, k))]
+    if todo:
+        print(f"simulating {len(todo)} of {chunk_total(params)} chunks on {args.workers} workers")
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            futures = {pool.submit(simulate_chunk, params, k): k for k in todo}
+            for done, future in enumerate(as_completed(futures), 1):
+                write_chunk(args.out, futures[future], future.result())
+                print(f"\r  {done}/{len(todo)} chunks", end="", flush=True)
+        print(f"\r  {len(todo)} chunks in {time.perf_counter() - start:.1f} s")
+    results = load_results(args.out, params)
+    # the last chunk may hold more sessions than asked for
+    results = {name: col[:params["sessions"]] for name, col in results.items()}
+    report(results, args.bins)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
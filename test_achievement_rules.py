@@ -0,0 +1,68 @@
+import random
+import time
+from CoinFlipping import AchievementRegistry, AchievementRule, CoinFlipGame, DEFAULT_ACHIEVEMENTS
+
+# hundreds of rules of every kind on top of the built-in ones
+rules = list(DEFAULT_ACHIEVEMENTS)
+rules += [AchievementRule(f"Flip {n}", "flips", n) for n in range(10, 5000, 10)]
+rules += [AchievementRule(f"Streak {n}", "heads_streak", n) for n in range(2, 20)]
+rules += [AchievementRule(f"Rebirth {n}", "rebirths", n, permanent=True) for n in (1, 5, 25, 100)]
+rules += [AchievementRule("Shopper", "tabs", ("Shop", "Inventory"))]
+registry = AchievementRegistry(rules)
+print('Rules:', len(registry.rules))
+
+# a counter jump of any size awards every crossed milestone
+game = CoinFlipGame(registry=registry)
+game.simulate(1234)
+earned = [n for n, e in game.achievements.items() if e and n.startswith('Flip ')]
+print('Flip milestones after jumping to 1234 flips:', len(earned))
+assert len(earned) == 123
+
+# rebirth gate is O(1) and ignores permanent achievements
+assert not game.all_achievements_earned()
+for name in registry.rebirth_gate:
+    game.award_achievement(name)
+assert game.all_achievements_earned()
+awarded = game.rebirth()
+print('Awarded by the first rebirth:', awarded)
+assert awarded == ['Rebirth 1'] and not game.all_achievements_earned()
+game.add_item('Rebirth cube', 10)
+_, awarded = game.sell_item('Rebirth cube', 10)
+print('Awarded by selling 10 cubes:', awarded)
+assert awarded == ['Rebirth 5', 'Rebirth 25'] and game.achievements['Rebirth 1']
+
+# rebirths rules are permanent by default, so they never block the rebirth they count
+rule = AchievementRule("First rebirth", "rebirths", 1)
+assert rule.permanent
+gated = CoinFlipGame(rng=random.Random(4), registry=AchievementRegistry(list(DEFAULT_ACHIEVEMENTS) + [rule]))
+gated.simulate(5000)
+for name in gated.registry.rebirth_gate:
+    gated.award_achievement(name)
+assert "First rebirth" not in gated.registry.rebirth_gate and gated.all_achievements_earned()
+assert gated.rebirth() == ["First rebirth"]
+try:
+    AchievementRule("Lost rebirth", "rebirths", 2, permanent=False)
+except ValueError:
+    pass
+else:
+    raise AssertionError("non-permanent rebirths rule accepted")
+
+# tab rules
+assert game.visit_tab('Shop') == [] and game.visit_tab('Inventory') == ['Shopper']
+
+# streak rules: per-flip and simulate() land in the same state with the same rng
+a = CoinFlipGame(rng=random.Random(11), registry=registry)
+b = CoinFlipGame(rng=random.Random(11), registry=registry)
+b.consec_heads = a.consec_heads = 3
+a.simulate(20000)
+for _ in range(20000):
+    b.flip()
+assert a.achievements == b.achievements and a.consec_heads == b.consec_heads
+print('Streak achievements earned:', sorted(n for n, e in a.achievements.items() if e and 'Streak' in n))
+
+# per-flip cost stays flat with hundreds of rules
+game = CoinFlipGame(rng=random.Random(2), registry=registry)
+start = time.perf_counter()
+for _ in range(100000):
+    game.flip()
+print(f'Per-flip cost with {len(registry.rules)} rules: {(time.perf_counter() - start) * 10:.2f} us')
@@ -0,0 +1,48 @@
+import json
+import time
+from CoinFlipping import CoinFlipGame, format_count, pack_count, unpack_count
+
+# the log-space delay is the same as dividing by 2^rebirth_count
+game = CoinFlipGame(seed=1)
+for base in range(0, 130):
+    for n in range(0, 40):
+        game.rebirth_count = n
+        expected = max(5, int(base / (2 ** n))) if n > 0 else max(5, base)
+        assert game.effective_frame_delay(base) == expected, (base, n)
+
+# a multi-megabit rebirth count costs nothing on the flip path
+game.rebirth_count = 1 << 4_000_000
+start = time.perf_counter()
+for _ in range(20_000):
+    game.effective_frame_delay(50)
+    game.flip()
+elapsed = time.perf_counter() - start
+print(f'20,000 flips at a 4,000,000-bit rebirth count: {elapsed * 1000:.1f} ms')
+assert game.effective_frame_delay(50) == 5
+assert elapsed < 1.0
+
+# labels: plain numbers while small, scientific notation (without str()) when huge
+print('Labels:', format_count(123), format_count(10 ** 15), format_count(1 << 4_000_000))
+assert format_count(123) == '123'
+assert format_count(999_999_999_999_999) == '999999999999999'
+assert format_count(10 ** 15) == '1.000e15'
+assert format_count(-(10 ** 20) * 25) == '-2.500e21'
+start = time.perf_counter()
+text = format_count(game.rebirth_count)
+assert time.perf_counter() - start < 0.01
+assert text.endswith('e1204119'), text
+
+# save data round-trips huge values and saving again reuses the packed form
+state = game.to_save()
+assert state['rebirth_count'] is game.to_save()['rebirth_count']
+restored = CoinFlipGame(seed=1)
+restored.load_save(json.loads(json.dumps(state)))
+assert restored.rebirth_count == game.rebirth_count
+assert unpack_count(pack_count(7)) == 7 and pack_count(7) == 7
+
+# selling a huge stack adds rebirths without ever building 2^count
+seller = CoinFlipGame(seed=2)
+seller.add_item('Rebirth cube', 10 ** 30)
+gained, _ = seller.sell_item('Rebirth cube', 10 ** 30)
+assert gained == 5 * 10 ** 30 and seller.rebirth_count == gained
+assert seller.effective_frame_delay(50) == 5
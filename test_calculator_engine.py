@@ -0,0 +1,78 @@
+import importlib.util
+import os
+import random
+
+# the calculator script has spaces in its name; load it by path (no window is opened)
+spec = importlib.util.spec_from_file_location(
+    "calculator", os.path.join(os.path.dirname(os.path.abspath(__file__)), "Calculator 2.3.7.py"))
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+
+# same values and types as eval, including precedence of unary minus and **
+for expr, value in [("1+2*3", 7), ("7/2", 3.5), ("7//2", 3), ("-2**2", -4), ("2**-1", 0.5),
+                    ("2**3**2", 512), ("3*-2", -6), ("--3", 3), ("1.5+.5", 2.0), ("4.", 4.0),
+                    ("10-2-3", 5), ("2**100", 2 ** 100)]:
+    result = calc.evaluate_expression(expr)
+    assert result == value and type(result) is type(value), (expr, result)
+
+# anything eval would reject (or that isn't keypad input) is an ExpressionError
+for expr in ["", "1+", "*2", "1..2", "1.2.3", "2***3", "(1+2)", "__import__('os')", "1e5", "x",
+             "\u0661\u0662", "\uff11\uff12+1"]:
+    try:
+        calc.evaluate_expression(expr)
+    except calc.ExpressionError:
+        pass
+    else:
+        raise AssertionError(expr)
+try:
+    calc.evaluate_expression("1/0")
+except ZeroDivisionError:
+    pass
+
+# random keypad input agrees with eval
+rng = random.Random(7)
+for _ in range(5000):
+    expr = str(rng.randint(0, 99))
+    for _ in range(rng.randint(0, 5)):
+        expr += rng.choice(["+", "-", "*", "/", "//", "*-"]) + rng.choice([str(rng.randint(1, 99)), "2.5", ".5"])
+    assert calc.evaluate_expression(expr) == eval(expr, {"__builtins__": None}, {}), expr
+
+# long runs of one precedence level compile into a loop; they agree with eval too
+for _ in range(500):
+    expr = str(rng.randint(0, 99))
+    for _ in range(rng.randint(calc.CHAIN_LOOP_MIN, 40)):
+        expr += rng.choice(["+", "-", "*", "/", "//", "*-"]) + rng.choice([str(rng.randint(1, 99)), "2.5", ".5"])
+    assert calc.evaluate_expression(expr) == eval(expr, {"__builtins__": None}, {}), expr
+
+# and don't recurse once per term (eval itself gives up on these)
+assert calc.evaluate_expression("+".join(["1"] * 1000)) == 1000
+assert calc.evaluate_expression("-".join(["1"] * 5000)) == -4998
+assert calc.evaluate_expression("*".join(["2"] * 1000)) == 2 ** 1000
+assert calc.compile_function("+".join(["x"] * 1000))(0.5) == 500.0
+# same for runs of signs and of ** (right to left, signs after ** included)
+assert calc.evaluate_expression("-" * 1200 + "1") == 1
+assert calc.evaluate_expression("-" * 1201 + "2.5") == -2.5
+assert calc.evaluate_expression("1**" * 2000 + "1") == 1
+assert calc.evaluate_expression("2**-" + "1**-" * 2000 + "1") == 0.5
+assert calc.evaluate_to_text("-" * 5000 + "1" + "**1" * 5000) == ("ok", "1")
+assert calc.compile_function("-" * 1200 + "x")(3.0) == 3.0
+assert calc.evaluate_to_text("**".join(["9"] * 10)) == ("error", "Too large")
+for _ in range(500):
+    expr = rng.choice(["", "-", "--", "+-"]) + rng.choice(["1", "0.5", "0.9", "1.1", "1.5", "2"])
+    for _ in range(rng.randint(1, 12)):
+        expr += "**" + rng.choice(["", "-", "--", "+-"]) + rng.choice(["1", "0.5", "0.9", "1.1", "1.5", "2"])
+    assert calc.evaluate_expression(expr) == eval(expr, {"__builtins__": None}, {}), expr
+try:
+    calc.evaluate_expression("*".join(["99999"] * 300000))
+except calc.ResultTooLarge:
+    pass
+else:
+    raise AssertionError("huge product was computed")
+
+# compiled once per distinct text (whitespace ignored)
+calc._compile_normalized.cache_clear()
+calc.evaluate_expression("12+3")
+calc.evaluate_expression(" 12 + 3 ")
+info = calc._compile_normalized.cache_info()
+print('Cache:', info)
+assert info.hits == 1 and info.misses == 1
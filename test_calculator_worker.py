@@ -0,0 +1,78 @@
+import importlib.util
+import os
+import time
+
+# headless: the worker and the result formatting need no window
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(HERE, "Calculator 2.3.7.py"))
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+
+worker = calc.EvalWorker()
+print('worker started:', worker.alive)
+assert worker.alive
+
+# ordinary answers come back the same as in-process evaluation
+for expr in ("1+2*3", "12.5*8-3/4+1234-56*7.25", "2**100", "7//2", "-3**2"):
+    assert worker.result(expr) == ("ok", str(calc.evaluate_expression(expr))), expr
+assert worker.result("1/0") == ("error", "Error")
+assert worker.result("1+") == ("error", "Error")
+
+# 9**9**9 would have ~3e8 digits: refused by the size check, no time spent on it
+start = time.perf_counter()
+reply = worker.result("9**9**9")
+elapsed = time.perf_counter() - start
+print('9**9**9:', reply, f'in {elapsed * 1000:.1f} ms')
+assert reply == ("error", "Too large")
+assert elapsed < 1.0
+assert worker.result("2**999999999*2**999999999") == ("error", "Too large")
+assert worker.result("2**99999999") == ("error", "Too large")  # caught while compiling
+assert worker.result("2.0**99999999") == ("error", "Error")  # float overflow, no size check
+try:
+    calc.evaluate_expression("9**9**9")
+    raise AssertionError('9**9**9 should be refused')
+except calc.ResultTooLarge:
+    pass
+
+# big integers are shown as scientific notation + digit count, matching the exact value
+for n in (10 ** 1200, 2 ** 13000 - 1, -(7 ** 3000), 123456789 * 10 ** 1500):
+    text = calc.format_big_int(n)
+    digits = str(abs(n))
+    assert text.endswith(f"({len(digits):,} digits)"), (text, len(digits))
+    mantissa = float(text.split("e+")[0])
+    assert abs(abs(mantissa) - float(digits[0] + "." + digits[1:12])) < 1e-4, (text, digits[:12])
+    assert text.startswith("-") == (n < 0)
+# next to a power of ten: the count is exact even when the mantissa rounds up to 1.00000
+assert calc.format_big_int(99999999 * 10 ** 1200) == "1.00000e+1208 (1,208 digits)"
+assert calc.format_big_int(10 ** 1200 - 1) == "1.00000e+1200 (1,200 digits)"
+assert calc.format_big_int(10 ** 1200 + 1) == "1.00000e+1200 (1,201 digits)"
+assert calc.format_big_int(-(10 ** 5000 - 1)) == "-1.00000e+5000 (5,000 digits)"
+assert calc.format_result(2 ** 100) == str(2 ** 100)
+assert calc.format_result(1.5) == "1.5"
+big = worker.result("3**1000000")
+print('3**1000000:', big)
+assert big == ("ok", "1.79771e+477121 (477,122 digits)")
+
+# a slow expression (seconds of bignum division) is given up on at the timeout and
+# the worker replaced; the next expression is answered as usual
+slow = calc.EvalWorker(timeout=0.3)
+start = time.perf_counter()
+reply = slow.result("3**2600000//7**900000")
+elapsed = time.perf_counter() - start
+print('slow expression:', reply, f'after {elapsed:.2f} s, restarts: {slow.restarts}')
+assert reply == ("error", "Too slow")
+assert elapsed < 2.0
+assert slow.restarts == 1 and slow.alive
+assert slow.result("2+2") == ("ok", "4")
+
+# cancel drops a pending job straight away
+slow.submit("3**2600000//7**900000")
+assert slow.busy
+slow.cancel()
+assert not slow.busy and slow.alive and slow.restarts == 2
+assert slow.result("6*7") == ("ok", "42")
+
+slow.close()
+worker.close()
+assert not worker.alive
+print('worker tests passed')
@@ -0,0 +1,60 @@
+import random
+import time
+from CoinFlipping import CoinFlipGame, LootItem, LootTable, _binomial, _load_numpy
+
+# a few missed flips are played out exactly: same state as simulate(n)
+a = CoinFlipGame(seed=11)
+b = CoinFlipGame(seed=11)
+a.inventory_owned = b.inventory_owned = True
+a.catch_up(300)
+b.simulate(300)
+assert (a.flip_count, a.consec_heads, a.inventory_items) == (b.flip_count, b.consec_heads, b.inventory_items)
+
+# hours or centuries of flips cost the same
+_load_numpy()  # not the import
+timings = {}
+for n in (10 ** 5, 10 ** 9, 10 ** 15):
+    game = CoinFlipGame(seed=n)
+    game.inventory_owned = True
+    start = time.perf_counter()
+    summary = game.catch_up(n)
+    timings[n] = time.perf_counter() - start
+    assert game.flip_count == n and summary["heads"] + summary["tails"] == n
+    assert game.achievements["I Like Heads"] and game.achievements["100th Coin Flip"]
+print('Catch-up time (ms):', {n: round(t * 1000, 3) for n, t in timings.items()})
+assert max(timings.values()) < 0.05
+
+# the sampled results have the right averages
+n, rounds = 100_000, 400
+heads = drops = streak = 0
+for i in range(rounds):
+    game = CoinFlipGame(seed=i)
+    game.inventory_owned = True
+    summary = game.catch_up(n)
+    heads += summary["heads"]
+    drops += sum(summary["items"].values())
+    streak += game.consec_heads
+print('Mean heads share:', heads / (n * rounds), 'drops per flip:', drops / (n * rounds),
+      'mean final streak:', streak / rounds)
+assert abs(heads / (n * rounds) - 0.5) < 0.001
+assert abs(drops / (n * rounds) - 0.05) < 0.001
+assert 0.7 < streak / rounds < 1.3  # the heads after the last tails average 1
+
+# without numpy: bounded-time binomial draws and loot splits
+rng = random.Random(3)
+for n, p in ((50, 0.3), (10_000, 0.001), (10 ** 12, 0.05)):
+    mean = sum(_binomial(rng, n, p) for _ in range(2000)) / 2000
+    assert abs(mean - n * p) < 0.05 * n * p + 0.2, (n, p, mean)
+loot = LootTable([LootItem("A", 3, 1), LootItem("B", 1, 2)], 0.05)
+found = loot.split_binomial(10 ** 9, rng)
+print('Split without numpy:', found)
+assert sum(found.values()) == 10 ** 9 and abs(found["A"] / 10 ** 9 - 0.75) < 0.001
+
+# a catch-up is part of the recorded session and replays exactly
+game = CoinFlipGame(seed=5)
+log = game.start_session()
+game.flip()
+game.catch_up(123_456)
+game.flip()
+log.finish(game)
+assert not log.verify()
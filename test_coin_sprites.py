@@ -0,0 +1,56 @@
+import tkinter as tk
+from CoinFlipping import CoinFlipApp, CoinSprites, FrameClock
+
+root = tk.Tk()
+root.withdraw()  # keep the window hidden during the test
+
+# a rendered sprite: face color inside, outline at the edge, transparent corners
+sprites = CoinSprites(root)
+img = sprites.get((0, 0, 100, 100), "#E6B800", "#c68f00")
+print('Sprite size:', img.width(), img.height())
+assert (img.width(), img.height()) == (100, 100)
+assert img.get(50, 50) == (0xE6, 0xB8, 0x00)
+assert img.get(1, 50) == (0xc6, 0x8f, 0x00)
+assert img.transparency_get(0, 0)
+# same size and colors -> same image, no second render
+assert sprites.get((10, 10, 110, 110), "#E6B800", "#c68f00") is img
+assert sprites.rendered == 1
+
+# a flip drawn with sprites ends on the vector coin, with the sprite hidden
+app = CoinFlipApp(root)
+app.sprites_var.set(True)
+app._toggle_sprites()
+# turning sprites on renders every spin frame up front; the flip itself renders none
+prerendered = app.coin_sprites.rendered
+assert prerendered > 0
+app.frame_clock = FrameClock(clock=lambda: 0.0)
+app.start_flip()
+assert app.canvas.itemcget(app.coin_image, 'state') == 'normal'
+assert app.canvas.itemcget(app.oval, 'state') == 'hidden'
+while app.animating:
+    app._animate()
+print('Sprites cached after one flip:', len(app.coin_sprites), 'rendered:', app.coin_sprites.rendered)
+assert len(app.coin_sprites) < app.anim_steps
+assert app.coin_sprites.rendered == prerendered
+assert app.canvas.itemcget(app.coin_image, 'state') == 'hidden'
+assert app.canvas.itemcget(app.oval, 'state') == 'normal'
+
+# a new coin size drops the cache and renders the frames for that size right away
+app._reflow_layout()
+assert len(app.coin_sprites) > 0
+assert app.coin_sprites.rendered == prerendered + len(app.coin_sprites)
+
+# unused sprites are freed, and rendered again before the next flip's first frame
+app.start_flip()
+while app.animating:
+    app._animate()
+cached, rendered = len(app.coin_sprites), app.coin_sprites.rendered
+app._evict_sprites()
+assert len(app.coin_sprites) == 0
+app.start_flip()
+assert app.coin_sprites.rendered == rendered + cached
+while app.animating:
+    app._animate()
+assert app.coin_sprites.rendered == rendered + cached
+
+root.destroy()
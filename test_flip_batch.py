@@ -0,0 +1,67 @@
+import random
+from CoinFlipping import CoinFlipGame, _load_numpy
+
+np = _load_numpy()
+
+
+class ScriptedRng:
+    """Feeds begin_flip/finish_flip fixed draws so a flip's outcome and drop are known."""
+
+    def __init__(self, values):
+        self.values = iter(values)
+
+    def random(self):
+        return next(self.values)
+
+
+# random flips with long heads runs mixed in, split into uneven batches so streaks carry over
+src = random.Random(7)
+heads = []
+while len(heads) < 20000:
+    run = src.choice([0, 1, 2, 3, 4, 5, 9])
+    heads.extend([True] * run)
+    heads.append(False)
+heads = heads[:20000]
+drops = [src.random() < 0.05 for _ in heads]
+
+for owned in (False, True):
+    # per-flip path
+    draws = []
+    for h, d in zip(heads, drops):
+        draws.append(0.0 if h else 0.9)
+        if owned:
+            draws.append(0.0 if d else 0.9)
+    single = CoinFlipGame(rng=ScriptedRng(draws))
+    single.inventory_owned = owned
+    for _ in heads:
+        outcome, _ = single.begin_flip()
+        single.finish_flip(outcome)
+
+    # batch path over the same flips
+    batch = CoinFlipGame()
+    batch.inventory_owned = owned
+    cuts = [0, 1, 3, 4, 8, 500, 501, 7777, 12000, 19999, len(heads)]
+    for a, b in zip(cuts, cuts[1:]):
+        batch.apply_flip_batch(np.array(heads[a:b]), np.array(drops[a:b]))
+
+    same = ((single.flip_count, single.consec_heads, single.achievements, single.inventory_items) ==
+            (batch.flip_count, batch.consec_heads, batch.achievements, batch.inventory_items))
+    print(f'inventory_owned={owned}: batch matches per-flip path:', same)
+    assert same
+
+# "I Like Heads" fires on the 4th consecutive head, counting heads carried in from earlier flips
+game = CoinFlipGame()
+game.apply_flip_batch(np.array([True, True, True]))
+assert not game.achievements['I Like Heads']
+game.apply_flip_batch(np.array([True]))
+print('I Like Heads after 3 + 1 heads:', game.achievements['I Like Heads'])
+assert game.achievements['I Like Heads'] and game.consec_heads == 4
+
+# resolve_flips draws its own outcomes
+game = CoinFlipGame(rng=random.Random(3))
+game.inventory_owned = True
+summary = game.resolve_flips(3_000_000)
+print('resolve_flips summary:', summary)
+assert game.flip_count == 3_000_000
+assert summary['heads'] + summary['tails'] == 3_000_000
+assert game.inventory_items['Rebirth cube'] == summary['items']['Rebirth cube']
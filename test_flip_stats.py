@@ -0,0 +1,54 @@
+import random
+import sys
+import time
+from CoinFlipping import CoinFlipGame, FlipStats, _load_numpy
+
+np = _load_numpy()
+
+# small hand-checked sequence: H H T H H H T T
+stats = FlipStats(window=4, hist_max=3)
+for face in "HHTHHHTT":
+    stats.record("Heads" if face == "H" else "Tails", dropped=face == "T")
+print('Longest:', stats.longest, 'histogram:', stats.histogram())
+assert (stats.heads, stats.tails, stats.drops) == (5, 3, 3)
+assert stats.longest == {"Heads": 3, "Tails": 2}
+# finished runs 2, 1, 3 plus the run in progress (2)
+assert stats.histogram() == [(1, 1), (2, 2), (3, 1)]
+assert stats.rolling_heads_ratio() == 0.5  # H H T T
+assert stats.run_side == "Tails" and stats.run_len == 2
+
+# the same flips one at a time and as numpy batches end in the same statistics
+rng = random.Random(5)
+faces = [rng.random() < 0.5 for _ in range(20000)]
+one = FlipStats()
+for h in faces:
+    one.record("Heads" if h else "Tails")
+batched = FlipStats()
+batched.RUN_SLICE = 997  # batches are also cut into slices internally
+arr = np.array(faces, dtype=bool)
+for a, b in ((0, 1), (1, 700), (700, 701), (701, 5000), (5000, 20000)):
+    batched.add_batch(arr[a:b])
+for attr in ("heads", "tails", "longest", "hist", "run_side", "run_len", "_ring_heads", "_filled"):
+    assert getattr(one, attr) == getattr(batched, attr), attr
+assert one.rolling_heads_ratio() == batched.rolling_heads_ratio()
+
+# the game keeps them up to date whichever way flips are played
+game = CoinFlipGame(seed=3)
+game.inventory_owned = True
+for _ in range(1000):
+    game.flip()
+game.resolve_flips(50_000)
+game.simulate(500)
+s = game.stats
+print('Game stats: flips', s.flips, 'drops/1000', round(s.drops_per_1000(), 2),
+      'rolling heads', s.rolling_heads_ratio())
+assert s.flips == game.flip_count
+assert s.drops == sum(game.inventory_items.values())
+
+# memory stays bounded: twenty million flips later the buffers are the same size
+size = sys.getsizeof(s._ring) + sys.getsizeof(s.hist)
+start = time.perf_counter()
+game.resolve_flips(1_000_000_000 // 50)
+print(f'Bulk flips with stats: {time.perf_counter() - start:.2f} s')
+assert sys.getsizeof(s._ring) + sys.getsizeof(s.hist) == size
+assert s.flips == game.flip_count
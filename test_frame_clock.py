@@ -0,0 +1,39 @@
+from CoinFlipping import FrameClock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+clock = FakeClock()
+fc = FrameClock(clock=clock)
+
+# 24 frames at 5 ms: one 23 ms stall on frame 3 should drop frames, not stretch the flip
+fc.start(24, 5)
+frames = []
+while True:
+    frame = fc.tick()
+    frames.append(frame)
+    if frame >= 24:
+        break
+    clock.now += 0.023 if frame == 3 else 0.0
+    clock.now += fc.wait_ms() / 1000.0
+
+stats = fc.stats()
+print('Frames drawn:', frames)
+print('Stats:', stats)
+assert frames[-1] == 24
+assert stats['dropped'] > 0
+assert stats['drawn'] + stats['dropped'] == 25
+assert abs(stats['actual_ms'] - stats['planned_ms']) < 5.0
+
+# on time: nothing dropped, no jitter
+fc.start(10, 20)
+while fc.tick() < 10:
+    clock.now += fc.wait_ms() / 1000.0
+print('On-time stats:', fc.stats())
+assert fc.stats()['dropped'] == 0 and fc.stats()['jitter_max_ms'] == 0.0
@@ -1,6 +1,5 @@
 import tkinter as tk
-import random
-from CoinFlipping import CoinFlipApp
+from CoinFlipping import CoinFlipApp, CoinFlipGame
 
 root = tk.Tk()
 root.withdraw()
@@ -9,15 +8,17 @@ app = CoinFlipApp(root)
 # Ensure inventory is owned so flips can drop Rebirth cubes
 app.inventory_owned = True
 app.inventory_items = {}
+# seeded drop stream: the same seed finds the cube on the same flip every run
+app.game.reseed(2024)
 
 max_flips = 500
 found = False
 flips_needed = None
 
 for i in range(1, max_flips + 1):
-    # simulate the end-of-animation drop check used in _animate
-    if random.random() < 0.05:
-        app.inventory_items['Rebirth cube'] = app.inventory_items.get('Rebirth cube', 0) + 1
+    # a whole flip, including the end-of-animation drop roll used in _animate
+    app.game.flip()
+    if app.inventory_items.get('Rebirth cube', 0):
         found = True
         flips_needed = i
         break
@@ -30,4 +31,11 @@ if found:
 else:
     print("No Rebirth cube obtained in the simulation.")
 
+# replaying the seed reproduces the drop
+again = CoinFlipGame(seed=2024)
+again.inventory_owned = True
+for _ in range(flips_needed or max_flips):
+    again.flip()
+assert again.inventory_items == app.inventory_items
+
 root.destroy()
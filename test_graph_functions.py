@@ -0,0 +1,83 @@
+import importlib.util
+import math
+import os
+import time
+
+# headless: compiling and sampling y = f(x) needs no window
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(HERE, "Calculator 2.3.7.py"))
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+np = calc._load_numpy()
+
+# the function grammar: x, parentheses, functions, constants, implicit multiplication
+for expr, x, value in [("y = 2x + 1", 3.0, 7.0), ("2(x+1)**2", 1.0, 8.0), ("-x**2", 3.0, -9.0),
+                       ("3sin(x)", math.pi / 2, 3.0), ("sqrt(abs(x))", -16.0, 4.0),
+                       ("e**x", 1.0, math.e), ("log(exp(2))x", 5.0, 10.0), ("x//2", 7.0, 3.0)]:
+    scalar = calc.compile_function(expr, vectorized=False)(x)
+    assert abs(scalar - value) < 1e-9, (expr, scalar)
+    if np is not None:
+        arr = calc.compile_function(expr)(np.array([x, x]))
+        assert np.allclose(arr, value), (expr, arr)
+for expr in ["", "x+", "sin x", "foo(x)", "(x+1", "x)", "import",
+             "(" * 1200 + "x" + ")" * 1200, "sin(" * 1200 + "x" + ")" * 1200]:
+    try:
+        calc.compile_function(expr)
+    except calc.ExpressionError:
+        pass
+    else:
+        raise AssertionError(expr)
+# nesting up to the limit is fine (deeper is refused above, not a RecursionError)
+deep = calc.GRAPH_MAX_NESTING
+assert calc.compile_function("(" * deep + "x" + ")" * deep, vectorized=False)(2.0) == 2.0
+# the keypad grammar is unchanged: no x, names or parentheses there
+for expr in ["x", "2(3)", "sin(1)"]:
+    try:
+        calc.evaluate_expression(expr)
+        raise AssertionError(expr)
+    except calc.ExpressionError:
+        pass
+
+view = calc.Viewport(0, 100, 0, 100, 400, 400)
+samples = 400 * calc.CURVE_SAMPLES_PER_PX
+
+
+def pieces(expr, vectorized=True):
+    return calc.curve_segments(calc.compile_function(expr, vectorized), view, vectorized)
+
+
+# one polyline for a continuous function, with every sample on it
+segs = pieces("x**2/100")
+assert len(segs) == 1 and len(segs[0]) == 2 * samples
+assert segs[0][:2] == [0.0, 400.0] and segs[0][-2:] == [400.0, 0.0]
+# broken at poles and steps, not on steep stretches; nothing where it is undefined
+assert len(pieces("1/(x-50)")) == 2
+assert len(pieces("tan(x/10)*10+50")) == 4
+assert len(pieces("x//10*10")) == 10
+assert len(pieces("100/(x-50)**2")) == 1
+assert len(pieces("(x-50)**3")) == 1
+assert sum(len(s) for s in pieces("sqrt(x-50)")) == samples  # the right half only
+assert pieces("1//0") == [] and pieces("9**9**9+x") == []
+# numpy and the pure-Python fallback draw the same thing
+for expr in ["1/(x-33.3)+50", "tan(x/10)*10+50", "50+40sin(x/5)", "sqrt(x-50)*5", "3"]:
+    a, b = pieces(expr), pieces(expr, vectorized=False)
+    assert [len(s) for s in a] == [len(s) for s in b], expr
+    assert all(abs(p - q) < 1e-6 for sa, sb in zip(a, b) for p, q in zip(sa, sb)), expr
+
+# a curve is sampled again only when the viewport changes
+curve = calc.FunctionCurve("y = 50 + 40sin(x/5)", "#0000cc")
+first = curve.segments(view)
+assert curve.segments(view) is first and curve.computed == 1
+view.x_min, view.x_max = 50, 150
+moved = curve.segments(view)
+assert curve.computed == 2 and moved != first
+assert curve.segments(view) is moved and curve.computed == 2
+
+if np is not None:
+    start = time.perf_counter()
+    for _ in range(100):
+        calc.curve_segments(curve.func, view)
+    per_call = (time.perf_counter() - start) / 100
+    print(f'{samples} samples + polyline: {per_call * 1000:.2f} ms')
+    assert per_call < 0.016  # well inside a frame
+print('graph function tests passed')
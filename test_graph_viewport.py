@@ -0,0 +1,123 @@
+import importlib.util
+import os
+import time
+
+# headless: viewport math, the spatial index and level of detail need no window
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(HERE, "Calculator 2.3.7.py"))
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+np = calc._load_numpy()
+
+# zoom keeps the point under the mouse in place; pan moves the content with the mouse
+view = calc.Viewport(0, 100, 0, 100, 400, 400)
+before = view.to_world(100, 300)
+view.zoom(2.0, 100, 300)
+assert view.x_max - view.x_min == 50 and view.to_world(100, 300) == before
+view.pan(40, -20)  # content follows the mouse: 40 px right, 20 px up
+assert view.to_canvas(*before) == (140, 280)
+view.zoom(1e-30, 0, 0)  # clamped
+assert view.x_max - view.x_min <= calc.VIEW_MAX_SPAN * 1.000001
+view.zoom(1e30, 0, 0)
+assert view.x_max - view.x_min >= calc.VIEW_MIN_SPAN * 0.999999
+
+# grid spacing: a line every unit at 4 px per unit, never closer than GRID_MIN_PX
+assert calc.grid_step(4) == (1.0, 5)
+for scale in (0.0003, 0.08, 1, 3.9, 40, 400, 4e6):
+    minor, every = calc.grid_step(scale)
+    assert calc.GRID_MIN_PX <= minor * scale < calc.GRID_MIN_PX * 5, (scale, minor)
+    assert every in (2, 5)
+
+if np is None:
+    print('numpy not installed: index tests skipped')
+    raise SystemExit
+
+rng = np.random.default_rng(3)
+n = 2_000_000
+points = calc.PointStore()
+points.add_many(rng.normal(50, 20, n), rng.normal(50, 20, n))
+index = calc.PointIndex(points)
+start = time.perf_counter()
+index.rebuild()
+print(f'index of {n:,} points built in {time.perf_counter() - start:.2f} s')
+all_x, all_y = np.array(points.xs), np.array(points.ys)
+
+
+def visible(view, xs, ys):
+    px, py = view.to_canvas(xs, ys)
+    return (px >= -(calc.POINT_SIZE_PX - 1)) & (px < view.width) & (py >= -(calc.POINT_SIZE_PX - 1)) & (py < view.height)
+
+
+# queries find every visible point, without returning (much) more than the view's cells
+for factor, px, py in [(1, 200, 200), (8, 50, 350), (200, 390, 10), (0.05, 200, 200), (30, 0, 0)]:
+    view = calc.Viewport(0, 100, 0, 100, 400, 400)
+    view.zoom(factor, px, py)
+    view.pan(13, -7)
+    xs, ys = index.query(view)
+    want = visible(view, all_x, all_y).sum()
+    assert visible(view, xs, ys).sum() == want, factor
+    assert index.count(view) == len(xs)
+    assert len(xs) <= max(4 * want, 5000), (factor, len(xs), want)
+# off to one side: nothing to look at
+far = calc.Viewport(1e6, 1e6 + 100, 0, 100, 400, 400)
+assert index.count(far) == 0 and len(index.query(far)[0]) == 0
+
+# level of detail: dense views become density buckets holding every point in view
+raster = calc.PointRaster(400, 400, calc.render_grid(calc.Viewport(0, 100, 0, 100, 400, 400)))
+zoomed_out = calc.Viewport(-1000, 1000, -1000, 1000, 400, 400)
+assert calc.draw_points(raster, index, zoomed_out) == "density"
+assert index.levels[-1][2].sum() == n
+density = index.density(zoomed_out)
+px, py = zoomed_out.to_canvas(all_x[:10000], all_y[:10000])
+assert (density[py.astype(int), px.astype(int)] > 0).mean() > 0.99  # buckets sit where the points are
+zoomed_in = calc.Viewport(40, 45, 40, 45, 400, 400)
+raster.reset()
+assert calc.draw_points(raster, index, zoomed_in) == "points"
+
+# points added later are drawn from the tail until it is big enough to rebuild
+points.add(42.5, 42.5)
+assert index.n == n and len(index.tail()[0]) == 1
+raster.reset()
+calc.draw_points(raster, index, zoomed_in)
+px, py = zoomed_in.to_canvas(42.5, 42.5)
+i = (int(py) * 400 + int(px)) * 3
+assert tuple(raster.pixels[i:i + 3]) == calc.POINT_COLOR
+points.add_many(np.full(calc.INDEX_TAIL_MAX, 1.0), np.full(calc.INDEX_TAIL_MAX, 1.0))
+calc.draw_points(raster, index, zoomed_in)
+assert index.n == len(points) and len(index.tail()[0]) == 0
+
+# panning: one frame (grid, points or density, PPM for the image) at every zoom
+for factor in (0.05, 1, 4, 40):
+    view = calc.Viewport(0, 100, 0, 100, 400, 400)
+    view.zoom(factor, 200, 200)
+    frames = 20
+    start = time.perf_counter()
+    for _ in range(frames):
+        view.pan(9, 4)
+        raster.reset(calc.render_grid(view))
+        mode = calc.draw_points(raster, index, view)
+        raster.take_dirty()
+    frame = (time.perf_counter() - start) / frames
+    print(f'zoom x{factor}: {mode}, {frame * 1000:.1f} ms per frame')
+    assert frame < 0.05
+
+index.clear()
+assert index.count(zoomed_out) == 0 and len(index.tail()[0]) == len(points)
+
+# one far-off point doesn't stretch the cells of all the others
+points = calc.PointStore()
+points.add_many(rng.uniform(0, 100, 1_000_000), rng.uniform(0, 100, 1_000_000))
+points.add(1e9, 50.0)
+index = calc.PointIndex(points)
+index.rebuild()
+view = calc.Viewport(0, 100, 0, 100, 400, 400)
+raster.reset(calc.render_grid(view))
+assert calc.draw_points(raster, index, view) == "density"
+density = index.density(view)
+in_small_view = index.count(calc.Viewport(40, 41, 40, 41, 400, 400))
+print('With an outlier: densest bucket', density.max(), 'points in a 1x1 view', in_small_view)
+assert density.max() < 1000  # ~100 points per bucket, not all of them in one
+assert in_small_view < 1000
+far = calc.Viewport(1e9 - 50, 1e9 + 50, 0, 100, 400, 400)
+assert list(index.query(far)[0]) == [1e9]
+print('graph viewport tests passed')
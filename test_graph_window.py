@@ -0,0 +1,72 @@
+import importlib.util
+import os
+from types import SimpleNamespace
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(HERE, "Calculator 2.3.7.py"))
+calc_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc_module)
+
+calc = calc_module.Calculator()
+calc.withdraw()  # keep the windows hidden during the test
+win = calc._open_graph_window()
+graph = win._graph
+canvas = graph["canvas"]
+calc.update()
+
+# each function is one polyline per continuous piece, not one item per sample
+for expr in ("y = x", "50 + 40sin(x/5)", "1/(x-50) + 50"):
+    graph["fn_entry"].insert(0, expr)
+    graph["add_function"]()
+calc.update_idletasks()
+lines = canvas.find_withtag("curve")
+print('curve items:', len(lines), 'for', len(graph["curves"]), 'functions')
+assert len(graph["curves"]) == 3
+assert len(lines) == 1 + 1 + 2
+assert len(canvas.coords(lines[0])) == 2 * 400 * calc_module.CURVE_SAMPLES_PER_PX
+assert graph["fn_entry"].get() == ""
+
+# adding another function leaves the drawn ones (and their samples) alone
+graph["fn_entry"].insert(0, "x**2/100")
+graph["add_function"]()
+assert all(c.computed == 1 for c in graph["curves"])
+assert set(lines) <= set(canvas.find_withtag("curve"))
+
+# points go into the one raster image, not one canvas item each
+items = len(canvas.find_all())
+for i in range(50):
+    graph["click"](SimpleNamespace(x=4 * i + 1, y=200))
+graph["add_points"]([10.5, 20.5, 30.5], [40.5, 50.5, 60.5])
+assert len(graph["points"]) == 53
+assert len(canvas.find_all()) == items and len(canvas.find_withtag("raster")) == 1
+assert graph["raster"].dirty is None  # everything was copied to the PhotoImage
+red = graph["photo"].get(4 * 3 + 1, 200 + 1)
+assert tuple(int(v) for v in calc.tk.splitlist(red)) == calc_module.POINT_COLOR
+
+# wheel zoom and drag pan: a burst of them is drawn once, curves are re-sampled for the new view
+view = graph["view"]
+for _ in range(5):
+    graph["zoom"](1.25, 200, 200)
+graph["pan"](30, 10)
+assert graph["state"]["redraw"] is not None
+calc.update_idletasks()
+assert graph["state"]["redraw"] is None
+assert abs((view.x_max - view.x_min) - 100 / 1.25 ** 5) < 1e-9
+assert all(c.computed == 2 for c in graph["curves"][:3])
+graph["reset_view"]()
+calc.update_idletasks()
+assert view.key == (0, 100, 0, 100, 400, 400)
+
+# many points: drawn as density buckets, a click still adds just its square
+import numpy as np
+rng = np.random.default_rng(1)
+graph["add_points"](rng.uniform(0, 100, 300_000), rng.uniform(0, 100, 300_000))
+assert graph["state"]["mode"] == "density" and graph["index"].n == len(graph["points"])
+graph["click"](SimpleNamespace(x=101, y=101))
+assert graph["raster"].dirty is None and len(graph["index"].tail()[0]) == 1
+
+graph["clear"]()
+assert not canvas.find_withtag("curve") and not graph["curves"]
+assert len(graph["points"]) == 0 and graph["raster"].pixels == graph["raster"].background
+calc.destroy()
+print('graph window test passed')
@@ -9,8 +9,9 @@ app = CoinFlipApp(root)
 
 # Ensure inventory is owned and inventory tab is revealed so UI updates happen
 app.inventory_owned = True
-# reveal inventory tab (adds tab and builds UI) if not already
+# reveal inventory tab if not already; its UI is built when the tab is first selected
 app._reveal_inventory_tab()
+app.notebook.select(app.tab_inventory)
 root.update()
 
 print('Starting interactive popup test. This will open a visible window for a few seconds.')
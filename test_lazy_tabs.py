@@ -0,0 +1,46 @@
+import tkinter as tk
+from CoinFlipping import CoinFlipApp, STARTUP_BUDGET_MS
+
+root = tk.Tk()
+root.withdraw()  # keep the window hidden during the test
+profiles = []
+app = CoinFlipApp(root, on_first_frame=profiles.append)
+
+# only the Flip tab is built at startup
+print('Achievement labels before visiting:', len(app.ach_labels))
+assert not app.ach_labels
+assert not app.tab_settings.winfo_children()
+
+# an achievement earned before its tab is built still shows once it is
+app.award_achievement('1st Coin Flip')
+
+# selecting a tab builds it, once
+app.notebook.select(app.tab_achievements)
+root.update()
+print('Achievement labels after visiting:', len(app.ach_labels))
+assert set(app.ach_labels) == set(app.achievements)
+assert app.ach_labels['1st Coin Flip'].cget('text').startswith('✓')
+labels = dict(app.ach_labels)
+app.notebook.select(app.tab_settings)
+root.update()
+app.notebook.select(app.tab_achievements)
+root.update()
+assert app.ach_labels == labels
+assert app.tab_settings.winfo_children()
+
+# the shop is built on first select and its button follows ownership
+app.game.rebirth_count = 1
+app._reveal_shop_tab()
+assert app.buy_inventory_btn is None
+app.notebook.select(app.tab_shop)
+root.update()
+print('Buy button:', app.buy_inventory_btn.cget('text'))
+assert str(app.buy_inventory_btn.cget('state')) == 'normal'
+
+# startup profile is reported once the event loop runs
+root.update()
+print('Startup profile:', profiles[0] if profiles else app.startup_profile)
+assert profiles and 'first_frame_ms' in profiles[0]
+print('Under budget:', profiles[0]['first_frame_ms'] < STARTUP_BUDGET_MS)
+
+root.destroy()
@@ -0,0 +1,61 @@
+import random
+import time
+from CoinFlipping import CoinFlipGame, LootItem, LootTable, _load_numpy
+
+# hundreds of item types, some only unlocked after rebirths
+items = [LootItem(f'Item {i}', weight=1 + (i * 7) % 13, value=1 + i % 9, min_rebirths=i // 100) for i in range(300)]
+table = LootTable(items)
+print('Unlocked at 0 / 1 / 5 rebirths:', table.unlocked(0), table.unlocked(1), table.unlocked(5))
+assert (table.unlocked(0), table.unlocked(1), table.unlocked(5)) == (100, 200, 300)
+
+# the alias table gives every unlocked item exactly its share of the weight
+for k in (100, 200, 300):
+    names, prob, alias, _ = table._table(k)
+    total = sum(item.weight for item in table.items[:k])
+    share = [0.0] * k
+    for i in range(k):
+        share[i] += prob[i] / k
+        share[alias[i]] += (1.0 - prob[i]) / k
+    assert all(abs(share[i] - table.items[i].weight / total) < 1e-12 for i in range(k))
+
+# picks only ever return unlocked items, one draw each
+rng = random.Random(3)
+start = time.perf_counter()
+picks = [table.pick(rng.random, 1) for _ in range(200_000)]
+elapsed = time.perf_counter() - start
+print(f'Picks per second (200 items unlocked): {len(picks) / elapsed:,.0f}')
+unlocked = {item.name for item in table.items[:200]}
+assert set(picks) <= unlocked
+
+# a single unlocked item needs no draw, so the default table keeps old drop streams
+single = LootTable()
+assert single.pick(lambda: 1 / 0) == 'Rebirth cube'
+
+# multi-item drops: simulate(n) still ends exactly where n single flips do
+a = CoinFlipGame(seed=5, loot=table)
+b = CoinFlipGame(seed=5, loot=table)
+for g in (a, b):
+    g.inventory_owned = True
+    g.rebirth_count = 2
+a.simulate(20_000)
+for _ in range(20_000):
+    b.flip()
+print('Item kinds found:', len(a.inventory_items))
+assert a.inventory_items == b.inventory_items
+assert a.session_state() == b.session_state()
+
+# values for selling come from the table
+name, cnt = next(iter(a.inventory_items.items()))
+gained, _ = a.sell_item(name, cnt)
+assert gained == cnt * table.value(name)
+assert a.sell_item('Not in the table', 1) == (0, [])
+
+# bulk flips split their drops with one multinomial draw per chunk
+if _load_numpy() is not None:
+    g = CoinFlipGame(seed=8, loot=table)
+    g.inventory_owned = True
+    summary = g.resolve_flips(2_000_000)
+    found = sum(summary['items'].values())
+    print('Bulk drops:', found, 'across', len(summary['items']), 'items')
+    assert set(summary['items']) <= {item.name for item in table.items[:100]}
+    assert abs(found - 2_000_000 * table.drop_chance) < 2_000
@@ -0,0 +1,54 @@
+import tkinter as tk
+from CoinFlipping import CoinFlipApp, FrameClock
+
+root = tk.Tk()
+root.withdraw()  # keep the window hidden during the test
+app = CoinFlipApp(root)
+app.frame_clock = FrameClock(clock=lambda: 0.0)
+app.inventory_owned = True
+
+# nine coins on the canvas, the single coin hidden
+app.coins_var.set(9)
+app._apply_coin_count()
+print('Grid cells:', len(app._grid_cells))
+assert len(app._grid_cells) == 9
+assert app.canvas.itemcget(app.oval, 'state') == 'hidden'
+
+# one flip spins all nine on one loop and counts nine flips
+frames = 0
+app.start_flip()
+assert app.flip_count == 9 and app.animating
+while app.animating:
+    app._animate()
+    frames += 1
+print('Frames for 9 coins:', frames, 'faces:', app._grid_faces[:9])
+assert frames == app.anim_steps
+# every coin landed on its own outcome, and the heads streak counts the trailing heads
+faces = app._grid_faces[:9]
+for (oval, text), face in zip(app._grid_items, faces):
+    assert app.canvas.itemcget(text, 'text') == face
+trailing = len(faces) - len(''.join('H' if f == 'Heads' else 'T' for f in faces).rstrip('H'))
+assert app.consec_heads == trailing
+
+# a session of grid flips replays to the same state
+for _ in range(20):
+    app.start_flip()
+    while app.animating:
+        app._animate()
+app.session.finish(app.game)
+print('Replay mismatches:', app.session.verify())
+assert app.session.verify() == []
+
+# the grid follows the canvas size, and one coin brings the single coin back
+before = list(app._grid_cells)
+app.initial_width, app.initial_height = 520, 560
+app._reflow_layout()
+assert app._grid_cells != before and len(app._grid_cells) == 9
+app.coins_var.set(1)
+app._apply_coin_count()
+assert app.canvas.itemcget(app.oval, 'state') == 'normal'
+assert all(app.canvas.itemcget(o, 'state') == 'hidden' for o, t in app._grid_items)
+app.start_flip()
+assert app.flip_count == 190
+
+root.destroy()
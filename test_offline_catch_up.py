@@ -0,0 +1,48 @@
+import tempfile
+import time
+import tkinter as tk
+from CoinFlipping import CoinFlipApp
+
+with tempfile.TemporaryDirectory() as save_dir:
+    # play a little and close: the save records when it was last current
+    root = tk.Tk()
+    root.withdraw()  # keep the window hidden during the test
+    app = CoinFlipApp(root, save_dir=save_dir)
+    for _ in range(10):
+        app.game.flip()
+    app._on_close()
+
+    # pretend the game was closed for an hour
+    root = tk.Tk()
+    root.withdraw()
+    store_state = app.save_store.load()
+    app.save_store.record({"saved_at": store_state["saved_at"] - 3600})
+    app.save_store.close()
+    app = CoinFlipApp(root, save_dir=save_dir)
+    flip_ms = app.anim_steps_default * app._get_effective_frame_delay()
+    expected = 3600 * 1000 // flip_ms
+    print('Flips after an hour away:', app.flip_count, 'expected about', 10 + expected)
+    assert abs(app.flip_count - (10 + expected)) <= 2
+    # one summary popup for the whole catch-up
+    toasts = [key for key in list(app.toasts._active) + list(app.toasts._queue) if key[0] == "catch_up"]
+    print('Summary:', toasts[0][1] if toasts else None)
+    assert len(toasts) == 1
+
+    # minimizing counts as being away too
+    before = app.flip_count
+    app._on_unmap()
+    app._away_since -= 600
+    app._on_map()
+    assert app.flip_count - before >= 600 * 1000 // flip_ms - 1
+    app._on_close()
+
+    # closing while minimized saves when the window went away, not the close time
+    root = tk.Tk()
+    root.withdraw()
+    app = CoinFlipApp(root, save_dir=save_dir)
+    app._on_unmap()
+    app._away_since -= 600
+    away = int(app._away_since)
+    app._on_close()
+    print('Saved at while minimized:', app.save_store.load()["saved_at"], 'went away at', away)
+    assert app.save_store.load()["saved_at"] == away
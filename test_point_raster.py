@@ -0,0 +1,104 @@
+import importlib.util
+import os
+import tempfile
+import time
+
+# headless: the point store and pixel buffer need no window
+HERE = os.path.dirname(os.path.abspath(__file__))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(HERE, "Calculator 2.3.7.py"))
+calc = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calc)
+np = calc._load_numpy()
+
+view = calc.Viewport(0, 100, 0, 100, 400, 400)
+grid = calc.render_grid(view)
+assert len(grid) == 400 * 400 * 3
+
+
+def pixel(buf, x, y):
+    i = (y * 400 + x) * 3
+    return tuple(buf[i:i + 3])
+
+
+# grid lines every 4 px, darker every 20 px, white in between
+assert pixel(grid, 0, 1) == calc.GRID_MAJOR and pixel(grid, 4, 1) == calc.GRID_MINOR
+assert pixel(grid, 1, 20) == calc.GRID_MAJOR and pixel(grid, 2, 3) == calc.GRID_BG
+assert pixel(grid, 20, 4) == calc.GRID_MAJOR  # major lines stay unbroken at crossings
+
+raster = calc.PointRaster(400, 400, grid)
+x, y, data = raster.take_dirty()
+assert (x, y) == (0, 0) and data.startswith(b"P6\n400 400\n255\n") and len(data) == 15 + len(grid)
+assert raster.take_dirty() is None
+
+# one point: a 4x4 square, and only that square is sent to the image
+raster.plot(*view.to_canvas(10, 90))
+x, y, data = raster.take_dirty()
+assert (x, y) == (40, 40) and data == b"P6\n4 4\n255\n" + bytes(calc.POINT_COLOR) * 16
+assert pixel(raster.pixels, 43, 43) == calc.POINT_COLOR and pixel(raster.pixels, 44, 43) != calc.POINT_COLOR
+# clipped at the edges, ignored off the canvas
+raster.plot(398, -2)
+assert raster.take_dirty()[:2] == (398, 0)
+raster.plot(500, 10)
+assert raster.take_dirty() is None
+raster.plot(10, 10)
+raster.plot(30, 50)
+assert raster.dirty == (10, 10, 34, 54)  # one rectangle covering both
+raster.reset()
+assert raster.pixels == grid and raster.dirty == (0, 0, 400, 400)
+
+if np is not None:
+    # plot_many draws exactly what plotting one by one draws
+    rng = np.random.default_rng(5)
+    xs = rng.uniform(-5, 105, 2000)
+    ys = rng.uniform(-5, 105, 2000)
+    one_by_one = calc.PointRaster(400, 400, grid)
+    for px, py in zip(*view.to_canvas(xs, ys)):
+        one_by_one.plot(px, py)
+    bulk = calc.PointRaster(400, 400, grid)
+    bulk.plot_many(*view.to_canvas(xs, ys))
+    assert bulk.pixels == one_by_one.pixels
+
+    # a million points: store + draw in one pass, then clicks and clear stay cheap
+    n = 1_000_000
+    xs = rng.uniform(0, 100, n)
+    ys = rng.uniform(0, 100, n)
+    points = calc.PointStore()
+    start = time.perf_counter()
+    points.add_many(xs, ys)
+    raster.plot_many(*view.to_canvas(xs, ys))
+    raster.take_dirty()
+    load = time.perf_counter() - start
+    assert len(points) == n and points.xs[123] == xs[123]
+
+    clicks = 1000
+    start = time.perf_counter()
+    for i in range(clicks):
+        points.add(i % 100, i % 97)
+        raster.plot(*view.to_canvas(i % 100, i % 97))
+        raster.take_dirty()
+    click = (time.perf_counter() - start) / clicks
+
+    start = time.perf_counter()
+    points.clear()
+    raster.reset()
+    clear = time.perf_counter() - start
+    print(f'1M points: load {load * 1000:.0f} ms, click {click * 1e6:.1f} us, clear {clear * 1000:.2f} ms')
+    assert len(points) == 0 and raster.pixels == grid
+    assert click < 0.001  # far under a frame
+    assert clear < 0.005
+
+# the pure-Python path gives the same pixels
+store = calc.PointStore()
+store.add_many([1.5, 2.5], [3.5, 4.5])
+store.add(7, 8)
+assert list(store.xs) == [1.5, 2.5, 7.0] and list(store.ys) == [3.5, 4.5, 8.0]
+
+# points load from CSV, with or without a header line
+with tempfile.TemporaryDirectory() as tmp:
+    for text in ("x,y\n1,2\n3.5,4\n", "1,2\n3.5,4\n"):
+        path = os.path.join(tmp, "points.csv")
+        with open(path, "w") as f:
+            f.write(text)
+        xs, ys = calc.read_points_csv(path)
+        assert list(xs) == [1.0, 3.5] and list(ys) == [2.0, 4.0], text
+print('point raster tests passed')
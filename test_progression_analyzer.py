@@ -0,0 +1,58 @@
+import os
+import random
+import sys
+import tempfile
+from CoinFlipping import CoinFlipGame, CORE_TABS
+import progression_analyzer as pa
+
+if pa.np is None:
+    print('numpy is not installed; skipping the analyzer test.')
+    sys.exit(0)
+np = pa.np
+
+# the exact cycle-length distribution matches playing the real game
+game = CoinFlipGame(seed=0)
+cdf, cycle_min = pa.cycle_length_cdf(game)
+pmf = np.diff(np.concatenate([[0.0], cdf]))
+lengths = np.maximum(np.arange(len(cdf)), cycle_min)
+model_mean = float((pmf * lengths).sum())
+
+played = []
+g = CoinFlipGame(seed=3)
+for _ in range(3000):
+    for tab in CORE_TABS:
+        g.visit_tab(tab)
+    flips = 0
+    while not g.all_achievements_earned():
+        g.flip()
+        flips += 1
+    played.append(flips)
+    g.rebirth()
+print(f'Mean flips per rebirth: model {model_mean:.2f}, played {sum(played) / len(played):.2f}')
+assert abs(model_mean - sum(played) / len(played)) < 1.0
+assert min(played) == cycle_min
+
+# first rebirth can't come before the flip goal at full speed
+params = {'sessions': 20_000, 'seed': 4, 'chunk': 10_000, 'rebirths': [1, 5, 10],
+          'frame_delay': 50, 'anim_steps': 24, 'think_ms': 0.0, 'max_hours': 1000.0}
+cols = pa.simulate_chunk(params, 0)
+first_rebirth = cycle_min * 24 * 50 / 1000.0
+print('Shortest time to shop (s):', float(cols['time_to_shop'].min()))
+assert abs(float(cols['time_to_shop'].min()) - first_rebirth) < 1e-3
+assert np.allclose(cols['time_to_shop'], cols['time_to_rebirth_1'])
+assert (cols['time_to_first_cube'] >= cols['time_to_inventory']).all()
+assert abs(float(cols['flips_to_first_cube'].mean()) - 1 / game.loot.drop_chance) < 1.0
+
+# the same chunk index always gives the same sessions, so runs resume exactly
+again = pa.simulate_chunk(params, 0)
+assert all(np.array_equal(cols[k], again[k], equal_nan=True) for k in cols)
+
+with tempfile.TemporaryDirectory() as tmp:
+    pa.open_run(tmp, dict(params))
+    pa.write_chunk(tmp, 1, pa.simulate_chunk(params, 1))
+    assert sorted(os.listdir(tmp)) == ['chunk_000001.npz', 'run.json']
+    # reopening with the same parameters keeps finished chunks
+    pa.open_run(tmp, dict(params))
+    assert os.path.exists(pa.chunk_path(tmp, 1))
+    results = pa.load_results(tmp, params)
+    assert len(results['time_to_shop']) == 10_000
@@ -0,0 +1,33 @@
+import tkinter as tk
+from types import SimpleNamespace
+from CoinFlipping import CoinFlipApp
+
+root = tk.Tk()
+root.withdraw()  # keep the window hidden during the test
+app = CoinFlipApp(root)
+root.update()
+app.fullscreen_var.set(True)
+app._reflow_layout()
+stats = app.reflow_stats
+before = stats["reflows"]
+
+# child widgets re-fire the master's <Configure> binding; none of them reflows
+for widget in (app.canvas, app.notebook, app.flip_label):
+    app._on_window_configure(SimpleNamespace(widget=widget, width=10, height=10))
+assert stats["reflows"] == before and app._reflow_pending is None
+
+# a move (same size) is skipped, a burst of resizes runs one reflow on the next idle pass
+w, h = app._reflow_size
+app._on_window_configure(SimpleNamespace(widget=root, width=w, height=h))
+assert app._reflow_pending is None
+for i in range(20):
+    app._on_window_configure(SimpleNamespace(widget=root, width=w + i + 1, height=h))
+assert stats["reflows"] == before
+root.update_idletasks()
+print('Reflow stats:', stats)
+assert stats["coalesced"] == 19
+# the window never actually changed size, so the pending pass is skipped too
+assert stats["reflows"] == before
+assert stats["skipped"] == 5
+
+root.destroy()
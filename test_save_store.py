@@ -0,0 +1,55 @@
+import os
+import random
+import tempfile
+import time
+from CoinFlipping import CoinFlipGame, SaveStore, SNAPSHOT_EVERY
+
+save_dir = tempfile.mkdtemp(prefix='coinflip_save_')
+
+# play a bit and save after every flip, like the window does
+game = CoinFlipGame(rng=random.Random(5))
+game.inventory_owned = True
+store = SaveStore(save_dir)
+print('Fresh load:', store.load())
+start = time.perf_counter()
+for _ in range(2000):
+    game.flip()
+    store.record(game.to_save())
+print(f'2000 record() calls took {(time.perf_counter() - start) * 1000:.1f} ms on the caller thread')
+store.close()
+
+loaded = SaveStore(save_dir).load()
+print('Loaded flip_count:', loaded.get('flip_count'), 'items:', loaded.get('inventory_items'))
+assert loaded == game.to_save()
+
+# many separate sessions: compaction keeps the journal short
+for i in range(SNAPSHOT_EVERY + 10):
+    store = SaveStore(save_dir)
+    store.load()
+    store.record({'flip_count': i})
+    store.close()
+with open(os.path.join(save_dir, 'journal.jsonl'), 'rb') as f:
+    journal_lines = len(f.readlines())
+print('Journal entries after compaction:', journal_lines)
+assert journal_lines < SNAPSHOT_EVERY
+assert SaveStore(save_dir).load()['flip_count'] == SNAPSHOT_EVERY + 9
+
+# a torn final entry (crash mid-write) is ignored, and later saves still load
+with open(os.path.join(save_dir, 'journal.jsonl'), 'ab') as f:
+    f.write(b'{"seq":999999,"patch":{"flip_co')
+store = SaveStore(save_dir)
+assert store.load()['flip_count'] == SNAPSHOT_EVERY + 9
+store.record({'rebirth_count': 7})
+store.close()
+restored = CoinFlipGame()
+restored.load_save(SaveStore(save_dir).load())
+print('After torn write + new save: rebirths =', restored.rebirth_count)
+assert restored.rebirth_count == 7
+
+# record() without load() first must not truncate the journal or reuse seq numbers
+store = SaveStore(save_dir)
+store.record({'coins': 123})
+store.close()
+reloaded = SaveStore(save_dir).load()
+print('Record without load: rebirths =', reloaded.get('rebirth_count'), 'coins =', reloaded.get('coins'))
+assert reloaded['rebirth_count'] == 7 and reloaded['coins'] == 123
@@ -0,0 +1,80 @@
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from CoinFlipping import CoinFlipGame, SessionLog
+
+# outcome and drop streams are independent: owning the Inventory (extra drop rolls)
+# does not change which faces come up
+a = CoinFlipGame(seed=42)
+b = CoinFlipGame(seed=42)
+b.inventory_owned = True
+faces_a = [a.flip() for _ in range(2000)]
+faces_b = [b.flip() for _ in range(2000)]
+print('Same outcomes with and without drop rolls:', faces_a == faces_b)
+assert faces_a == faces_b
+assert b.inventory_items.get('Rebirth cube', 0) > 0
+
+# a session mixing every kind of input, including flips interrupted mid-spin
+game = CoinFlipGame(seed=7)
+log = game.start_session()
+inputs = random.Random(1)
+for step in range(3000):
+    roll = inputs.random()
+    if roll < 0.7:
+        game.flip()
+    elif roll < 0.75:
+        outcome, _ = game.begin_flip()
+        game.sell_item('Rebirth cube', inputs.randint(1, 3))
+        game.visit_tab(inputs.choice(['Flip', 'Settings', 'Achievements', 'Shop']))
+        game.finish_flip(outcome)
+    elif roll < 0.8:
+        if game.all_achievements_earned():
+            game.rebirth()
+    elif roll < 0.83:
+        game.buy_inventory()
+    elif roll < 0.86:
+        game.add_rebirths(1)
+    elif roll < 0.88:
+        game.resolve_flips(inputs.randint(1, 5000))
+    elif roll < 0.9:
+        game.add_item('Rebirth cube', 2)
+    else:
+        game.visit_tab(inputs.choice(['Flip', 'Settings', 'Achievements']))
+log.finish(game)
+print('Events recorded:', len(log.events), 'final flips:', game.flip_count, 'rebirths:', game.rebirth_count)
+
+# round-trip through the compact file and replay headlessly
+with tempfile.TemporaryDirectory() as tmp:
+    path = os.path.join(tmp, 'session.json')
+    log.save(path)
+    print('Log size (bytes):', os.path.getsize(path))
+    loaded = SessionLog.load(path)
+replayed = loaded.replay()
+diff = loaded.verify(replayed)
+print('Replay matches:', not diff, diff)
+assert not diff
+assert replayed.session_state() == game.session_state()
+
+# a log whose final state was tampered with is caught
+loaded.final = dict(loaded.final, rebirth_count=loaded.final['rebirth_count'] + 1)
+assert loaded.verify() == ['rebirth_count']
+
+# several coins in flight at once (multi-coin flips): begins and lands interleave
+game = CoinFlipGame(seed=7)
+game.inventory_owned = True
+log = game.start_session()
+for _ in range(50):
+    outcomes = [game.begin_flip()[0] for _ in range(5)]
+    for outcome in outcomes:
+        game.finish_flip(outcome)
+game.flip()
+log.finish(game)
+print('Multi-coin replay matches:', not log.verify())
+assert not log.verify()
+
+# --replay without a file is a usage error, not a traceback
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "CoinFlipping.py")
+run = subprocess.run([sys.executable, script, "--replay"], capture_output=True, text=True)
+assert run.returncode == 2 and run.stderr.startswith("usage:"), run.stderr
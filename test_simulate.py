@@ -0,0 +1,36 @@
+import random
+import time
+from CoinFlipping import CoinFlipGame
+
+# headless: no tk.Tk() needed to play the game
+game = CoinFlipGame(rng=random.Random(1234))
+game.inventory_owned = True
+
+n = 1_000_000
+start = time.perf_counter()
+summary = game.simulate(n)
+elapsed = time.perf_counter() - start
+
+print('Simulated flips:', n)
+print('Heads / Tails:', summary['heads'], summary['tails'])
+print('Achievements earned:', summary['achievements'])
+print('Items found:', summary['items'])
+print(f'Flips per second: {n / elapsed:,.0f}')
+
+assert game.flip_count == n
+assert summary['heads'] + summary['tails'] == n
+assert game.achievements['100th Coin Flip']
+assert game.inventory_items.get('Rebirth cube', 0) == summary['items'].get('Rebirth cube', 0)
+
+# simulate(n) must end in the same state as n single flips with the same rng seed
+a = CoinFlipGame(rng=random.Random(99))
+b = CoinFlipGame(rng=random.Random(99))
+a.inventory_owned = b.inventory_owned = True
+a.simulate(5000)
+for _ in range(5000):
+    b.flip()
+print('simulate matches single flips:',
+      (a.flip_count, a.consec_heads, a.achievements, a.inventory_items) ==
+      (b.flip_count, b.consec_heads, b.achievements, b.inventory_items))
+assert (a.flip_count, a.consec_heads, a.achievements, a.inventory_items) == \
+       (b.flip_count, b.consec_heads, b.achievements, b.inventory_items)
@@ -0,0 +1,28 @@
+import tkinter as tk
+from CoinFlipping import CoinFlipApp
+
+root = tk.Tk()
+root.withdraw()  # keep the window hidden during the test
+app = CoinFlipApp(root)
+for _ in range(300):
+    app.game.flip()
+
+# nothing is painted (or scheduled) until the tab is visible
+assert not app.stats_labels and app._stats_job is None
+app.notebook.select(app.tab_stats)
+root.update()
+print('Flips shown:', app.stats_labels['flips'].cget('text'))
+assert app.stats_labels['flips'].cget('text') == '300'
+assert app._stats_job is not None
+
+# no repaint while the numbers are unchanged
+shown = app._stats_shown
+app._refresh_stats_ui()
+assert app._stats_shown == shown
+
+# leaving the tab stops the repaint loop
+app.notebook.select(app.tab_flip)
+root.update()
+assert app._stats_job is None
+
+root.destroy()
@@ -0,0 +1,58 @@
+import tkinter as tk
+from CoinFlipping import WindowMotion
+
+root = tk.Tk()
+root.geometry("200x150+100+100")
+root.update()
+extra = tk.Toplevel(root)
+extra.geometry("120x80+300+300")
+root.update()
+
+# the owner's own <Configure> handler, which must survive the motion stopping
+configured = []
+root.bind("<Configure>", lambda e: configured.append(e.widget), add="+")
+
+now = [0.0]
+motion = WindowMotion(root, clock=lambda: now[0])
+# the owner forwards <Configure> events; WindowMotion doesn't bind anything itself
+root.bind("<Configure>", motion.on_configure, add="+")
+extra.bind("<Configure>", motion.on_configure, add="+")
+motion.add(root, 100.0, 50.0)
+motion.add(extra, -100.0, 0.0)
+assert motion.running and len(motion) == 2
+x0, y0 = motion._windows[root][:2]
+
+# position follows elapsed time, however the ticks are spaced
+for step in (0.01, 0.03, 0.002, 0.058):
+    now[0] += step
+    motion.tick()
+x1, y1 = motion._windows[root][:2]
+print('Moved:', x1 - x0, y1 - y0, 'ticks:', motion.ticks, 'geometry calls:', motion.moves)
+assert abs((x1 - x0) - 10.0) < 1e-6 and abs((y1 - y0) - 5.0) < 1e-6
+
+# sizes come from <Configure>, not from queries each tick
+extra.geometry("150x90")
+root.update()
+assert motion._windows[extra][4:6] == [150, 90]
+
+# the left screen edge reverses the velocity
+motion._windows[extra][0] = 1.0
+now[0] += 0.05
+motion.tick()
+assert motion._windows[extra][0] == 0.0 and motion._windows[extra][2] == 100.0
+
+# a destroyed window drops out; stop() forgets the rest
+extra.destroy()
+now[0] += 0.05
+motion.tick()
+assert extra not in motion and root in motion
+motion.stop()
+assert not motion.running and len(motion) == 0
+
+# stopping left the other <Configure> bindings in place
+configured.clear()
+root.geometry("210x150")
+root.update()
+assert root in configured
+
+root.destroy()